@@ -54,6 +54,17 @@ class AdaptiveProgression:
     # Hashrate tolerance - if actual >= this % of expected, it's stable
     HASHRATE_TOLERANCE = 0.94
     
+    # Mutable progress saved by get_state() (sets/enums are handled separately)
+    _STATE_ATTRS = (
+        'voltage_step', 'frequency_step', 'target_error', 'HASHRATE_TOLERANCE',
+        'current_voltage', 'current_frequency',
+        'best_hashrate', 'best_hashrate_voltage', 'best_hashrate_frequency',
+        'best_efficiency', 'best_efficiency_voltage', 'best_efficiency_frequency', 'best_efficiency_hashrate',
+        'best_quiet_hashrate', 'best_quiet_voltage', 'best_quiet_frequency',
+        'last_good_voltage', 'last_good_frequency', 'last_good_hashrate',
+        'completed', 'stop_message', 'test_count', 'results', 'limit_hit', 'limit_type',
+    )
+    
     def __init__(
         self,
         voltage_start: int = 1100,
@@ -555,3 +566,26 @@ class AdaptiveProgression:
     def add_result(self, voltage: int, frequency: int, hashrate: float, efficiency: float) -> None:
         """Compatibility method"""
         self.record_result(voltage, frequency, hashrate, 0, True, efficiency=efficiency)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot of the tuning progress (for resume)"""
+        state = {attr: getattr(self, attr) for attr in self._STATE_ATTRS}
+        state['tuning_mode'] = self.tuning_mode.value
+        state['stop_reason'] = self.stop_reason.value
+        state['tested_combinations'] = sorted([v, f] for v, f in self.tested_combinations)
+        state['failed_combinations'] = sorted([v, f] for v, f in self.failed_combinations)
+        return state
+    
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore progress saved by get_state()"""
+        for attr in self._STATE_ATTRS:
+            if attr in state:
+                setattr(self, attr, state[attr])
+        if 'tuning_mode' in state:
+            self.tuning_mode = TuningMode(state['tuning_mode'])
+        if 'stop_reason' in state:
+            self.stop_reason = StopReason(state['stop_reason'])
+        self.tested_combinations = {tuple(c) for c in state.get('tested_combinations', [])}
+        self.failed_combinations = {tuple(c) for c in state.get('failed_combinations', [])}
+        self._log(f"Restored progress: {self.test_count} tests, next {self.current_voltage}mV @ {self.current_frequency}MHz "
+                  f"({self.tuning_mode.value})", 'info')
@@ -0,0 +1,119 @@
+"""
+Shared background asyncio event loop for synchronous Flask handlers
+
+Flask routes run in worker threads and can't await directly. Instead of
+creating and closing an event loop per request, every handler submits its
+coroutine to one long-lived loop running in a daemon thread. Because the loop
+outlives individual requests, pooled HTTP connections stay usable between them.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default time a request handler will wait for a coroutine to finish
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+
+class AsyncRunner:
+    """Owns a single event loop thread and runs coroutines on it"""
+
+    def __init__(self, name: str = "axebench-async"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The shared loop, started on first use"""
+        self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the loop thread if it isn't running yet"""
+        if self.running:
+            return
+        with self._lock:
+            if self.running:
+                return
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                # Loop stopped - cancel leftovers so they don't leak
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(f"Started shared event loop thread '{self.name}'")
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedule a coroutine on the shared loop without waiting for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT) -> Any:
+        """
+        Run a coroutine on the shared loop and block until it finishes.
+
+        If it doesn't finish within `timeout` seconds the coroutine is
+        cancelled and asyncio.TimeoutError is raised.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncRunner.run() called from the event loop thread; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise asyncio.TimeoutError(f"Operation timed out after {timeout}s")
+        except concurrent.futures.CancelledError:
+            raise asyncio.CancelledError()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop thread (pending tasks are cancelled)"""
+        with self._lock:
+            if not self.running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+            self._loop = None
+            logger.info(f"Stopped shared event loop thread '{self.name}'")
+
+
+# Global runner instance
+_runner: Optional[AsyncRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> AsyncRunner:
+    """Get the process-wide runner instance"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = AsyncRunner()
+    return _runner
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT) -> Any:
+    """Run a coroutine on the shared loop from synchronous code"""
+    return get_runner().run(coro, timeout=timeout)
@@ -5,8 +5,6 @@ Companion app to AxeBench and AxeShed
 """
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import asyncio
-import aiohttp
 import json
 import logging
 from pathlib import Path
@@ -18,6 +16,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 from tier_restrictions import require_feature
 from auth_decorator import require_patreon_auth
 from licensing import get_licensing
+from device_manager import get_device_manager
+from async_runner import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +34,10 @@ pool_schedules_dir = config_dir / "pool_schedules"
 scheduler_running = False
 scheduler_thread = None
 
-# HTTP timeout
-DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Reachability of each device comes from the process-wide registry; pool
+# switches reuse its keep-alive connections
+fleet = get_device_manager()
+http_pool = fleet.pool
 
 # Common pool presets
 POOL_PRESETS = {
@@ -160,22 +162,22 @@ def save_pool_schedule(device_name, schedule):
 async def get_device_pool(ip_address):
     """Get current pool info from device"""
     try:
-        async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-            async with session.get(f"http://{ip_address}/api/system/info") as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return {
-                        'url': data.get('stratumURL', ''),
-                        'port': data.get('stratumPort', 0),
-                        'user': data.get('stratumUser', ''),
-                        'password': data.get('stratumPassword', 'x'),
-                        'fallback_url': data.get('fallbackStratumURL', ''),
-                        'fallback_port': data.get('fallbackStratumPort', 0),
-                        'fallback_user': data.get('fallbackStratumUser', ''),
-                        'fallback_password': data.get('fallbackStratumPassword', 'x'),
-                        'is_using_fallback': data.get('isUsingFallback', False),
-                        'pool_connected': data.get('sharesAccepted', 0) > 0 or data.get('bestDiff', 0) > 0
-                    }
+        session = http_pool.get_session()
+        async with session.get(f"http://{ip_address}/api/system/info") as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return {
+                    'url': data.get('stratumURL', ''),
+                    'port': data.get('stratumPort', 0),
+                    'user': data.get('stratumUser', ''),
+                    'password': data.get('stratumPassword', 'x'),
+                    'fallback_url': data.get('fallbackStratumURL', ''),
+                    'fallback_port': data.get('fallbackStratumPort', 0),
+                    'fallback_user': data.get('fallbackStratumUser', ''),
+                    'fallback_password': data.get('fallbackStratumPassword', 'x'),
+                    'is_using_fallback': data.get('isUsingFallback', False),
+                    'pool_connected': data.get('sharesAccepted', 0) > 0 or data.get('bestDiff', 0) > 0
+                }
     except Exception as e:
         logger.error(f"Error getting pool info from {ip_address}: {e}")
     return None
@@ -184,15 +186,15 @@ async def get_device_pool(ip_address):
 async def set_device_pool(ip_address, url, port, user, password="x"):
     """Set pool on device"""
     try:
-        async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-            payload = {
-                "stratumURL": url,
-                "stratumPort": int(port),
-                "stratumUser": user,
-                "stratumPassword": password
-            }
-            async with session.patch(f"http://{ip_address}/api/system", json=payload) as resp:
-                return resp.status == 200
+        session = http_pool.get_session()
+        payload = {
+            "stratumURL": url,
+            "stratumPort": int(port),
+            "stratumUser": user,
+            "stratumPassword": password
+        }
+        async with session.patch(f"http://{ip_address}/api/system", json=payload) as resp:
+            return resp.status == 200
     except Exception as e:
         logger.error(f"Error setting pool on {ip_address}: {e}")
         return False
@@ -201,15 +203,15 @@ async def set_device_pool(ip_address, url, port, user, password="x"):
 async def set_device_fallback_pool(ip_address, url, port, user, password="x"):
     """Set fallback pool on device"""
     try:
-        async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-            payload = {
-                "fallbackStratumURL": url,
-                "fallbackStratumPort": int(port),
-                "fallbackStratumUser": user,
-                "fallbackStratumPassword": password
-            }
-            async with session.patch(f"http://{ip_address}/api/system", json=payload) as resp:
-                return resp.status == 200
+        session = http_pool.get_session()
+        payload = {
+            "fallbackStratumURL": url,
+            "fallbackStratumPort": int(port),
+            "fallbackStratumUser": user,
+            "fallbackStratumPassword": password
+        }
+        async with session.patch(f"http://{ip_address}/api/system", json=payload) as resp:
+            return resp.status == 200
     except Exception as e:
         logger.error(f"Error setting fallback pool on {ip_address}: {e}")
         return False
@@ -218,9 +220,9 @@ async def set_device_fallback_pool(ip_address, url, port, user, password="x"):
 async def restart_device(ip_address):
     """Restart device to apply pool changes"""
     try:
-        async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-            async with session.post(f"http://{ip_address}/api/system/restart") as resp:
-                return resp.status == 200
+        session = http_pool.get_session()
+        async with session.post(f"http://{ip_address}/api/system/restart") as resp:
+            return resp.status == 200
     except Exception as e:
         logger.error(f"Error restarting {ip_address}: {e}")
         return False
@@ -276,6 +278,7 @@ def scheduler_loop():
             devices = load_devices()
             pools = load_pools()
             current_time = datetime.now()
+            fleet.sync_devices(devices)
             
             for device in devices:
                 device_name = device['name']
@@ -296,37 +299,42 @@ def scheduler_loop():
                 if last_applied.get(device_name) == last_applied_key:
                     continue
 
+                # Don't stall the pass on devices the circuit breaker has marked offline
+                tracked = fleet.get_device(device_name)
+                if tracked and not tracked.available:
+                    logger.debug(f"Skipping {device_name}: offline (circuit breaker open)")
+                    continue
+
                 pool = pools[pool_id]
                 fallback_pool = pools.get(fallback_id) if fallback_id else None
 
                 logger.info(f"Switching {device_name} to pool: {pool['name']}")
 
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    success = loop.run_until_complete(
-                        set_device_pool(ip_address, pool['url'], pool['port'], pool['user'], pool.get('password', 'x'))
-                    )
+                success = run_async(
+                    set_device_pool(ip_address, pool['url'], pool['port'], pool['user'], pool.get('password', 'x'))
+                )
 
-                    if fallback_pool:
-                        loop.run_until_complete(
-                            set_device_fallback_pool(
-                                ip_address,
-                                fallback_pool['url'],
-                                fallback_pool['port'],
-                                fallback_pool['user'],
-                                fallback_pool.get('password', 'x')
-                            )
+                if fallback_pool:
+                    run_async(
+                        set_device_fallback_pool(
+                            ip_address,
+                            fallback_pool['url'],
+                            fallback_pool['port'],
+                            fallback_pool['user'],
+                            fallback_pool.get('password', 'x')
                         )
+                    )
 
-                    if success:
-                        loop.run_until_complete(restart_device(ip_address))
-                        last_applied[device_name] = last_applied_key
-                        logger.info(f"Successfully switched {device_name} to {pool['name']}")
-                    else:
-                        logger.error(f"Failed to switch {device_name} to {pool['name']}")
-                finally:
-                    loop.close()
+                if success:
+                    run_async(restart_device(ip_address))
+                    last_applied[device_name] = last_applied_key
+                    logger.info(f"Successfully switched {device_name} to {pool['name']}")
+                    if tracked:
+                        tracked.record_success()
+                else:
+                    logger.error(f"Failed to switch {device_name} to {pool['name']}")
+                    if tracked:
+                        tracked.record_failure("pool switch failed")
 
         except Exception as e:
             logger.error(f"Pool Scheduler error: {e}")
@@ -385,14 +393,10 @@ def api_devices():
         schedule = load_pool_schedule(device_name)
         
         # Get current pool from device
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         try:
-            pool_info = loop.run_until_complete(get_device_pool(device['ip_address']))
+            pool_info = run_async(get_device_pool(device['ip_address']))
         except:
             pool_info = None
-        finally:
-            loop.close()
         
         # Match current pool URL to a saved pool
         active_pool = None
@@ -515,38 +519,28 @@ def api_device_pool(device_name):
     if request.method == 'POST':
         data = request.json
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            success = loop.run_until_complete(
-                set_device_pool(
-                    device['ip_address'],
-                    data['url'],
-                    data['port'],
-                    data['user'],
-                    data.get('password', 'x')
-                )
+        success = run_async(
+            set_device_pool(
+                device['ip_address'],
+                data['url'],
+                data['port'],
+                data['user'],
+                data.get('password', 'x')
             )
-            
-            # Restart device if requested
-            if success and data.get('restart', True):
-                loop.run_until_complete(restart_device(device['ip_address']))
-                return jsonify({'status': 'applied_and_restarting'})
-            elif success:
-                return jsonify({'status': 'applied_no_restart'})
-            else:
-                return jsonify({'error': 'Failed to set pool'}), 500
-        finally:
-            loop.close()
+        )
+        
+        # Restart device if requested
+        if success and data.get('restart', True):
+            run_async(restart_device(device['ip_address']))
+            return jsonify({'status': 'applied_and_restarting'})
+        elif success:
+            return jsonify({'status': 'applied_no_restart'})
+        else:
+            return jsonify({'error': 'Failed to set pool'}), 500
     
     # GET - return current pool
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        pool_info = loop.run_until_complete(get_device_pool(device['ip_address']))
-        return jsonify(pool_info or {})
-    finally:
-        loop.close()
+    pool_info = run_async(get_device_pool(device['ip_address']))
+    return jsonify(pool_info or {})
 
 
 @app.route('/api/devices/<device_name>/pool/apply/<pool_id>', methods=['POST'])
@@ -566,30 +560,25 @@ def api_apply_pool(device_name, pool_id):
     
     pool = pools[pool_id]
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        success = loop.run_until_complete(
-            set_device_pool(
-                device['ip_address'],
-                pool['url'],
-                pool['port'],
-                pool['user'],
-                pool.get('password', 'x')
-            )
+    success = run_async(
+        set_device_pool(
+            device['ip_address'],
+            pool['url'],
+            pool['port'],
+            pool['user'],
+            pool.get('password', 'x')
         )
-        
-        if success:
-            # Restart to apply
-            loop.run_until_complete(restart_device(device['ip_address']))
-            return jsonify({
-                'status': 'applied',
-                'pool': pool['name']
-            })
-        else:
-            return jsonify({'error': 'Failed to apply pool'}), 500
-    finally:
-        loop.close()
+    )
+    
+    if success:
+        # Restart to apply
+        run_async(restart_device(device['ip_address']))
+        return jsonify({
+            'status': 'applied',
+            'pool': pool['name']
+        })
+    else:
+        return jsonify({'error': 'Failed to apply pool'}), 500
 
 
 @app.route('/api/devices/<device_name>/pool/apply-fallback/<pool_id>', methods=['POST'])
@@ -609,28 +598,23 @@ def api_apply_pool_as_fallback(device_name, pool_id):
     
     pool = pools[pool_id]
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        success = loop.run_until_complete(
-            set_device_fallback_pool(
-                device['ip_address'],
-                pool['url'],
-                pool['port'],
-                pool['user'],
-                pool.get('password', 'x')
-            )
+    success = run_async(
+        set_device_fallback_pool(
+            device['ip_address'],
+            pool['url'],
+            pool['port'],
+            pool['user'],
+            pool.get('password', 'x')
         )
-        
-        if success:
-            return jsonify({
-                'status': 'applied_as_fallback',
-                'pool': pool['name']
-            })
-        else:
-            return jsonify({'error': 'Failed to apply fallback pool'}), 500
-    finally:
-        loop.close()
+    )
+    
+    if success:
+        return jsonify({
+            'status': 'applied_as_fallback',
+            'pool': pool['name']
+        })
+    else:
+        return jsonify({'error': 'Failed to apply fallback pool'}), 500
 
 
 @app.route('/api/devices/<device_name>/pool/swap', methods=['POST'])
@@ -644,49 +628,44 @@ def api_swap_pools(device_name):
     if not device:
         return jsonify({'error': 'Device not found'}), 404
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        # Get current pools
-        pool_info = loop.run_until_complete(get_device_pool(device['ip_address']))
-        
-        if not pool_info or not pool_info.get('fallback_url'):
-            return jsonify({'error': 'No fallback pool configured to swap'}), 400
-        
-        # Set main to old fallback
-        success1 = loop.run_until_complete(
-            set_device_pool(
-                device['ip_address'],
-                pool_info['fallback_url'],
-                pool_info['fallback_port'],
-                pool_info.get('fallback_user', pool_info.get('user', '')),
-                'x'
-            )
+    # Get current pools
+    pool_info = run_async(get_device_pool(device['ip_address']))
+    
+    if not pool_info or not pool_info.get('fallback_url'):
+        return jsonify({'error': 'No fallback pool configured to swap'}), 400
+    
+    # Set main to old fallback
+    success1 = run_async(
+        set_device_pool(
+            device['ip_address'],
+            pool_info['fallback_url'],
+            pool_info['fallback_port'],
+            pool_info.get('fallback_user', pool_info.get('user', '')),
+            'x'
         )
-        
-        # Set fallback to old main
-        success2 = loop.run_until_complete(
-            set_device_fallback_pool(
-                device['ip_address'],
-                pool_info['url'],
-                pool_info['port'],
-                pool_info['user'],
-                'x'
-            )
+    )
+    
+    # Set fallback to old main
+    success2 = run_async(
+        set_device_fallback_pool(
+            device['ip_address'],
+            pool_info['url'],
+            pool_info['port'],
+            pool_info['user'],
+            'x'
         )
-        
-        if success1 and success2:
-            # Restart to apply
-            loop.run_until_complete(restart_device(device['ip_address']))
-            return jsonify({
-                'status': 'swapped',
-                'new_main': pool_info['fallback_url'],
-                'new_fallback': pool_info['url']
-            })
-        else:
-            return jsonify({'error': 'Failed to swap pools'}), 500
-    finally:
-        loop.close()
+    )
+    
+    if success1 and success2:
+        # Restart to apply
+        run_async(restart_device(device['ip_address']))
+        return jsonify({
+            'status': 'swapped',
+            'new_main': pool_info['fallback_url'],
+            'new_fallback': pool_info['url']
+        })
+    else:
+        return jsonify({'error': 'Failed to swap pools'}), 500
 
 
 @app.route('/api/devices/<device_name>/pool/import', methods=['POST'])
@@ -704,47 +683,42 @@ def api_import_pool_from_device(device_name):
     import_main = data.get('main', True)
     import_fallback = data.get('fallback', False)
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        pool_info = loop.run_until_complete(get_device_pool(device['ip_address']))
-        
-        if not pool_info:
-            return jsonify({'error': 'Could not read pool info from device'}), 500
-        
-        pools = load_pools()
-        imported = []
-        
-        if import_main and pool_info.get('url'):
-            pool_id = f"{device_name}-main".lower().replace(' ', '-')
-            pools[pool_id] = {
-                'name': f"{device_name} Main Pool",
-                'url': pool_info['url'],
-                'port': pool_info['port'],
-                'user': pool_info['user'],
-                'password': pool_info.get('password', 'x')
-            }
-            imported.append('main')
-        
-        if import_fallback and pool_info.get('fallback_url'):
-            pool_id = f"{device_name}-fallback".lower().replace(' ', '-')
-            pools[pool_id] = {
-                'name': f"{device_name} Fallback Pool",
-                'url': pool_info['fallback_url'],
-                'port': pool_info['fallback_port'],
-                'user': pool_info.get('fallback_user', pool_info.get('user', '')),
-                'password': pool_info.get('fallback_password', pool_info.get('password', 'x'))
-            }
-            imported.append('fallback')
-        
-        save_pools(pools)
-        
-        return jsonify({
-            'status': 'imported',
-            'imported': imported
-        })
-    finally:
-        loop.close()
+    pool_info = run_async(get_device_pool(device['ip_address']))
+    
+    if not pool_info:
+        return jsonify({'error': 'Could not read pool info from device'}), 500
+    
+    pools = load_pools()
+    imported = []
+    
+    if import_main and pool_info.get('url'):
+        pool_id = f"{device_name}-main".lower().replace(' ', '-')
+        pools[pool_id] = {
+            'name': f"{device_name} Main Pool",
+            'url': pool_info['url'],
+            'port': pool_info['port'],
+            'user': pool_info['user'],
+            'password': pool_info.get('password', 'x')
+        }
+        imported.append('main')
+    
+    if import_fallback and pool_info.get('fallback_url'):
+        pool_id = f"{device_name}-fallback".lower().replace(' ', '-')
+        pools[pool_id] = {
+            'name': f"{device_name} Fallback Pool",
+            'url': pool_info['fallback_url'],
+            'port': pool_info['fallback_port'],
+            'user': pool_info.get('fallback_user', pool_info.get('user', '')),
+            'password': pool_info.get('fallback_password', pool_info.get('password', 'x'))
+        }
+        imported.append('fallback')
+    
+    save_pools(pools)
+    
+    return jsonify({
+        'status': 'imported',
+        'imported': imported
+    })
 
 
 @app.route('/api/devices/<device_name>/schedule', methods=['GET', 'POST'])
@@ -771,14 +745,12 @@ def api_device_pool_schedule(device_name):
                     device = next((d for d in devices if d['name'] == device_name), None)
                     
                     if device:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
                         try:
-                            loop.run_until_complete(
+                            run_async(
                                 set_device_pool(device['ip_address'], pool['url'], pool['port'], pool['user'], pool.get('password', 'x'))
                             )
                             if fallback_pool:
-                                loop.run_until_complete(
+                                run_async(
                                     set_device_fallback_pool(
                                         device['ip_address'],
                                         fallback_pool['url'],
@@ -790,8 +762,6 @@ def api_device_pool_schedule(device_name):
                             logger.info(f"Immediately applied pool {pool['name']} to {device_name} on schedule save")
                         except Exception as e:
                             logger.error(f"Failed to immediately apply pool: {e}")
-                        finally:
-                            loop.close()
         
         return jsonify({'status': 'saved'})
     
@@ -4,19 +4,21 @@ Companion app to AxeBench for automated profile scheduling
 """
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import asyncio
-import aiohttp
 import json
 import logging
 from pathlib import Path
 from datetime import datetime, time as dtime
-from threading import Thread
+from threading import Lock, Thread
 import time
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 from tier_restrictions import require_feature
 from auth_decorator import require_patreon_auth
 from licensing import get_licensing
+from device_manager import get_device_manager
+from async_runner import get_runner, run_async
+from power_budget import get_power_budget
+from telemetry import get_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +35,17 @@ schedules_dir = config_dir / "schedules"
 scheduler_running = False
 scheduler_thread = None
 
-# HTTP timeout
-DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Devices (synced from devices.json), polled in the background for the dashboard.
+# The registry is the process-wide one, so mounted next to AxeBench a device
+# keeps a single breaker; profile applies go through its connection pool
+fleet = get_device_manager()
+http_pool = fleet.pool
+telemetry = get_telemetry()
+
+# Profile switches on devices sharing a PSU wait for its headroom. The budget is
+# the process-wide one, so in the unified app they also wait for AxeBench's
+# benchmarks; a separately run AxeBench has its own (see power_budget)
+power_budget = get_power_budget()
 
 
 def load_devices():
@@ -46,6 +57,25 @@ def load_devices():
     return []
 
 
+def load_shared_psus():
+    """Load shared PSUs from shared config"""
+    psus_file = config_dir / "shared_psus.json"
+    if psus_file.exists():
+        with open(psus_file, 'r') as f:
+            return json.load(f)
+    return []
+
+
+def sync_fleet(devices):
+    """Mirror devices.json (and the shared PSUs they use) into the fleet"""
+    fleet.sync_devices(devices)
+    fleet.set_device_configs(devices)
+    try:
+        fleet.set_shared_psus(load_shared_psus())
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load shared PSUs: {e}")
+
+
 def load_device_profiles(device_name):
     """Load profiles for a device"""
     profile_file = profiles_dir / f"{device_name}.json"
@@ -116,40 +146,60 @@ def save_schedule(device_name, schedule):
 async def apply_profile_to_device(ip_address, voltage, frequency, fan_target=None):
     """Apply voltage/frequency settings and optionally fan target to a device"""
     try:
-        async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-            # Apply voltage and frequency
-            payload = {"coreVoltage": voltage, "frequency": frequency}
-            async with session.patch(f"http://{ip_address}/api/system", json=payload) as resp:
+        session = http_pool.get_session()
+        # Apply voltage and frequency
+        payload = {"coreVoltage": voltage, "frequency": frequency}
+        async with session.patch(f"http://{ip_address}/api/system", json=payload) as resp:
+            if resp.status != 200:
+                return False
+        
+        # Apply fan target if specified
+        if fan_target:
+            fan_payload = {
+                "autofanspeed": 1,
+                "fanspeed": 100,
+                "targettemp": int(fan_target)
+            }
+            async with session.patch(f"http://{ip_address}/api/system", json=fan_payload) as resp:
                 if resp.status != 200:
-                    return False
-            
-            # Apply fan target if specified
-            if fan_target:
-                fan_payload = {
-                    "autofanspeed": 1,
-                    "fanspeed": 100,
-                    "targettemp": int(fan_target)
-                }
-                async with session.patch(f"http://{ip_address}/api/system", json=fan_payload) as resp:
-                    if resp.status != 200:
-                        logger.warning(f"Failed to set fan target on {ip_address}")
-            
-            return True
+                    logger.warning(f"Failed to set fan target on {ip_address}")
+        
+        return True
     except Exception as e:
         logger.error(f"Error applying profile to {ip_address}: {e}")
         return False
 
 
-async def get_device_status(ip_address):
-    """Get current device status"""
-    try:
-        async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
-            async with session.get(f"http://{ip_address}/api/system/info") as resp:
-                if resp.status == 200:
-                    return await resp.json()
-    except Exception as e:
-        logger.error(f"Error getting status from {ip_address}: {e}")
-    return None
+def apply_profile_within_budget(device, voltage, frequency, fan_target=None, on_done=None):
+    """
+    Apply a profile now if the device's shared PSU has headroom for it,
+    otherwise queue it on the shared loop until it does. Either way it
+    replaces any profile still queued for the device. Returns (whether it
+    applied, or None if it was deferred; the replaced queued change, if any).
+    on_done(success) is called once a deferred apply has run - not if a newer
+    apply supersedes it first.
+    """
+    name = device['name']
+    
+    def apply():
+        return apply_profile_to_device(device['ip_address'], voltage, frequency, fan_target)
+    
+    def deferred_done(future):
+        if future.cancelled() or future.exception() is not None:
+            on_done(False)
+        elif future.result() is not None:
+            on_done(future.result())
+    
+    replaced = power_budget.supersede(name)
+    if not power_budget.try_admit(name, voltage, frequency):
+        future = get_runner().submit(power_budget.run_when_admitted(name, voltage, frequency, apply))
+        if on_done:
+            future.add_done_callback(deferred_done)
+        return None, replaced
+    success = run_async(apply())
+    if not success:
+        power_budget.release(name)
+    return success, replaced
 
 
 def get_active_profile_for_time(schedule, current_time):
@@ -194,15 +244,16 @@ def scheduler_loop():
     
     logger.info("Scheduler started")
     last_applied = {}  # Track what was last applied to avoid repeated calls
+    last_applied_lock = Lock()  # deferred applies report back on the shared async loop
     
     while scheduler_running:
         try:
             devices = load_devices()
             current_time = datetime.now()
+            sync_fleet(devices)
             
             for device in devices:
                 device_name = device['name']
-                ip_address = device['ip_address']
                 
                 # Load schedule
                 schedule = load_schedule(device_name)
@@ -216,8 +267,9 @@ def scheduler_loop():
                 
                 # Check if already applied
                 last_key = f"{device_name}:{profile_name}"
-                if last_applied.get(device_name) == profile_name:
-                    continue
+                with last_applied_lock:
+                    if last_applied.get(device_name) == profile_name:
+                        continue
                 
                 # Load profile data
                 profiles = load_device_profiles(device_name)
@@ -228,23 +280,48 @@ def scheduler_loop():
                 if not profile:
                     continue
                 
+                # Don't stall the pass on devices the circuit breaker has marked offline
+                tracked = fleet.get_device(device_name)
+                if tracked and not tracked.available:
+                    logger.debug(f"Skipping {device_name}: offline (circuit breaker open)")
+                    continue
+                
                 # Apply profile
                 fan_target = profile.get('fan_target')
                 logger.info(f"Applying {profile_name} to {device_name}: {profile['voltage']}mV @ {profile['frequency']}MHz (fan: {fan_target}°C)")
                 
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                def deferred_done(success, device_name=device_name, profile_name=profile_name):
+                    if success:
+                        logger.info(f"Successfully applied deferred {profile_name} to {device_name}")
+                        return
+                    with last_applied_lock:
+                        if last_applied.get(device_name) == profile_name:
+                            del last_applied[device_name]  # retry on the next pass
+                
+                # Claimed up front so a deferred apply that fails quickly can't report
+                # back before the claim and be forgotten
+                with last_applied_lock:
+                    last_applied[device_name] = profile_name
                 try:
-                    success = loop.run_until_complete(
-                        apply_profile_to_device(ip_address, profile['voltage'], profile['frequency'], fan_target)
+                    success, _ = apply_profile_within_budget(
+                        device, profile['voltage'], profile['frequency'], fan_target, on_done=deferred_done
                     )
-                    if success:
-                        last_applied[device_name] = profile_name
-                        logger.info(f"Successfully applied {profile_name} to {device_name}")
-                    else:
-                        logger.error(f"Failed to apply {profile_name} to {device_name}")
-                finally:
-                    loop.close()
+                except Exception:
+                    success = False
+                    logger.exception(f"Error applying {profile_name} to {device_name}")
+                if success is None:
+                    # Queued until the shared PSU has headroom
+                    logger.info(f"Deferred {profile_name} on {device_name}: waiting for shared PSU headroom")
+                elif success:
+                    logger.info(f"Successfully applied {profile_name} to {device_name}")
+                    if tracked:
+                        tracked.record_success()
+                else:
+                    with last_applied_lock:
+                        last_applied.pop(device_name, None)
+                    logger.error(f"Failed to apply {profile_name} to {device_name}")
+                    if tracked:
+                        tracked.record_failure("profile apply failed")
                 
         except Exception as e:
             logger.error(f"Scheduler error: {e}")
@@ -297,6 +374,14 @@ def api_devices():
         devices = load_devices() or []
         result = []
         
+        # Current status for every device comes from the telemetry cache
+        fleet.sync_devices(devices)
+        try:
+            infos = telemetry.get_infos(fleet.list_devices())
+        except Exception as e:
+            logger.error(f"Error getting device status: {e}")
+            infos = {}
+        
         for device in devices:
             if not device or not isinstance(device, dict):
                 continue
@@ -311,19 +396,7 @@ def api_devices():
             if schedule is None:
                 schedule = {}
             
-            # Get current status
-            status = None
-            if ip_address:
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        status = loop.run_until_complete(get_device_status(ip_address))
-                    finally:
-                        loop.close()
-                except Exception as e:
-                    logger.error(f"Error getting device status: {e}")
-                    status = None
+            status = infos.get(device_name) if ip_address else None
             
             # Match current device settings to a profile
             active_profile = None
@@ -331,9 +404,9 @@ def api_devices():
             if profiles_dict is None:
                 profiles_dict = {}
             
-            if status and isinstance(status, dict) and profiles_dict:
-                device_voltage = status.get('coreVoltage', 0) or 0
-                device_frequency = status.get('frequency', 0) or 0
+            if status and profiles_dict:
+                device_voltage = status.voltage or 0
+                device_frequency = status.frequency or 0
                 
                 for profile_name, profile_data in profiles_dict.items():
                     if not isinstance(profile_data, dict):
@@ -354,11 +427,12 @@ def api_devices():
                 'profiles': list(profiles_dict.keys()) if profiles_dict else [],
                 'schedule_enabled': schedule.get('enabled', False) if isinstance(schedule, dict) else False,
                 'active_profile': active_profile,
+                'health': fleet.get_device(device_name).health() if fleet.get_device(device_name) else None,
                 'status': {
-                    'hashrate': (status.get('hashRate', 0) or 0) if status and isinstance(status, dict) else 0,
-                    'temp': (status.get('temp', 0) or 0) if status and isinstance(status, dict) else 0,
-                    'voltage': (status.get('coreVoltage', 0) or 0) if status and isinstance(status, dict) else 0,
-                    'frequency': (status.get('frequency', 0) or 0) if status and isinstance(status, dict) else 0,
+                    'hashrate': status.hashrate if status else 0,
+                    'temp': status.temperature if status else 0,
+                    'voltage': status.voltage if status else 0,
+                    'frequency': status.frequency if status else 0,
                     'online': status is not None
                 }
             })
@@ -395,17 +469,18 @@ def api_device_schedule(device_name):
                     profile = profiles['profiles'][profile_name]
                     fan_target = profile.get('fan_target')
                     
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
                     try:
-                        loop.run_until_complete(
-                            apply_profile_to_device(device['ip_address'], profile['voltage'], profile['frequency'], fan_target)
-                        )
-                        logger.info(f"Immediately applied {profile_name} to {device_name} on schedule save")
+                        sync_fleet(devices)
+                        success, _ = apply_profile_within_budget(device, profile['voltage'], profile['frequency'], fan_target)
+                        if success is None:
+                            logger.info(f"Deferred {profile_name} on {device_name} on schedule save: "
+                                        f"waiting for shared PSU headroom")
+                        elif success:
+                            logger.info(f"Immediately applied {profile_name} to {device_name} on schedule save")
+                        else:
+                            logger.error(f"Failed to apply {profile_name} to {device_name} on schedule save")
                     except Exception as e:
                         logger.error(f"Failed to immediately apply profile: {e}")
-                    finally:
-                        loop.close()
         
         return jsonify({'status': 'saved'})
     
@@ -453,15 +528,18 @@ def api_apply_profile(device_name, profile_name):
     
     fan_target = profile.get('fan_target')
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        success = loop.run_until_complete(
-            apply_profile_to_device(device['ip_address'], profile['voltage'], profile['frequency'], fan_target)
-        )
-    finally:
-        loop.close()
+    sync_fleet(devices)
+    success, replaced = apply_profile_within_budget(device, profile['voltage'], profile['frequency'], fan_target)
     
+    if success is None:
+        return jsonify({
+            'status': 'deferred',
+            'profile': profile_name,
+            'voltage': profile['voltage'],
+            'frequency': profile['frequency'],
+            'replaced': replaced,
+            'message': 'Waiting for headroom on the shared PSU'
+        }), 202
     if success:
         # Store last applied profile
         schedule = load_schedule(device_name) or {'device': device_name}
@@ -473,7 +551,8 @@ def api_apply_profile(device_name, profile_name):
             'profile': profile_name,
             'voltage': profile['voltage'],
             'frequency': profile['frequency'],
-            'fan_target': fan_target
+            'fan_target': fan_target,
+            'replaced': replaced
         })
     else:
         return jsonify({'error': 'Failed to apply profile'}), 500
@@ -491,31 +570,23 @@ def api_save_custom_profile(device_name):
         return jsonify({'error': 'Device not found'}), 404
     
     # Fetch current device settings
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        import aiohttp
-        
-        async def get_current_settings():
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                try:
-                    async with session.get(f"http://{device['ip_address']}/api/system/info") as resp:
-                        if resp.status != 200:
-                            return None
-                        data = await resp.json()
-                        return {
-                            'voltage': int(data.get('coreVoltage', 0)),
-                            'frequency': int(data.get('frequency', 0)),
-                            'fan_target': int(data.get('fanspeed', 0))
-                        }
-                except Exception as e:
-                    logger.error(f"{device_name}: Error fetching settings: {e}")
+    async def get_current_settings():
+        session = http_pool.get_session()
+        try:
+            async with session.get(f"http://{device['ip_address']}/api/system/info") as resp:
+                if resp.status != 200:
                     return None
-        
-        settings = loop.run_until_complete(get_current_settings())
-    finally:
-        loop.close()
+                data = await resp.json()
+                return {
+                    'voltage': int(data.get('coreVoltage', 0)),
+                    'frequency': int(data.get('frequency', 0)),
+                    'fan_target': int(data.get('fanspeed', 0))
+                }
+        except Exception as e:
+            logger.error(f"{device_name}: Error fetching settings: {e}")
+            return None
+    
+    settings = run_async(get_current_settings())
     
     if not settings:
         return jsonify({'error': 'Failed to fetch current device settings'}), 500
@@ -1257,6 +1328,8 @@ def run_axeshed(host='0.0.0.0', port=5001):
 """)
     
     logging.basicConfig(level=logging.INFO)
+    fleet.sync_devices(load_devices())
+    telemetry.start()
     app.run(host=host, port=port, debug=False, threaded=True)
 
 
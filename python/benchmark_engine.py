@@ -1,12 +1,9 @@
 """
 Main benchmark engine with smart algorithms and multi-device support
 """
-import asyncio
-import time
 import logging
-import statistics
+from collections import deque
 from typing import List, Optional, Dict, Tuple
-from datetime import datetime
 from pathlib import Path
 import uuid
 
@@ -14,12 +11,30 @@ from config import (
     BenchmarkConfig, SafetyLimits, TestResult, BenchmarkSession,
     DeviceConfig, OptimizationGoal
 )
+from clock import SYSTEM_CLOCK, Clock
 from device_manager import DeviceManager, SystemInfo, BitaxeDevice
-from data_analyzer import DataAnalyzer
+from data_analyzer import DataAnalyzer, HEATING_SLOPE
+from measurement_cache import MeasurementCache, fan_setting, get_measurement_cache, measurement_settings
+from power_budget import PowerBudget, PowerBudgetTimeout
+from sample_store import SampleReader, SampleWriter, samples_path
+from session_index import get_session_index
+from settle_detector import SettleDetector
+from session_logs import SessionLogWriter
+from session_journal import (
+    SessionJournal, journal_path, load_checkpoint, resume_state_path, write_json_atomic
+)
 from search_strategies import create_search_strategy, SearchStrategyBase
+from streaming_stats import IQRFilteredStats, LinearTrend, RunningStats, WindowedStats
 
 logger = logging.getLogger(__name__)
 
+# Relative change in predicted power between consecutive points that needs the
+# full configured warmup/cooldown; smaller moves settle proportionally faster
+FULL_SETTLE_POWER_DELTA = 0.15
+MIN_SETTLE_FRACTION = 0.25
+# Points skipped in a row for lack of shared-PSU headroom before the run gives up
+MAX_POWER_SKIPS = 3
+
 
 class BenchmarkEngine:
     """Main benchmark engine"""
@@ -30,13 +45,19 @@ class BenchmarkEngine:
         safety: SafetyLimits,
         device_manager: DeviceManager,
         session_dir: Path,
-        status_callback=None
+        status_callback=None,
+        clock: Optional[Clock] = None,
+        power_budget: Optional[PowerBudget] = None
     ):
         self.config = config
         self.safety = safety
         self.device_manager = device_manager
         self.session_dir = session_dir
         self.session_dir.mkdir(parents=True, exist_ok=True)
+        # Time source - SystemClock in production, VirtualClock for simulated runs
+        self.clock = clock or SYSTEM_CLOCK
+        # Shared-PSU budget that V/F increases wait on (None: no shared PSU coordination)
+        self.power_budget = power_budget
         self._original_status_callback = status_callback
         self.status_callback = self._wrapped_status_callback
         
@@ -45,7 +66,25 @@ class BenchmarkEngine:
         self.analyzer = DataAnalyzer()
         
         self.interrupted = False
-        self.checkpoint_file = self.session_dir / f"checkpoint_{self.session_id}.json"
+        # Append-only checkpoint: results and logs are journaled as they happen
+        self.checkpoint_file = journal_path(self.session_dir, self.session_id)
+        self.journal: Optional[SessionJournal] = None
+        # Indexed log file for paging through logs without the session document
+        self.log_writer: Optional[SessionLogWriter] = None
+        # Strategy snapshot for resuming an interrupted run
+        self.resume_file = resume_state_path(self.session_dir, self.session_id)
+        
+        # Recent measurements of the device shared across sessions (set in run_benchmark),
+        # matched on the fan setting the device runs at during this session
+        self.measurement_cache: Optional[MeasurementCache] = None
+        self._fan_setting: Optional[str] = None
+        
+        # V/F the device was last set to (how far the next point moves it)
+        self._last_point: Optional[Tuple[int, int]] = None
+        
+        # Raw sample capture (opened in run_benchmark when enabled)
+        self.sample_writer: Optional[SampleWriter] = None
+        self._test_index = -1
     
     def _wrapped_status_callback(self, status: dict):
         """Wrapper that logs messages to session AND sends to UI"""
@@ -74,27 +113,25 @@ class BenchmarkEngine:
             else:
                 log_type = phase
             
-            time_str = datetime.now().strftime('%H:%M:%S')
-            self.session.add_log(time_str, message, log_type)
+            self._add_log(message, log_type)
     
     def log_event(self, message: str, log_type: str = 'info'):
         """Log an event to the session"""
         if self.session:
-            time_str = datetime.now().strftime('%H:%M:%S')
-            self.session.add_log(time_str, message, log_type)
-        
-    async def run_benchmark(self, device_name: str) -> BenchmarkSession:
-        """Run complete benchmark for a device"""
-        device = self.device_manager.get_device(device_name)
-        if not device:
-            raise ValueError(f"Device {device_name} not found")
-        
-        logger.info(f"Starting benchmark for {device_name}")
+            self._add_log(message, log_type)
+    
+    def _add_log(self, message: str, log_type: str):
+        time_str = self.clock.now().strftime('%H:%M:%S')
+        self.session.add_log(time_str, message, log_type)
+        if self.journal:
+            self.journal.append_log(self.session.logs[-1])
+        if self.log_writer:
+            self.log_writer.append(self.session.logs[-1])
         
-        # Initialize session
+    def _new_session(self, device_name: str, device: BitaxeDevice):
         self.session = BenchmarkSession(
             session_id=self.session_id,
-            start_time=datetime.now().isoformat(),
+            start_time=self.clock.now().isoformat(),
             end_time=None,
             device_configs=[{
                 'name': device_name,
@@ -111,17 +148,128 @@ class BenchmarkEngine:
             logs=[],
             stop_reason=None
         )
+    
+    def _restore_session(self, checkpoint: Dict):
+        """Rebuild the session as it was when the resume state was saved"""
+        data = dict(checkpoint['session'])
+        state = checkpoint['resume']
+        # Results past the snapshot belong to a point that was cut short; it is re-run in full
+        data['results'] = (data.get('results') or [])[:state.get('results_count', 0)]
+        data.update(status="running", end_time=None, stop_reason=None,
+                    best_hashrate=None, best_efficiency=None, best_balanced=None)
+        self.session = BenchmarkSession(**data)
+        self._test_index = state.get('test_index', -1)
+    
+    def _save_resume_state(self, strategy: SearchStrategyBase):
+        """Snapshot the search before the next point so an interrupted run can continue"""
+        if not self.config.enable_checkpoints:
+            return
+        state = {
+            'strategy': strategy.get_state(),
+            'test_index': self._test_index,
+            'results_count': len(self.session.results),
+        }
+        try:
+            write_json_atomic(self.resume_file, state, indent=None)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to save resume state: {e}")
+    
+    async def _capture_defaults(self, device: BitaxeDevice, resume: Optional[Dict]):
+        """
+        Save the device's defaults and record them in the session. A resumed
+        run takes them from the session instead: the device is still at
+        whatever point the interrupted run left it on.
+        """
+        config = self.session.device_configs[0]
+        saved = config.get('defaults') if resume else None
+        if saved:
+            device.set_defaults(*saved)
+            logger.info(f"{device.name}: Restored defaults: {saved[0]}mV @ {saved[1]}MHz")
+            return
+        if resume:
+            logger.warning(f"{device.name}: Session has no recorded defaults, capturing current settings")
+        await device.save_defaults()
+        if device.defaults:
+            config['defaults'] = list(device.defaults)
+    
+    async def resume_benchmark(self, session_id: str) -> BenchmarkSession:
+        """Continue an interrupted session from its last saved strategy state"""
+        checkpoint = load_checkpoint(self.session_dir, session_id)
+        if not checkpoint:
+            raise ValueError(f"No resumable checkpoint for session {session_id}")
+        
+        session = checkpoint['session']
+        self.session_id = session_id
+        self.checkpoint_file = journal_path(self.session_dir, session_id)
+        self.resume_file = resume_state_path(self.session_dir, session_id)
+        # The run continues with the settings it started with
+        self.config = BenchmarkConfig.from_dict(dict(session['benchmark_config']))
+        self.safety = SafetyLimits(**session['safety_limits'])
+        
+        device_name = session['device_configs'][0]['name']
+        return await self.run_benchmark(device_name, resume=checkpoint)
+    
+    async def run_benchmark(self, device_name: str, resume: Optional[Dict] = None) -> BenchmarkSession:
+        """Run complete benchmark for a device (`resume` is a checkpoint from load_checkpoint)"""
+        device = self.device_manager.get_device(device_name)
+        if not device:
+            raise ValueError(f"Device {device_name} not found")
+        
+        if resume:
+            logger.info(f"Resuming benchmark {self.session_id} for {device_name}")
+            self._restore_session(resume)
+        else:
+            logger.info(f"Starting benchmark for {device_name}")
+            self._new_session(device_name, device)
+        
+        if self.config.reuse_measurements:
+            self.measurement_cache = get_measurement_cache(self.session_dir, device_name)
+        
+        if self.config.capture_raw_samples:
+            sample_file = samples_path(self.session_dir, self.session_id)
+            if resume and sample_file.exists():
+                # Number new test points after everything already captured,
+                # so samples of a point cut short stay separate from its re-run
+                try:
+                    with SampleReader(sample_file) as reader:
+                        if len(reader):
+                            self._test_index = max(self._test_index, int(reader.samples['test_index'][-1]))
+                except ValueError as e:
+                    logger.warning(f"Ignoring unreadable sample file: {e}")
+            self.sample_writer = SampleWriter(sample_file)
+            self.session.samples_file = sample_file.name
         
-        # Clear any existing checkpoint to start fresh
-        # (Only load checkpoint if explicitly resuming, not on new benchmark start)
-        if self.checkpoint_file.exists():
-            logger.info("Clearing old checkpoint file for fresh start")
-            self.checkpoint_file.unlink()
+        await self._capture_defaults(device, resume)
         
+        if self.measurement_cache is not None:
+            info = await device.get_system_info(bypass_breaker=True)
+            self._fan_setting = fan_setting(info.auto_fan, info.fan_speed, info.temp_target) if info else None
+            if self._fan_setting is None:
+                logger.info(f"{device_name}: Fan mode unknown, not reusing or caching measurements")
+                self.measurement_cache = None
+        
+        # Start a fresh journal (replaces any stale one for this session id)
+        if self.config.enable_checkpoints:
+            self.journal = SessionJournal(self.checkpoint_file)
+            self.journal.start(self.session.to_dict())
+        
+        self.log_writer = SessionLogWriter(self.session_dir, self.session_id)
+        try:
+            self.log_writer.open(self.session.logs)
+        except OSError as e:
+            logger.error(f"Could not open session log file: {e}")
+            self.log_writer = None
+        
+        if resume:
+            # The journal is the live copy again until the run ends
+            stale = self.session_dir / f"session_{self.session_id}.json"
+            if self.journal and stale.exists():
+                stale.unlink()
+                get_session_index(self.session_dir).remove(self.session_id)
+            self.log_event(f"Resuming benchmark: {len(self.session.results)} tests already completed", 'info')
+        
+        finished = False
         try:
-            # Save device defaults
-            await device.save_defaults()
-            
             # Create search strategy
             strategy = create_search_strategy(
                 self.config.strategy,
@@ -155,15 +303,19 @@ class BenchmarkEngine:
                     'message': f'🎯 Error threshold: <{self.config.target_error}% for stability'
                 })
             
-            # Add existing results to strategy
-            for result in self.session.results:
-                result_obj = TestResult.from_dict(result)
-                strategy.add_result(
-                    result_obj.voltage,
-                    result_obj.frequency,
-                    result_obj.avg_hashrate,
-                    result_obj.efficiency
-                )
+            if resume:
+                # Pick the search up exactly where it was
+                strategy.restore_state(resume['resume']['strategy'])
+            else:
+                # Add existing results to strategy
+                for result in self.session.results:
+                    result_obj = TestResult.from_dict(result)
+                    strategy.add_result(
+                        result_obj.voltage,
+                        result_obj.frequency,
+                        result_obj.avg_hashrate,
+                        result_obj.efficiency
+                    )
             
             # Calculate total tests estimate (including cycles)
             base_tests = strategy.estimate_total_tests() if hasattr(strategy, 'estimate_total_tests') else 0
@@ -177,15 +329,32 @@ class BenchmarkEngine:
                 })
             
             # Run benchmark loop
+            pending_cooldown = 0
+            cooldown_scalable = False
+            power_skips = 0
+            power_stop_reason = None
             while not strategy.is_complete() and not self.interrupted:
+                self._save_resume_state(strategy)
                 combo = strategy.get_next_combination()
                 if not combo:
                     break
                 
                 voltage, frequency = combo
                 
+                # A fresh measurement from an earlier session stands in for the test
+                cached = self._reusable_measurement(voltage, frequency)
+                if cached is not None:
+                    if self._replay_measurement(strategy, voltage, frequency, cached, total_tests):
+                        break
+                    continue
+                
+                # Cooldown owed by the previous point
+                await self._pay_cooldown(device, pending_cooldown, cooldown_scalable, voltage, frequency)
+                pending_cooldown = 0
+                
                 # Run multiple cycles at each setting for consistency
                 cycle_results = []
+                power_skipped = False
                 for cycle in range(self.config.cycles_per_test):
                     if self.interrupted:
                         break
@@ -207,16 +376,29 @@ class BenchmarkEngine:
                         })
                     
                     # Run test
-                    result = await self._run_single_test(
-                        device,
-                        voltage,
-                        frequency
-                    )
+                    try:
+                        result = await self._run_single_test(
+                            device,
+                            voltage,
+                            frequency
+                        )
+                    except PowerBudgetTimeout as e:
+                        # Says nothing about the point itself - the strategy isn't told
+                        logger.warning(f"{e} - skipping")
+                        if self.status_callback:
+                            self.status_callback({
+                                'phase': 'warning',
+                                'message': f'⚠️ {e} - skipping'
+                            })
+                        power_skipped = True
+                        break
+                    if self.sample_writer:
+                        self.sample_writer.flush()
                     
                     if result:
                         cycle_results.append(result)
-                        # Add to results
-                        self.session.results.append(result.to_dict())
+                        # Add to results (journaled as the checkpoint)
+                        self._record_result(result)
                         tests_done = len(self.session.results)
                         progress = int((tests_done / max(total_tests, 1)) * 100) if total_tests > 0 else 0
                         if self.status_callback:
@@ -226,10 +408,8 @@ class BenchmarkEngine:
                                 'current_test': f'{voltage}mV @ {frequency}MHz{cycle_label} - {result.avg_hashrate:.1f} GH/s',
                                 'progress': progress
                             })
-                        
-                        # Save checkpoint
-                        if self.config.enable_checkpoints:
-                            self._save_checkpoint()
+                    elif self.interrupted:
+                        break  # stopped mid-test (or while waiting for PSU headroom), not a failed point
                     else:
                         # Test failed - notify UI and mark as failed for strategy
                         logger.warning(f"Test failed at {voltage}mV @ {frequency}MHz")
@@ -239,10 +419,7 @@ class BenchmarkEngine:
                                 'message': f'⚠️ Test failed at {voltage}mV @ {frequency}MHz - skipping'
                             })
                         # Mark as unstable so strategy knows to skip/adjust
-                        if hasattr(strategy, 'record_result'):
-                            strategy.record_result(voltage, frequency, 0, 100.0, False)
-                        elif hasattr(strategy, 'mark_unstable'):
-                            strategy.mark_unstable(voltage, frequency)
+                        self._report_failure(strategy, voltage, frequency)
                         # Don't run more cycles at this failed setting
                         break
                     
@@ -255,64 +432,26 @@ class BenchmarkEngine:
                                 'phase': 'cooldown',
                                 'message': f'Pause between cycles... {inter_cycle_pause}s'
                             })
-                        await asyncio.sleep(inter_cycle_pause)
+                        await self.clock.sleep(inter_cycle_pause)
+                
+                if power_skipped and not cycle_results:
+                    power_skips += 1
+                    if power_skips >= MAX_POWER_SKIPS:
+                        power_stop_reason = f"No PSU headroom for {power_skips} points in a row"
+                        break
+                    continue  # parked while waiting, so no cooldown is owed
+                power_skips = 0
                 
                 # Report average to strategy (use best result from cycles for optimization)
                 if cycle_results:
-                    best_cycle = max(cycle_results, key=lambda r: r.avg_hashrate)
-                    avg_hashrate = sum(r.avg_hashrate for r in cycle_results) / len(cycle_results)
-                    avg_efficiency = sum(r.efficiency for r in cycle_results) / len(cycle_results)
-                    avg_error_pct = sum(getattr(r, 'error_percentage', 0) for r in cycle_results) / len(cycle_results)
-                    max_error_pct = max(getattr(r, 'error_percentage', 0) for r in cycle_results)
-                    
-                    # Get error percentage from best cycle
-                    error_pct = getattr(best_cycle, 'error_percentage', 0.0)
-                    
-                    # Log test completion with all stats
-                    if self.status_callback:
-                        self.status_callback({
-                            'phase': 'test_complete',
-                            'message': f'✓ TEST COMPLETE: {avg_hashrate:.1f} GH/s, {avg_efficiency:.1f} J/TH, err: {avg_error_pct:.2f}% avg ({max_error_pct:.2f}% max)'
-                        })
-                    
-                    logger.info(f"Test complete: {voltage}mV @ {frequency}MHz: {avg_hashrate:.1f} GH/s, error: {error_pct:.2f}%")
-                    
-                    # Strategy makes the stability decision
-                    # Use target_error from config as stable threshold
-                    stable = error_pct < self.config.target_error
-                    
-                    # Call appropriate method based on strategy type
-                    if hasattr(strategy, 'record_result'):
-                        # Pass all data for limit checking and optimization
-                        strategy.record_result(
-                            voltage, frequency, best_cycle.avg_hashrate, error_pct, stable,
-                            efficiency=best_cycle.efficiency,
-                            fan_speed=getattr(best_cycle, 'fan_speed', None),
-                            chip_temp=best_cycle.max_temp if hasattr(best_cycle, 'max_temp') else None,
-                            vr_temp=best_cycle.max_vr_temp if hasattr(best_cycle, 'max_vr_temp') else None,
-                            power=best_cycle.max_power if hasattr(best_cycle, 'max_power') else None,
-                        )
-                        
-                        # Check if strategy hit a limit and should stop
-                        if hasattr(strategy, 'limit_hit') and strategy.limit_hit:
-                            logger.warning(f"Strategy hit limit: {strategy.limit_type}")
-                            if self.status_callback:
-                                self.status_callback({
-                                    'phase': 'limit_hit',
-                                    'message': f'🛑 LIMIT REACHED: {strategy.stop_message}'
-                                })
-                            break  # Exit the test loop
-                    else:
-                        strategy.add_result(
-                            voltage,
-                            frequency,
-                            best_cycle.avg_hashrate,
-                            best_cycle.efficiency
-                        )
+                    self._remember_measurement(voltage, frequency, max(cycle_results, key=lambda r: r.avg_hashrate))
+                    if self._report_to_strategy(strategy, voltage, frequency, cycle_results):
+                        break  # Exit the test loop
                 
                 # Smart cooldown - adapt based on what happened
                 # Default short cooldown for normal progression
                 actual_cooldown = min(self.config.cooldown_time, 15)  # Cap normal cooldown at 15s
+                cooldown_scalable = True
                 
                 # Check if we need longer cooldown based on test result
                 if cycle_results:
@@ -322,30 +461,19 @@ class BenchmarkEngine:
                     # Longer cooldown if we got close to thermal limits
                     if max_temp_seen > (self.safety.max_chip_temp + 1):
                         actual_cooldown = max(15, self.config.cooldown_time)
+                        cooldown_scalable = False
                         logger.info(f"Extended cooldown ({actual_cooldown}s) - temps were high ({max_temp_seen:.1f}°C)")
                 elif not cycle_results:
                     # Test failed/aborted - use configured cooldown (likely needs recovery time)
                     actual_cooldown = self.config.cooldown_time
+                    cooldown_scalable = False
                     logger.info(f"Full cooldown ({actual_cooldown}s) - test failed or aborted")
                 
-                # Apply cooldown
-                if actual_cooldown > 0:
-                    logger.info(f"Cooling down for {actual_cooldown}s...")
-                    cooldown_remaining = actual_cooldown
-                    # Show initial cooldown message
-                    if self.status_callback:
-                        self.status_callback({
-                            'phase': 'cooldown',
-                            'message': f'Cooling down... {cooldown_remaining}s remaining'
-                        })
-                    while cooldown_remaining > 0 and not self.interrupted:
-                        await asyncio.sleep(1)  # Check interrupt every 1s
-                        cooldown_remaining -= 1
-                        if cooldown_remaining > 0 and cooldown_remaining % 5 == 0 and self.status_callback:
-                            self.status_callback({
-                                'phase': 'cooldown',
-                                'message': f'Cooling down... {cooldown_remaining}s remaining'
-                            })
+                # Applied once the next point is known, so a small step can wait less
+                pending_cooldown = actual_cooldown
+            
+            # Settle before the stability test too
+            await self._pay_cooldown(device, pending_cooldown, cooldown_scalable)
             
             # Find best results
             self._find_best_results()
@@ -360,25 +488,32 @@ class BenchmarkEngine:
             if self.session.best_hashrate:
                 best = TestResult.from_dict(self.session.best_hashrate)
                 logger.info(f"Applying best settings: {best.voltage}mV @ {best.frequency}MHz")
-                await device.set_voltage_frequency(best.voltage, best.frequency)
+                try:
+                    if await self._admit_point(device, best.voltage, best.frequency):
+                        await device.set_voltage_frequency(best.voltage, best.frequency)
+                except PowerBudgetTimeout as e:
+                    self.log_event(f"{e} - best settings not applied", 'warning')
             
             # Set stop reason based on strategy state
             if hasattr(strategy, 'limit_hit') and strategy.limit_hit:
                 self.session.stop_reason = f"{strategy.limit_type}: {strategy.stop_message}"
             elif hasattr(strategy, 'stop_message') and strategy.stop_message:
                 self.session.stop_reason = strategy.stop_message
+            elif power_stop_reason:
+                self.session.stop_reason = power_stop_reason
             elif self.interrupted:
                 self.session.stop_reason = "User stopped benchmark"
             else:
                 self.session.stop_reason = "Completed all planned tests"
             
             self.session.status = "completed"
-            self.session.end_time = datetime.now().isoformat()
+            self.session.end_time = self.clock.now().isoformat()
             
             # Log final summary
             self.log_event(f"Benchmark finished: {len(self.session.results)} tests completed", 'success')
             if self.session.stop_reason:
                 self.log_event(f"Stop reason: {self.session.stop_reason}", 'info')
+            finished = not self.interrupted
             
         except KeyboardInterrupt:
             logger.warning("Benchmark interrupted by user")
@@ -398,9 +533,27 @@ class BenchmarkEngine:
             await device.restore_defaults()
             
         finally:
-            # Save final session
+            if self.sample_writer:
+                self.sample_writer.close()
+            if self.log_writer:
+                self.log_writer.close()
+            
+            # Keep the resume state only while there is something left to resume
+            if finished:
+                try:
+                    self.resume_file.unlink()
+                except FileNotFoundError:
+                    pass
+            
+            # Save final session - compact the journal into the session document
             session_file = self.session_dir / f"session_{self.session_id}.json"
-            self.session.save(session_file)
+            session_data = self.session.to_dict()
+            if self.journal:
+                self.journal.compact(session_data, session_file)
+                self.journal = None
+            else:
+                write_json_atomic(session_file, session_data)
+            get_session_index(self.session_dir).update(session_file, session_data)
             logger.info(f"Session saved to {session_file}")
             
             # Export CSV if enabled
@@ -410,6 +563,262 @@ class BenchmarkEngine:
         
         return self.session
     
+    def _report_to_strategy(self, strategy: SearchStrategyBase, voltage: int, frequency: int,
+                            cycle_results: List[TestResult]) -> bool:
+        """Report a measured point to the strategy; True if the strategy hit a limit and the run should stop"""
+        best_cycle = max(cycle_results, key=lambda r: r.avg_hashrate)
+        avg_hashrate = sum(r.avg_hashrate for r in cycle_results) / len(cycle_results)
+        avg_efficiency = sum(r.efficiency for r in cycle_results) / len(cycle_results)
+        avg_error_pct = sum(getattr(r, 'error_percentage', 0) for r in cycle_results) / len(cycle_results)
+        max_error_pct = max(getattr(r, 'error_percentage', 0) for r in cycle_results)
+        
+        # Get error percentage from best cycle
+        error_pct = getattr(best_cycle, 'error_percentage', 0.0)
+        
+        # Log test completion with all stats
+        if self.status_callback:
+            self.status_callback({
+                'phase': 'test_complete',
+                'message': f'✓ TEST COMPLETE: {avg_hashrate:.1f} GH/s, {avg_efficiency:.1f} J/TH, err: {avg_error_pct:.2f}% avg ({max_error_pct:.2f}% max)'
+            })
+        
+        logger.info(f"Test complete: {voltage}mV @ {frequency}MHz: {avg_hashrate:.1f} GH/s, error: {error_pct:.2f}%")
+        
+        # Strategy makes the stability decision
+        # Use target_error from config as stable threshold
+        stable = error_pct < self.config.target_error
+        
+        # Call appropriate method based on strategy type
+        if hasattr(strategy, 'record_result'):
+            # Pass all data for limit checking and optimization
+            strategy.record_result(
+                voltage, frequency, best_cycle.avg_hashrate, error_pct, stable,
+                efficiency=best_cycle.efficiency,
+                fan_speed=getattr(best_cycle, 'fan_speed', None),
+                chip_temp=best_cycle.max_temp if hasattr(best_cycle, 'max_temp') else None,
+                vr_temp=best_cycle.max_vr_temp if hasattr(best_cycle, 'max_vr_temp') else None,
+                power=best_cycle.max_power if hasattr(best_cycle, 'max_power') else None,
+            )
+            
+            # Check if strategy hit a limit and should stop
+            if hasattr(strategy, 'limit_hit') and strategy.limit_hit:
+                logger.warning(f"Strategy hit limit: {strategy.limit_type}")
+                if self.status_callback:
+                    self.status_callback({
+                        'phase': 'limit_hit',
+                        'message': f'🛑 LIMIT REACHED: {strategy.stop_message}'
+                    })
+                return True  # Ends the benchmark loop
+        else:
+            strategy.add_result(
+                voltage,
+                frequency,
+                best_cycle.avg_hashrate,
+                best_cycle.efficiency
+            )
+        return False
+    
+    async def _pay_cooldown(self, device: BitaxeDevice, seconds: int, scalable: bool,
+                            voltage: Optional[int] = None, frequency: Optional[int] = None):
+        """Cooldown owed by the last point, before moving on to `voltage`/`frequency`"""
+        if seconds <= 0:
+            return
+        if self.config.settle_detection:
+            # A normal transition is covered by settling at the next point; after a hot
+            # or failed point wait (up to the cooldown) for the readings to steady
+            if not scalable:
+                await self._wait_for_settle(device, 0, seconds, 'cooldown')
+            return
+        if scalable and voltage is not None:
+            seconds = round(seconds * self._settle_fraction(voltage, frequency))
+        await self._cool_down(seconds)
+    
+    async def _wait_for_settle(self, device: BitaxeDevice, min_time: float, max_time: float, phase: str) -> bool:
+        """
+        Poll the device until its readings reach equilibrium (see SettleDetector),
+        waiting at least `min_time` and at most `max_time` seconds.
+        Returns True if it settled, False on timeout or interrupt.
+        """
+        detector = SettleDetector(
+            window=self.config.settle_window,
+            interval=self.config.settle_poll_interval,
+            temp_slope=self.config.settle_temp_slope,
+            hashrate_drift=self.config.settle_hashrate_drift,
+            power_drift=self.config.settle_power_drift,
+        )
+        label = 'Stabilizing' if phase == 'warmup' else 'Cooling down'
+        logger.info(f"{label}: waiting for equilibrium ({min_time}-{max_time}s)...")
+        start = self.clock.time()
+        next_update = 0
+        while not self.interrupted:
+            elapsed = self.clock.time() - start
+            if elapsed >= min_time and detector.settled:
+                logger.info(f"Settled after {elapsed:.0f}s ({detector.describe()})")
+                return True
+            if elapsed >= max_time:
+                logger.warning(f"Not settled after {max_time}s ({detector.describe()}) - continuing")
+                if self.status_callback and phase == 'warmup':
+                    self.status_callback({
+                        'phase': 'warning',
+                        'message': f'⚠️ Still drifting after {max_time}s ({detector.describe()}) - measuring anyway'
+                    })
+                return False
+            if elapsed >= next_update and self.status_callback:
+                status = {'phase': phase, 'message': f'{label}... {elapsed:.0f}s ({detector.describe()})'}
+                if phase == 'warmup':
+                    status['warmup_remaining'] = int(max_time - elapsed)
+                self.status_callback(status)
+                next_update = elapsed + 10
+            
+            info = await device.get_system_info(bypass_breaker=True)
+            if info and info.is_valid():
+                self._observe_power(device, info)
+                detector.push(self.clock.time(), info.hashrate, info.temperature, info.power)
+            await self.clock.sleep(self.config.settle_poll_interval)
+        return False
+    
+    def _observe_power(self, device: BitaxeDevice, info: SystemInfo):
+        if self.power_budget is not None:
+            self.power_budget.observe(device.name, info)
+    
+    async def _admit_point(self, device: BitaxeDevice, voltage: int, frequency: int) -> bool:
+        """
+        Wait until the device's shared PSU has headroom for the point. False if
+        interrupted; raises PowerBudgetTimeout after config.power_wait_timeout.
+        """
+        if self.power_budget is None or self.power_budget.try_admit(device.name, voltage, frequency):
+            return True
+        
+        # Drop to the (lower-power) defaults while deferred, so that devices
+        # waiting on each other at high points can't hold the PSU full forever
+        defaults = device.defaults
+        if (defaults and self._last_point and self._last_point != defaults
+                and self.power_budget.predict(device.name, *defaults) < self.power_budget.draw(device.name)):
+            if await device.restore_defaults():
+                self._last_point = defaults
+                if self.status_callback:
+                    self.status_callback({
+                        'phase': 'power_wait',
+                        'message': f'⏸ Shared PSU is at its limit - parked at {defaults[0]}mV @ {defaults[1]}MHz until there is headroom'
+                    })
+        
+        next_update = 0.0
+        
+        def on_wait(waited: float, load: float, limit: float):
+            nonlocal next_update
+            if waited >= next_update and self.status_callback:
+                self.status_callback({
+                    'phase': 'power_wait',
+                    'message': f'⏸ Waiting for PSU headroom for {voltage}mV @ {frequency}MHz '
+                               f'({load:.1f}W of {limit:.1f}W in use, {waited:.0f}s)'
+                })
+                next_update = waited + 30
+        
+        admitted = await self.power_budget.acquire(
+            device.name, voltage, frequency, timeout=self.config.power_wait_timeout,
+            should_stop=lambda: self.interrupted, on_wait=on_wait, clock=self.clock
+        )
+        if not admitted and not self.interrupted:
+            raise PowerBudgetTimeout(
+                f"No PSU headroom for {voltage}mV @ {frequency}MHz after {self.config.power_wait_timeout}s"
+            )
+        return admitted
+    
+    async def _cool_down(self, seconds: int):
+        """Wait out a cooldown with countdown updates (returns early if interrupted)"""
+        if seconds <= 0:
+            return
+        logger.info(f"Cooling down for {seconds}s...")
+        cooldown_remaining = seconds
+        # Show initial cooldown message
+        if self.status_callback:
+            self.status_callback({
+                'phase': 'cooldown',
+                'message': f'Cooling down... {cooldown_remaining}s remaining'
+            })
+        while cooldown_remaining > 0 and not self.interrupted:
+            await self.clock.sleep(1)  # Check interrupt every 1s
+            cooldown_remaining -= 1
+            if cooldown_remaining > 0 and cooldown_remaining % 5 == 0 and self.status_callback:
+                self.status_callback({
+                    'phase': 'cooldown',
+                    'message': f'Cooling down... {cooldown_remaining}s remaining'
+                })
+    
+    def _settle_fraction(self, voltage: int, frequency: int) -> float:
+        """
+        Share of the configured warmup/cooldown (under settle detection, of the
+        minimum and maximum settle wait) needed to move from the last point to
+        this one: proportional to the predicted change in power
+        (dynamic power scales with V^2 x f), from MIN_SETTLE_FRACTION for a
+        one-step move up to the full time at FULL_SETTLE_POWER_DELTA.
+        """
+        if not self.config.adaptive_settle or self._last_point is None:
+            return 1.0
+        last_voltage, last_frequency = self._last_point
+        before = last_voltage ** 2 * last_frequency
+        after = voltage ** 2 * frequency
+        delta = abs(after - before) / max(before, after, 1)
+        return min(1.0, max(MIN_SETTLE_FRACTION, delta / FULL_SETTLE_POWER_DELTA))
+    
+    def _report_failure(self, strategy: SearchStrategyBase, voltage: int, frequency: int):
+        """Mark a point that produced no result as unstable so the strategy skips/adjusts"""
+        if hasattr(strategy, 'record_result'):
+            strategy.record_result(voltage, frequency, 0, 100.0, False)
+        elif hasattr(strategy, 'mark_unstable'):
+            strategy.mark_unstable(voltage, frequency)
+    
+    # -- measurement reuse -------------------------------------------------
+    
+    def _reusable_measurement(self, voltage: int, frequency: int) -> Optional[Dict]:
+        """A valid cached measurement of this point from another session, if any"""
+        if self.measurement_cache is None:
+            return None
+        entry = self.measurement_cache.get(
+            voltage, frequency, self._fan_setting, measurement_settings(self.config),
+            now=self.clock.time(),
+            max_age=self.config.measurement_max_age,
+            ambient=self.config.ambient_temp,
+            ambient_tolerance=self.config.ambient_tolerance,
+        )
+        if entry is None or entry.get('session_id') == self.session_id:
+            return None
+        return entry
+    
+    def _replay_measurement(self, strategy: SearchStrategyBase, voltage: int, frequency: int,
+                            entry: Dict, total_tests: int) -> bool:
+        """Use a cached measurement as this point's result; True if the strategy hit a limit"""
+        try:
+            result = TestResult.from_dict(dict(entry['result'], reused_from=entry.get('session_id')))
+        except TypeError as e:
+            logger.warning(f"Ignoring unusable cached measurement for {voltage}mV @ {frequency}MHz: {e}")
+            return False
+        age_min = max(0, int(self.clock.time() - entry['measured_at'])) // 60
+        logger.info(f"Reusing {voltage}mV @ {frequency}MHz from session {result.reused_from} ({age_min} min old)")
+        self._record_result(result)
+        tests_done = len(self.session.results)
+        if self.status_callback:
+            self.status_callback({
+                'phase': 'info',
+                'message': f'♻ Reusing {voltage}mV @ {frequency}MHz measured {age_min} min ago '
+                           f'(session {result.reused_from}): {result.avg_hashrate:.1f} GH/s',
+                'tests_completed': tests_done,
+                'tests_total': total_tests,
+                'progress': int((tests_done / max(total_tests, 1)) * 100) if total_tests > 0 else 0
+            })
+        return self._report_to_strategy(strategy, voltage, frequency, [result])
+    
+    def _remember_measurement(self, voltage: int, frequency: int, result: TestResult):
+        """Offer a freshly measured point to later sessions on this device"""
+        if self.measurement_cache is None:
+            return
+        now = self.clock.time()
+        self.measurement_cache.put(
+            voltage, frequency, self._fan_setting, measurement_settings(self.config), result.to_dict(),
+            measured_at=now, session_id=self.session_id, ambient=self.config.ambient_temp,
+        )
+        self.measurement_cache.save(now, self.config.measurement_max_age)
+    
     async def _run_single_test(
         self,
         device: BitaxeDevice,
@@ -417,6 +826,8 @@ class BenchmarkEngine:
         frequency: int
     ) -> Optional[TestResult]:
         """Run a single benchmark test"""
+        self._test_index += 1
+        test_index = self._test_index
         
         # Update status - setting voltage/frequency
         if self.status_callback:
@@ -426,8 +837,21 @@ class BenchmarkEngine:
             })
         
         # Set voltage and frequency
+        if not await self._admit_point(device, voltage, frequency):
+            return None
+        # warmup_time is also the minimum wait under settle detection, so a long one
+        # extends the maximum; both shrink for a small step
+        warmup_time = self.config.warmup_time
+        settle_max_time = max(warmup_time, self.config.settle_max_time)
+        if not self.config.restart_between_tests:
+            fraction = self._settle_fraction(voltage, frequency)
+            warmup_time = round(warmup_time * fraction)
+            settle_max_time = round(settle_max_time * fraction)
         success = await device.set_voltage_frequency(voltage, frequency)
+        self._last_point = (voltage, frequency) if success else None
         if not success:
+            if self.power_budget is not None:
+                self.power_budget.release(device.name)
             logger.error("Failed to set voltage/frequency")
             if self.status_callback:
                 self.status_callback({
@@ -441,33 +865,38 @@ class BenchmarkEngine:
             if self.status_callback:
                 self.status_callback({'phase': 'restart', 'message': 'Restarting device...'})
             logger.info("Restarting device (optional - for stability)...")
-            await device.restart()
+            await device.restart(clock=self.clock)
         
-        # Wait for stabilization with countdown updates
-        logger.info(f"Waiting for device to stabilize ({self.config.warmup_time}s)...")
-        warmup_remaining = self.config.warmup_time
-        # Show initial warmup message
-        if self.status_callback:
-            self.status_callback({
-                'phase': 'warmup',
-                'message': f'Stabilizing... {warmup_remaining}s remaining',
-                'warmup_remaining': warmup_remaining
-            })
-        while warmup_remaining > 0 and not self.interrupted:
-            await asyncio.sleep(1)  # Check interrupt every 1s
-            warmup_remaining -= 1
-            if warmup_remaining > 0 and warmup_remaining % 5 == 0 and self.status_callback:
+        # Wait for stabilization - until readings reach equilibrium, or a fixed countdown
+        if self.config.settle_detection:
+            # Never give up before the detector has a full window to judge
+            settle_max_time = max(settle_max_time, self.config.settle_window + self.config.settle_poll_interval)
+            await self._wait_for_settle(device, warmup_time, settle_max_time, 'warmup')
+        else:
+            logger.info(f"Waiting for device to stabilize ({warmup_time}s)...")
+            warmup_remaining = warmup_time
+            # Show initial warmup message
+            if self.status_callback:
                 self.status_callback({
                     'phase': 'warmup',
                     'message': f'Stabilizing... {warmup_remaining}s remaining',
                     'warmup_remaining': warmup_remaining
                 })
+            while warmup_remaining > 0 and not self.interrupted:
+                await self.clock.sleep(1)  # Check interrupt every 1s
+                warmup_remaining -= 1
+                if warmup_remaining > 0 and warmup_remaining % 5 == 0 and self.status_callback:
+                    self.status_callback({
+                        'phase': 'warmup',
+                        'message': f'Stabilizing... {warmup_remaining}s remaining',
+                        'warmup_remaining': warmup_remaining
+                    })
         
         if self.interrupted:
             return None
         
         # Verify settings were applied
-        info = await device.get_system_info()
+        info = await device.get_system_info(bypass_breaker=True)
         if info:
             actual_voltage = info.voltage
             actual_frequency = info.frequency
@@ -486,14 +915,18 @@ class BenchmarkEngine:
         # Reset share counters
         await device.reset_share_counters()
         
-        # Collect samples
-        hashrate_samples = []
-        temp_samples = []
-        vr_temp_samples = []
-        power_samples = []
-        input_voltage_samples = []
-        error_percentage_samples = []  # Track ASIC error rate
-        error_window: list[float] = []  # Rolling error history for adaptive cap
+        # Collect samples - streaming aggregates, constant memory however long the point runs
+        hashrate_stats = IQRFilteredStats()
+        temp_stats = RunningStats()
+        clean_temp_stats = IQRFilteredStats()  # excludes the first samples (thermal warmup)
+        thermal_trend = LinearTrend(window=self.config.thermal_predict_window)
+        vr_temp_stats = RunningStats()
+        power_stats = IQRFilteredStats()
+        input_voltage_stats = RunningStats()
+        error_stats = RunningStats()  # Track ASIC error rate
+        error_window = WindowedStats(6)  # Rolling error history for adaptive cap
+        initial_hashrate_stats = RunningStats()  # first 3 samples, reference for drop detection
+        recent_hashrates = deque(maxlen=5)  # for stuck-reading detection
         error_abort_threshold: Optional[float] = None  # Dynamic early-exit cap based on baseline
         error_cap_floor = max(self.config.target_error * 1.5, 0.2)  # Never cap tighter than this
         error_cap_multiplier = 1.75  # Slope factor vs. baseline
@@ -507,17 +940,19 @@ class BenchmarkEngine:
         max_power = 0.0
         max_error_percentage = 0.0
         
-        start_time = time.time()
+        start_time = self.clock.time()
         end_time = start_time + self.config.benchmark_duration
         sample_count = 0
         total_samples = self.config.benchmark_duration // self.config.sample_interval
         
         logger.info(f"Collecting samples for {self.config.benchmark_duration}s...")
         
-        while time.time() < end_time and not self.interrupted:
-            info = await device.get_system_info()
+        while self.clock.time() < end_time and not self.interrupted:
+            # The breaker gates UI and scheduler reads; a few timeouts at a hard point
+            # mustn't blank the samples until the next background probe
+            info = await device.get_system_info(bypass_breaker=True)
             
-            elapsed = int(time.time() - start_time)
+            elapsed = int(self.clock.time() - start_time)
             remaining = self.config.benchmark_duration - elapsed
             
             if not info or not info.is_valid():
@@ -531,9 +966,28 @@ class BenchmarkEngine:
                 for _ in range(self.config.sample_interval):
                     if self.interrupted:
                         break
-                    await asyncio.sleep(1)
+                    await self.clock.sleep(1)
                 continue
             
+            self._observe_power(device, info)
+            
+            # Keep the raw reading (even one that trips a limit below)
+            if self.sample_writer:
+                self.sample_writer.append(
+                    test_index,
+                    self.clock.time(),
+                    self.clock.time() - start_time,
+                    voltage,
+                    frequency,
+                    hashrate=info.hashrate,
+                    temperature=info.temperature,
+                    power=info.power,
+                    vr_temp=info.vr_temp,
+                    input_voltage=info.input_voltage,
+                    error_percentage=getattr(info, 'error_percentage', 0),
+                    fan_speed=getattr(info, 'fan_speed', 0)
+                )
+            
             # Check safety limits
             if not self._check_safety(info, voltage, frequency):
                 logger.error("Safety limits exceeded, aborting test")
@@ -545,14 +999,20 @@ class BenchmarkEngine:
                 return None
             
             # Collect data
-            hashrate_samples.append(info.hashrate)
-            temp_samples.append(info.temperature)
-            power_samples.append(info.power)
-            input_voltage_samples.append(info.input_voltage)
+            hashrate_stats.push(info.hashrate)
+            temp_stats.push(info.temperature)
+            if temp_stats.count > 6:  # Skip warmup
+                clean_temp_stats.push(info.temperature)
+            thermal_trend.push(info.temperature)
+            power_stats.push(info.power)
+            input_voltage_stats.push(info.input_voltage)
+            if initial_hashrate_stats.count < 3:
+                initial_hashrate_stats.push(info.hashrate)
+            recent_hashrates.append(info.hashrate)
             
             # Track error percentage
             error_pct = getattr(info, 'error_percentage', 0)
-            error_percentage_samples.append(error_pct)
+            error_stats.push(error_pct)
             max_error_percentage = max(max_error_percentage, error_pct)
 
             # Dynamic ASIC error early-exit:
@@ -560,13 +1020,11 @@ class BenchmarkEngine:
             # - Cap is softer: max(floor, baseline * multiplier, baseline + 2*std)
             # - Only abort after a short grace window and repeated breaches (or a large spike)
             if error_pct > 0:
-                error_window.append(error_pct)
-                if len(error_window) > 6:
-                    error_window.pop(0)
+                error_window.push(error_pct)
 
-                if len(error_window) >= 3:
-                    baseline = statistics.mean(error_window)
-                    stdev = statistics.pstdev(error_window) if len(error_window) > 1 else 0.0
+                if error_window.count >= 3:
+                    baseline = error_window.mean
+                    stdev = error_window.pstdev
                     dynamic_cap = max(
                         error_cap_floor,
                         baseline * error_cap_multiplier,
@@ -622,7 +1080,7 @@ class BenchmarkEngine:
 
             
             if info.vr_temp:
-                vr_temp_samples.append(info.vr_temp)
+                vr_temp_stats.push(info.vr_temp)
                 max_vr_temp = max(max_vr_temp, info.vr_temp)
             
             max_temp = max(max_temp, info.temperature)
@@ -658,8 +1116,8 @@ class BenchmarkEngine:
                 })
             
             # Check for hashrate drop (instability detection)
-            if len(hashrate_samples) >= 3:
-                initial_hashrate = sum(hashrate_samples[:3]) / 3
+            if hashrate_stats.raw.count >= 3:
+                initial_hashrate = initial_hashrate_stats.mean
                 current_hashrate = info.hashrate
                 
                 # Also check expected hashrate if provided
@@ -687,15 +1145,16 @@ class BenchmarkEngine:
                         logger.info(f"Hashrate variance {variance_percent:.2f}% at {voltage}mV/{frequency}MHz - acceptable")
             
             # Check for stuck readings
-            if len(hashrate_samples) >= 5:
-                if self.analyzer.detect_stuck_readings(hashrate_samples[-5:]):
+            if len(recent_hashrates) >= 5:
+                if self.analyzer.detect_stuck_readings(list(recent_hashrates)):
                     logger.error("Stuck hashrate readings detected, aborting test")
-                    await device.restart()
+                    await device.restart(clock=self.clock)
                     return None
             
             # Intelligent Thermal Prediction
-            if self.config.adaptive_duration and len(temp_samples) >= 5:
-                slope, is_heating = self.analyzer.predict_thermal_trend(temp_samples)
+            if self.config.adaptive_duration and temp_stats.count >= 5 and thermal_trend.full:
+                slope = thermal_trend.slope
+                is_heating = slope > HEATING_SLOPE
                 
                 # Calculate predicted final temperature
                 samples_remaining = total_samples - sample_count
@@ -722,9 +1181,27 @@ class BenchmarkEngine:
                         })
                     break
             
+            # Sequential stop: enough dwell and the estimates are already tight
+            if self.config.adaptive_sampling:
+                precision = self._sampling_converged(
+                    self.clock.time() - start_time,
+                    hashrate_stats.raw,
+                    power_stats.raw,
+                    error_stats,
+                    thermal_trend
+                )
+                if precision:
+                    logger.info(f"Estimates converged after {sample_count} samples ({precision}) - ending test early")
+                    if self.status_callback:
+                        self.status_callback({
+                            'phase': 'sampling',
+                            'message': f'✓ Converged after {sample_count} samples ({precision}), ending point early'
+                        })
+                    break
+            
             # Log progress
-            elapsed = time.time() - start_time
-            remaining = end_time - time.time()
+            elapsed = self.clock.time() - start_time
+            remaining = end_time - self.clock.time()
             logger.info(
                 f"Sample {sample_count}: {info.hashrate:.1f} GH/s, "
                 f"{info.temperature:.1f}°C, {info.power:.1f}W "
@@ -735,7 +1212,7 @@ class BenchmarkEngine:
             for _ in range(self.config.sample_interval):
                 if self.interrupted:
                     break
-                await asyncio.sleep(1)
+                await self.clock.sleep(1)
         
         # Update status - sampling complete
         if self.status_callback:
@@ -757,56 +1234,53 @@ class BenchmarkEngine:
                 })
             return None
         
-        # Process data with outlier removal
-        clean_hashrate, _ = self.analyzer.remove_outliers_iqr(hashrate_samples)
-        clean_temp, _ = self.analyzer.remove_outliers_iqr(temp_samples[6:])  # Skip warmup
-        clean_power, _ = self.analyzer.remove_outliers_iqr(power_samples)
+        # Outlier-filtered aggregates (IQR fences tracked while sampling)
+        clean_hashrate = hashrate_stats.clean
+        clean_temp = clean_temp_stats.clean
+        clean_power = power_stats.clean
         
-        if not clean_hashrate or not clean_temp:
+        if not clean_hashrate.count or not clean_temp.count:
             logger.warning("No valid samples after outlier removal")
             return None
         
-        # Calculate statistics
-        hashrate_stats = self.analyzer.calculate_statistics(clean_hashrate)
-        
         # Calculate efficiency (J/TH)
-        avg_hashrate = hashrate_stats.mean if hashrate_stats else 0
-        avg_power = sum(clean_power) / len(clean_power) if clean_power else 0
+        avg_hashrate = clean_hashrate.mean
+        avg_power = clean_power.mean if clean_power.count else 0
         efficiency = (avg_power / (avg_hashrate / 1000)) if avg_hashrate > 0 else float('inf')
         
-        # Calculate stability score
-        stability_score = self.analyzer.calculate_stability_score(
-            clean_hashrate,
-            clean_temp,
-            clean_power
+        # Calculate stability score (same thresholds as calculate_statistics: needs 2+ samples)
+        stability_score = self.analyzer.stability_score_from_stats(
+            clean_hashrate if clean_hashrate.count >= 2 else None,
+            clean_temp if clean_temp.count >= 2 else None,
+            clean_power if clean_power.count >= 2 else None
         )
         
         # Get final info for reject rate
-        final_info = await device.get_system_info()
+        final_info = await device.get_system_info(bypass_breaker=True)
         reject_rate = device.get_reject_rate(final_info) if final_info else 0.0
         
         # Calculate average error percentage from samples
-        avg_error_percentage = sum(error_percentage_samples) / len(error_percentage_samples) if error_percentage_samples else 0.0
+        avg_error_percentage = error_stats.mean if error_stats.count else 0.0
         
         # Create result
         result = TestResult(
-            timestamp=datetime.now().isoformat(),
+            timestamp=self.clock.now().isoformat(),
             device_name=device.name,
             voltage=voltage,
             frequency=frequency,
             avg_hashrate=avg_hashrate,
-            hashrate_variance=hashrate_stats.variance if hashrate_stats else 0,
-            avg_temp=sum(clean_temp) / len(clean_temp) if clean_temp else 0,
+            hashrate_variance=clean_hashrate.variance,
+            avg_temp=clean_temp.mean,
             max_temp=max_temp,
-            avg_vr_temp=sum(vr_temp_samples) / len(vr_temp_samples) if vr_temp_samples else None,
-            max_vr_temp=max_vr_temp if vr_temp_samples else None,
+            avg_vr_temp=vr_temp_stats.mean if vr_temp_stats.count else None,
+            max_vr_temp=max_vr_temp if vr_temp_stats.count else None,
             avg_power=avg_power,
             max_power=max_power,
             efficiency=efficiency,
-            avg_input_voltage=sum(input_voltage_samples) / len(input_voltage_samples),
+            avg_input_voltage=input_voltage_stats.mean,
             samples_collected=sample_count,
-            test_duration=int(time.time() - start_time),
-            rejected_samples=len(hashrate_samples) - len(clean_hashrate),
+            test_duration=int(self.clock.time() - start_time),
+            rejected_samples=hashrate_stats.rejected,
             stability_score=stability_score,
             error_percentage=avg_error_percentage
         )
@@ -836,6 +1310,47 @@ class BenchmarkEngine:
         
         return result
     
+    def _sampling_converged(
+        self,
+        elapsed: float,
+        hashrate: RunningStats,
+        power: RunningStats,
+        errors: RunningStats,
+        thermal_trend: LinearTrend
+    ) -> Optional[str]:
+        """
+        Sequential stopping rule for adaptive sampling.
+        
+        Returns a short precision summary once the min dwell time has passed,
+        min_samples are in, the chip is no longer heating, and the 95% CIs of
+        hashrate, power and ASIC error rate are all within their targets.
+        Otherwise returns None.
+        """
+        if elapsed < self.config.min_dwell_time or hashrate.count < self.config.min_samples:
+            return None
+        
+        # Still soaking - the means are drifting even if the spread looks tight
+        if not thermal_trend.full or thermal_trend.slope > HEATING_SLOPE:
+            return None
+        
+        hashrate_hw = hashrate.ci_half_width()
+        power_hw = power.ci_half_width()
+        error_hw = errors.ci_half_width()
+        if hashrate_hw is None or power_hw is None or error_hw is None:
+            return None
+        
+        if hashrate.mean <= 0 or power.mean <= 0:
+            return None
+        
+        hashrate_pct = hashrate_hw / hashrate.mean * 100
+        power_pct = power_hw / power.mean * 100
+        if (hashrate_pct > self.config.hashrate_ci_target
+                or power_pct > self.config.power_ci_target
+                or error_hw > self.config.error_ci_target):
+            return None
+        
+        return f"hashrate ±{hashrate_pct:.2f}%, power ±{power_pct:.2f}%, error ±{error_hw:.3f}pp"
+    
     def _check_safety(self, info: SystemInfo, voltage: int = None, frequency: int = None) -> bool:
         """Check if system info is within safety limits. Notifies strategy on limit hit."""
         limit_hit = False
@@ -946,7 +1461,13 @@ class BenchmarkEngine:
         """Run extended stability test"""
         logger.info(f"Stability test: {self.config.stability_test_duration}s")
         
-        result = await self._run_single_test(device, voltage, frequency)
+        try:
+            result = await self._run_single_test(device, voltage, frequency)
+        except PowerBudgetTimeout as e:
+            logger.warning(f"Stability test skipped: {e}")
+            return False
+        if self.sample_writer:
+            self.sample_writer.flush()
         
         if not result:
             logger.error("Stability test failed")
@@ -956,7 +1477,7 @@ class BenchmarkEngine:
         if result.stability_score < 80:
             logger.warning(f"Low stability score: {result.stability_score:.1f}/100")
         
-        final_info = await device.get_system_info()
+        final_info = await device.get_system_info(bypass_breaker=True)
         if final_info:
             reject_rate = device.get_reject_rate(final_info)
             if reject_rate > self.config.reject_rate_threshold:
@@ -965,8 +1486,9 @@ class BenchmarkEngine:
         logger.info("Stability test complete")
         return True
     
-    def _save_checkpoint(self):
-        """Save checkpoint"""
-        if self.session:
-            self.session.save(self.checkpoint_file)
-            logger.debug(f"Checkpoint saved: {len(self.session.results)} results")
+    def _record_result(self, result: TestResult):
+        """Add a result to the session and its journal"""
+        self.session.results.append(result.to_dict())
+        if self.journal:
+            self.journal.append_result(self.session.results[-1])
+            logger.debug(f"Checkpoint: {len(self.session.results)} results journaled")
@@ -15,6 +15,8 @@ from config import (
 )
 from device_manager import DeviceManager
 from benchmark_engine import BenchmarkEngine
+from fleet_runner import FleetRunner
+from power_budget import PowerBudget
 from visualizer import Visualizer
 from data_analyzer import DataAnalyzer
 
@@ -38,6 +40,7 @@ class BitaxeBenchmarkPro:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
         self.devices_file = self.config_dir / "devices.json"
+        self.psus_file = self.config_dir / "shared_psus.json"
         self.sessions_dir = self.config_dir / "sessions"
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
         
@@ -59,12 +62,25 @@ class BitaxeBenchmarkPro:
                     dev_data['ip_address'],
                     dev_data.get('model', 'Unknown')
                 )
+            # Full configs carry each device's PSU assignment
+            self.device_manager.set_device_configs(devices_data)
             
             logger.info(f"Loaded {len(devices_data)} devices")
             
         except Exception as e:
             logger.error(f"Error loading devices: {e}")
     
+    def load_shared_psus(self):
+        """Load the shared PSUs devices can be assigned to"""
+        if not self.psus_file.exists():
+            return
+        
+        try:
+            with open(self.psus_file, 'r') as f:
+                self.device_manager.set_shared_psus(json.load(f))
+        except Exception as e:
+            logger.error(f"Error loading shared PSUs: {e}")
+    
     def save_devices(self):
         """Save device configurations"""
         devices_data = []
@@ -127,6 +143,55 @@ class BitaxeBenchmarkPro:
         finally:
             await self.device_manager.cleanup_all()
     
+    async def run_fleet_benchmark(
+        self,
+        device_names: List[str],
+        config: BenchmarkConfig,
+        safety: SafetyLimits
+    ):
+        """Run benchmarks on several devices at once"""
+        def print_status(name: str, status: dict):
+            if status.get('message'):
+                logger.info(f"[{name}] {status['message']}")
+        
+        # Devices on a shared PSU take turns raising their draw
+        self.load_shared_psus()
+        runner = FleetRunner(config, safety, self.device_manager, self.sessions_dir,
+                             status_callback=print_status,
+                             power_budget=PowerBudget(self.device_manager))
+        try:
+            results = await runner.run(device_names)
+            
+            for name, result in results.items():
+                if not result.session:
+                    continue
+                if config.enable_plotting and result.session.results:
+                    plots_dir = self.sessions_dir / f"plots_{result.session.session_id}"
+                    Visualizer.create_all_plots(result.session.results, plots_dir)
+                print(f"\n{name}:")
+                self._print_summary(result.session)
+            
+            print("\n" + "=" * 60)
+            print("FLEET SUMMARY")
+            print("=" * 60)
+            for name, result in results.items():
+                if result:
+                    best = result.session.best_hashrate
+                    best_text = f"{best['voltage']}mV @ {best['frequency']}MHz" if best else "no stable point"
+                    print(f"  {name}: {len(result.session.results)} tests, best {best_text} "
+                          f"({result.elapsed / 60:.0f} min)")
+                else:
+                    print(f"  {name}: FAILED - {result.error}")
+            
+        except KeyboardInterrupt:
+            runner.stop()
+            
+        except Exception as e:
+            logger.error(f"Fleet benchmark failed: {e}", exc_info=True)
+            
+        finally:
+            await self.device_manager.cleanup_all()
+    
     def _print_summary(self, session):
         """Print benchmark summary"""
         print("\n" + "=" * 60)
@@ -189,10 +254,10 @@ def main():
     
     # Benchmark command
     bench_parser = subparsers.add_parser('benchmark', help='Run benchmark')
-    bench_parser.add_argument('device', help='Device name')
+    bench_parser.add_argument('device', nargs='+', help='Device name(s); several run as a fleet')
     bench_parser.add_argument('--preset', choices=list(PRESETS.keys()),
                              help='Use preset configuration')
-    bench_parser.add_argument('--strategy', choices=['linear', 'binary', 'adaptive_grid'],
+    bench_parser.add_argument('--strategy', choices=['linear', 'binary', 'adaptive_grid', 'bayesian'],
                              default='adaptive_grid', help='Search strategy')
     bench_parser.add_argument('--goal', choices=['max_hashrate', 'max_efficiency', 'balanced'],
                              default='balanced', help='Optimization goal')
@@ -207,7 +272,19 @@ def main():
     bench_parser.add_argument('--no-csv', action='store_true', help='Disable CSV export')
     bench_parser.add_argument('--restart', action='store_true', 
                              help='Restart device between tests (slower but more thorough)')
-    bench_parser.add_argument('--warmup', type=int, help='Warmup time (seconds)')
+    bench_parser.add_argument('--warmup', type=int,
+                             help='Warmup time (seconds); the minimum wait when settle detection is on')
+    bench_parser.add_argument('--no-settle', action='store_true',
+                             help='Wait the fixed warmup/cooldown instead of detecting equilibrium')
+    bench_parser.add_argument('--settle-window', type=int,
+                             help='Seconds of readings the equilibrium check looks back over')
+    bench_parser.add_argument('--settle-max', type=int,
+                             help='Longest wait for equilibrium before measuring anyway (seconds)')
+    bench_parser.add_argument('--reuse', action='store_true',
+                             help='Reuse recent measurements of a point instead of re-testing it')
+    bench_parser.add_argument('--ambient', type=float, help='Room temperature (°C) recorded with measurements')
+    bench_parser.add_argument('--parallel', type=int,
+                             help='Benchmark up to N of the given devices at once')
     
     # List presets command
     subparsers.add_parser('list-presets', help='List available presets')
@@ -297,11 +374,27 @@ def main():
             config.restart_between_tests = True
         if args.warmup:
             config.warmup_time = args.warmup
+        if args.no_settle:
+            config.settle_detection = False
+        if args.settle_window:
+            config.settle_window = args.settle_window
+        if args.settle_max:
+            config.settle_max_time = args.settle_max
+        if args.reuse:
+            config.reuse_measurements = True
+        if args.ambient is not None:
+            config.ambient_temp = args.ambient
+        if args.parallel:
+            config.parallel_devices = args.parallel > 1
+            config.max_parallel_devices = args.parallel
         
         safety = SafetyLimits()
         
         # Run benchmark
-        asyncio.run(app.run_benchmark(args.device, config, safety))
+        if len(args.device) > 1:
+            asyncio.run(app.run_fleet_benchmark(args.device, config, safety))
+        else:
+            asyncio.run(app.run_benchmark(args.device[0], config, safety))
     
     elif args.command == 'analyze':
         # Load session
@@ -0,0 +1,471 @@
+"""
+Bitaxe / AxeOS simulator
+
+Serves the subset of the AxeOS HTTP API that AxeBench uses
+(GET /api/system/info, PATCH /api/system, POST /api/system/restart) for any
+number of virtual miners, one per port. Telemetry follows a simple physical
+model so the benchmark engine, schedulers and DeviceManager can be exercised
+without hardware:
+
+- hashrate = frequency x small cores, reduced by the ASIC error rate
+- error rate rises exponentially once core voltage drops below what this
+  particular chip needs for the frequency (silicon quality shifts that curve)
+- power = static board draw + dynamic C*f*V^2, plus temperature-driven leakage
+- chip / VR temperature approach ambient + power x thermal resistance with a
+  first-order lag; thermal resistance falls as the fan speeds up
+- auto fan mode steers fan speed toward the target temperature
+
+Usage:
+    python bitaxe_simulator.py --devices 50 --model gamma --base-port 8100 \\
+        --export sim_devices.json
+
+Each device is then reachable as 127.0.0.1:<port>, which DeviceManager accepts
+as an ip_address.
+
+In-process, pass the same clock.VirtualClock to SimulatorFleet.build() and
+BenchmarkEngine so the physics advance on virtual time and a full benchmark
+completes in seconds.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import signal
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from clock import SYSTEM_CLOCK, Clock
+from config import MODEL_CONFIGS
+
+logger = logging.getLogger(__name__)
+
+# Small cores per ASIC - expected hashrate (GH/s) = freq(MHz) * cores * chips / 1000
+SMALL_CORES = {
+    "BM1370": 2040,
+    "BM1368": 1276,
+    "BM1366": 894,
+    "BM1397": 672,
+}
+
+FAILURE_MODES = ("none", "offline", "flaky", "crash_on_overvolt", "stuck", "overheat")
+
+STATIC_POWER = 1.5  # W - board, fan and regulator overhead
+VOLTAGE_SLOPE = 0.55  # extra mV needed per MHz above stock
+ERROR_DEFICIT_SCALE = 20.0  # mV of undervolt per e-fold increase in error rate
+CHIP_TAU = 20.0  # s - chip thermal time constant
+VR_TAU = 40.0  # s - regulator thermal time constant
+R_TH_MIN = 1.2  # degC/W at 100% fan
+R_TH_MAX = 4.0  # degC/W with the fan stopped
+OVERHEAT_TEMP = 75.0  # AxeOS drops to stock settings above this
+POOL_DIFFICULTY = 1000.0
+
+
+@dataclass
+class SimulatedBitaxe:
+    """One virtual miner and its physical state"""
+    name: str
+    model: str = "gamma"
+    port: int = 0
+    quality: float = 1.0  # >1 = better silicon (stable at lower voltage)
+    noise: float = 0.01  # relative noise on hashrate/power readings
+    ambient: float = 25.0
+    failure_mode: str = "none"
+    flaky_rate: float = 0.2  # request failure probability in "flaky" mode
+    reboot_time: float = 8.0
+    seed: Optional[int] = None
+    clock: Clock = field(default=SYSTEM_CLOCK, repr=False)  # share a VirtualClock with the engine to compress time
+
+    # Live state (initialised in __post_init__)
+    voltage: int = 0
+    frequency: int = 0
+    auto_fan: bool = True
+    target_temp: float = 60.0
+    fan_speed: float = 50.0
+    chip_temp: float = 0.0
+    vr_temp: float = 0.0
+    shares_accepted: float = 0.0
+    shares_rejected: float = 0.0
+    best_diff: float = 0.0
+    best_session_diff: float = 0.0
+    overheat_mode: bool = False
+    stratum: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.model not in MODEL_CONFIGS:
+            raise ValueError(f"Unknown model '{self.model}'")
+        if self.failure_mode not in FAILURE_MODES:
+            raise ValueError(f"Unknown failure mode '{self.failure_mode}'")
+        cfg = MODEL_CONFIGS[self.model]
+        self.cfg = cfg
+        self.chip = cfg["chip"]
+        self.chip_count = cfg.get("chip_count", 1)
+        self.voltage = self.voltage or cfg["stock_voltage"]
+        self.frequency = self.frequency or cfg["stock_frequency"]
+        self.rng = random.Random(self.seed)
+        self.base_error = 0.1 + 0.15 * self.rng.random()
+        # Calibrate the dynamic power coefficient so stock settings draw stock power
+        stock_power = cfg.get("stock_power", cfg.get("typical_power", 15.0))
+        self.power_coeff = max(0.1, stock_power - STATIC_POWER) / (
+            self.chip_count * cfg["stock_frequency"] * (cfg["stock_voltage"] / 1000.0) ** 2
+        )
+        # Bigger boards carry bigger heatsinks
+        self.r_scale = 1.0 / (self.chip_count ** 0.7)
+        if self.failure_mode == "overheat":
+            self.r_scale *= 1.8
+        self.chip_temp = self.ambient + 5.0
+        self.vr_temp = self.ambient + 5.0
+        self.booted_at = self.clock.time()
+        self.rebooting_until = 0.0
+        self.last_update = self.clock.time()
+        self.frozen: Optional[Dict[str, Any]] = None
+        self.stratum = self.stratum or {
+            "stratumURL": "public-pool.io", "stratumPort": 21496,
+            "stratumUser": f"bc1qsimulated.{self.name}", "stratumPassword": "x",
+            "fallbackStratumURL": "", "fallbackStratumPort": 0,
+            "fallbackStratumUser": "", "fallbackStratumPassword": "x",
+        }
+
+    # ---- physics ---------------------------------------------------------
+
+    @property
+    def expected_hashrate(self) -> float:
+        return self.frequency * SMALL_CORES.get(self.chip, 1000) * self.chip_count / 1000.0
+
+    def required_voltage(self, frequency: Optional[float] = None) -> float:
+        """Core voltage this chip needs to run `frequency` cleanly"""
+        frequency = self.frequency if frequency is None else frequency
+        return (self.cfg["stock_voltage"]
+                + VOLTAGE_SLOPE * (frequency - self.cfg["stock_frequency"])
+                - (self.quality - 1.0) * 100.0)
+
+    def error_rate(self) -> float:
+        """ASIC error percentage at the current settings and temperature"""
+        deficit = self.required_voltage() - self.voltage
+        err = self.base_error
+        if deficit > 0:
+            err += 0.4 * (math.exp(deficit / ERROR_DEFICIT_SCALE) - 1.0)
+        if self.chip_temp > 65.0:
+            err += 0.05 * (self.chip_temp - 65.0) ** 1.5
+        return min(err, 100.0)
+
+    def power(self) -> float:
+        dynamic = self.power_coeff * self.chip_count * self.frequency * (self.voltage / 1000.0) ** 2
+        leakage = 1.0 + 0.008 * max(0.0, self.chip_temp - 40.0)
+        return STATIC_POWER + dynamic * leakage
+
+    def thermal_resistance(self) -> float:
+        return (R_TH_MIN + (R_TH_MAX - R_TH_MIN) * (1.0 - self.fan_speed / 100.0) ** 1.5) * self.r_scale
+
+    def advance(self, now: Optional[float] = None):
+        """Integrate the model up to `now` in <=1s steps"""
+        now = self.clock.time() if now is None else now
+        remaining = min(now - self.last_update, 600.0)
+        self.last_update = now
+        while remaining > 0:
+            dt = min(1.0, remaining)
+            remaining -= dt
+            self._step(dt)
+
+    def _step(self, dt: float):
+        power = self.power()
+        chip_target = self.ambient + power * self.thermal_resistance()
+        vr_target = self.ambient + 5.0 + power * self.thermal_resistance() * 1.25
+        self.chip_temp += (chip_target - self.chip_temp) * (1.0 - math.exp(-dt / CHIP_TAU))
+        self.vr_temp += (vr_target - self.vr_temp) * (1.0 - math.exp(-dt / VR_TAU))
+
+        if self.auto_fan:
+            self.fan_speed = min(100.0, max(20.0, self.fan_speed + 2.0 * (self.chip_temp - self.target_temp) * dt))
+
+        if self.chip_temp >= OVERHEAT_TEMP and not self.overheat_mode:
+            logger.warning(f"{self.name}: overheat - dropping to stock settings")
+            self.overheat_mode = True
+            self.voltage = self.cfg["stock_voltage"]
+            self.frequency = self.cfg["stock_frequency"]
+            self.auto_fan = False
+            self.fan_speed = 100.0
+
+        # Shares found at the pool difficulty; invalid ones scale with the error rate
+        err = self.error_rate()
+        good_rate = self.expected_hashrate * 1e9 * (1.0 - err / 100.0) / (POOL_DIFFICULTY * 2 ** 32)
+        shares = good_rate * dt
+        self.shares_accepted += shares
+        self.shares_rejected += shares * min(0.5, err / 200.0)
+        if shares > 0 and self.rng.random() < min(1.0, shares):
+            diff = POOL_DIFFICULTY / max(1e-9, self.rng.random())
+            self.best_session_diff = max(self.best_session_diff, diff)
+            self.best_diff = max(self.best_diff, diff)
+
+    def _jitter(self, value: float) -> float:
+        return value * (1.0 + self.rng.gauss(0.0, self.noise))
+
+    # ---- API -------------------------------------------------------------
+
+    @property
+    def rebooting(self) -> bool:
+        return self.clock.time() < self.rebooting_until
+
+    def reboot(self):
+        """Restart: unreachable for reboot_time, then back with counters reset"""
+        self.rebooting_until = self.clock.time() + self.reboot_time
+        self.booted_at = self.rebooting_until
+        self.shares_accepted = self.shares_rejected = 0.0
+        self.best_session_diff = 0.0
+        self.overheat_mode = False
+        self.frozen = None
+
+    def system_info(self) -> Dict[str, Any]:
+        self.advance()
+        if self.failure_mode == "stuck" and self.frozen is not None:
+            return dict(self.frozen, uptimeSeconds=int(self.clock.time() - self.booted_at))
+
+        err = self.error_rate()
+        power = max(0.0, self._jitter(self.power()))
+        input_voltage = 5000.0 + self.rng.gauss(0.0, 15.0)
+        info = {
+            "hostname": self.name,
+            "ASICModel": self.chip,
+            "asicCount": self.chip_count,
+            "smallCoreCount": SMALL_CORES.get(self.chip, 1000),
+            "boardVersion": "sim",
+            "version": "sim-2.4.0",
+            "hashRate": max(0.0, self._jitter(self.expected_hashrate * (1.0 - min(err, 95.0) / 100.0))),
+            "expectedHashrate": self.expected_hashrate,
+            "errorPercentage": round(max(0.0, self._jitter(err)), 3),
+            "temp": round(self.chip_temp + self.rng.gauss(0.0, 0.2), 2),
+            "vrTemp": round(self.vr_temp + self.rng.gauss(0.0, 0.3), 2),
+            "power": round(power, 3),
+            "voltage": round(input_voltage, 1),
+            "current": round(power / (input_voltage / 1000.0) * 1000.0, 1),
+            "coreVoltage": self.voltage,
+            "coreVoltageActual": int(self.voltage - 5 + self.rng.gauss(0.0, 3.0)),
+            "frequency": self.frequency,
+            "fanspeed": round(self.fan_speed),
+            "fanrpm": int(self.fan_speed * 60),
+            "autofanspeed": 1 if self.auto_fan else 0,
+            "temptarget": self.target_temp,
+            "overheat_mode": 1 if self.overheat_mode else 0,
+            "sharesAccepted": int(self.shares_accepted),
+            "sharesRejected": int(self.shares_rejected),
+            "bestDiff": _format_diff(self.best_diff),
+            "bestSessionDiff": _format_diff(self.best_session_diff),
+            "poolDifficulty": POOL_DIFFICULTY,
+            "uptimeSeconds": int(self.clock.time() - self.booted_at),
+            "isUsingFallback": 0,
+            **self.stratum,
+        }
+        if self.failure_mode == "stuck" and info["uptimeSeconds"] > 120:
+            self.frozen = info
+        return info
+
+    def apply_settings(self, payload: Dict[str, Any]):
+        """PATCH /api/system"""
+        self.advance()
+        if "coreVoltage" in payload:
+            self.voltage = int(payload["coreVoltage"])
+        if "frequency" in payload:
+            self.frequency = int(payload["frequency"])
+        if "autofanspeed" in payload:
+            self.auto_fan = bool(int(payload["autofanspeed"]))
+        if "fanspeed" in payload and not self.auto_fan:
+            self.fan_speed = float(payload["fanspeed"])
+        for key in ("targettemp", "temptarget"):
+            if key in payload:
+                self.target_temp = float(payload[key])
+        for key in self.stratum:
+            if key in payload:
+                self.stratum[key] = payload[key]
+        if "coreVoltage" in payload or "frequency" in payload:
+            self.overheat_mode = False
+            if self.failure_mode == "crash_on_overvolt" and (
+                    self.voltage > self.cfg["max_voltage"] or self.error_rate() > 30.0):
+                logger.warning(f"{self.name}: crashed at {self.voltage}mV @ {self.frequency}MHz")
+                self.voltage = self.cfg["stock_voltage"]
+                self.frequency = self.cfg["stock_frequency"]
+                self.reboot()
+
+
+def _format_diff(value: float) -> str:
+    """AxeOS-style difficulty string (e.g. 12.3M)"""
+    for suffix, scale in (("T", 1e12), ("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f}{suffix}"
+    return str(int(value))
+
+
+class SimulatorFleet:
+    """Runs many simulated miners, one TCP port each, on a single aiohttp app"""
+
+    def __init__(self, devices: List[SimulatedBitaxe], host: str = "127.0.0.1"):
+        self.host = host
+        self.devices: Dict[int, SimulatedBitaxe] = {d.port: d for d in devices}
+        self._runner: Optional[web.AppRunner] = None
+        self._closing: Optional[asyncio.Event] = None
+
+    async def _hang(self, seconds: float):
+        """Stall a request like an unresponsive device (cut short on shutdown)"""
+        try:
+            await asyncio.wait_for(self._closing.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    @classmethod
+    def build(
+        cls,
+        count: int,
+        model: str = "gamma",
+        base_port: int = 8100,
+        host: str = "127.0.0.1",
+        quality_spread: float = 0.04,
+        noise: float = 0.01,
+        failure_rates: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+        clock: Optional[Clock] = None,
+    ) -> "SimulatorFleet":
+        """Create `count` devices with randomised silicon quality and failure modes"""
+        rng = random.Random(seed)
+        failure_rates = failure_rates or {}
+        devices = []
+        for i in range(count):
+            failure = "none"
+            roll = rng.random()
+            for mode, rate in failure_rates.items():
+                if roll < rate:
+                    failure = mode
+                    break
+                roll -= rate
+            devices.append(SimulatedBitaxe(
+                name=f"sim-{model}-{i + 1:03d}",
+                model=model,
+                port=base_port + i,
+                quality=min(1.25, max(0.75, rng.gauss(1.0, quality_spread))),
+                noise=noise,
+                ambient=rng.uniform(22.0, 28.0),
+                failure_mode=failure,
+                seed=rng.randrange(1 << 30),
+                clock=clock or SYSTEM_CLOCK,
+            ))
+        return cls(devices, host=host)
+
+    def devices_config(self) -> List[Dict[str, Any]]:
+        """devices.json style entries pointing at the simulated miners"""
+        return [
+            {"name": d.name, "ip_address": f"{self.host}:{d.port}", "model": d.model}
+            for d in self.devices.values()
+        ]
+
+    async def _device_for(self, request: web.Request) -> SimulatedBitaxe:
+        port = request.transport.get_extra_info("sockname")[1]
+        device = self.devices.get(port)
+        if device is None:
+            raise web.HTTPNotFound()
+        if device.failure_mode == "offline":
+            await self._hang(3600)  # never answers - the client times out
+            raise web.HTTPServiceUnavailable()
+        if device.failure_mode == "flaky" and device.rng.random() < device.flaky_rate:
+            if device.rng.random() < 0.5:
+                await self._hang(30)
+            raise web.HTTPServiceUnavailable()
+        if device.rebooting:
+            raise web.HTTPServiceUnavailable(text="rebooting")
+        return device
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        device = await self._device_for(request)
+        return web.json_response(device.system_info())
+
+    async def _handle_patch(self, request: web.Request) -> web.Response:
+        device = await self._device_for(request)
+        try:
+            payload = await request.json()
+        except (json.JSONDecodeError, ValueError):
+            raise web.HTTPBadRequest(text="invalid JSON")
+        device.apply_settings(payload)
+        return web.Response(text="")
+
+    async def _handle_restart(self, request: web.Request) -> web.Response:
+        device = await self._device_for(request)
+        device.reboot()
+        return web.Response(text="System will restart shortly.")
+
+    async def start(self):
+        self._closing = asyncio.Event()
+        app = web.Application()
+        app.router.add_get("/api/system/info", self._handle_info)
+        app.router.add_patch("/api/system", self._handle_patch)
+        app.router.add_post("/api/system/restart", self._handle_restart)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        for port in self.devices:
+            await web.TCPSite(self._runner, self.host, port).start()
+        logger.info(f"Simulating {len(self.devices)} device(s) on {self.host}:"
+                    f"{min(self.devices)}-{max(self.devices)}")
+
+    async def stop(self):
+        if self._runner is not None:
+            self._closing.set()
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _parse_failures(spec: str) -> Dict[str, float]:
+    """'offline=0.05,flaky=0.1' -> {'offline': 0.05, 'flaky': 0.1}"""
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        mode, _, rate = part.partition("=")
+        if mode not in FAILURE_MODES:
+            raise argparse.ArgumentTypeError(f"unknown failure mode '{mode}'")
+        rates[mode] = float(rate or 0)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated Bitaxe/AxeOS devices for testing AxeBench")
+    parser.add_argument("--devices", type=int, default=1, help="Number of virtual devices")
+    parser.add_argument("--model", default="gamma", choices=sorted(MODEL_CONFIGS), help="Device model")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--base-port", type=int, default=8100, help="Port of the first device")
+    parser.add_argument("--quality-spread", type=float, default=0.04, help="Std-dev of silicon quality")
+    parser.add_argument("--noise", type=float, default=0.01, help="Relative reading noise")
+    parser.add_argument("--failures", type=_parse_failures, default={},
+                        help=f"Failure mode rates, e.g. offline=0.05,flaky=0.1 ({', '.join(FAILURE_MODES[1:])})")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for a reproducible fleet")
+    parser.add_argument("--export", type=Path, help="Write a devices.json style file for the fleet")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    fleet = SimulatorFleet.build(
+        args.devices, model=args.model, base_port=args.base_port, host=args.host,
+        quality_spread=args.quality_spread, noise=args.noise,
+        failure_rates=args.failures, seed=args.seed,
+    )
+    if args.export:
+        args.export.write_text(json.dumps(fleet.devices_config(), indent=2))
+        print(f"Wrote {len(fleet.devices)} device(s) to {args.export}")
+
+    async def serve():
+        await fleet.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows
+                pass
+        try:
+            await stop.wait()
+        finally:
+            await fleet.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
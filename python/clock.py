@@ -0,0 +1,82 @@
+"""
+Time sources for the benchmark engine
+
+The engine never calls time.time() or asyncio.sleep() directly; it goes through
+a Clock. Production uses SystemClock (real wall-clock time). VirtualClock keeps
+its own notion of "now" that only moves when someone sleeps on it, so a
+benchmark against simulated devices that share the same clock runs warmup,
+sampling and cooldown in a fraction of a second instead of minutes.
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class Clock(ABC):
+    """Interface for the engine's time source"""
+
+    @abstractmethod
+    def time(self) -> float:
+        """Seconds since the epoch"""
+        pass
+
+    @abstractmethod
+    async def sleep(self, seconds: float):
+        """Suspend the caller for `seconds` of this clock's time"""
+        pass
+
+    def now(self) -> datetime:
+        """Current local time as a datetime (for timestamps and log lines)"""
+        return datetime.fromtimestamp(self.time())
+
+
+class SystemClock(Clock):
+    """Real time - the default everywhere outside of simulation"""
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time that advances only when slept on.
+
+    sleep() moves the clock forward by the requested amount and yields to the
+    event loop once so other tasks (HTTP requests, the simulator) still run.
+    With `speedup` set, each sleep also waits seconds / speedup of real time,
+    which keeps interleaving with real I/O closer to production.
+    """
+
+    def __init__(self, start: Optional[float] = None, speedup: Optional[float] = None):
+        self._now = time.time() if start is None else float(start)
+        self.speedup = speedup
+        self.slept = 0.0  # total virtual seconds spent sleeping
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        """Move the clock forward without sleeping"""
+        if seconds > 0:
+            self._now += seconds
+
+    async def sleep(self, seconds: float):
+        seconds = max(0.0, float(seconds))
+        if self.speedup:
+            await asyncio.sleep(seconds / self.speedup)
+        else:
+            await asyncio.sleep(0)
+        self._now += seconds
+        self.slept += seconds
+
+
+# Shared real-time clock
+SYSTEM_CLOCK = SystemClock()
@@ -1,7 +1,7 @@
 """
 Configuration management and data models for Bitaxe Benchmark Pro
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json
@@ -15,6 +15,7 @@ class SearchStrategy(Enum):
     BINARY = "binary"
     ADAPTIVE_GRID = "adaptive_grid"
     ADAPTIVE_PROGRESSION = "adaptive_progression"
+    BAYESIAN = "bayesian"
     ML_PREDICTED = "ml_predicted"
 
 
@@ -79,6 +80,11 @@ class BenchmarkConfig:
     coarse_step_multiplier: int = 2  # First pass uses 2x step size
     refinement_range: int = 2  # Refine ±2 steps around best
     
+    # Bayesian search parameters
+    bayes_initial_points: int = 5  # Space-filling points before the surrogate model takes over
+    bayes_max_tests: int = 0  # Test budget (0 = a third of the grid)
+    bayes_min_improvement: float = 0.1  # Stop when expected improvement < this % of the best score
+    
     # Stability validation
     stability_test_duration: int = 1800  # 30 minutes for winner
     reject_rate_threshold: float = 2.0  # percent
@@ -89,18 +95,49 @@ class BenchmarkConfig:
     thermal_predict_window: int = 5  # samples to predict thermal trend
     thermal_throttle_buffer: float = 2.0  # degrees below limit
     adaptive_duration: bool = True  # Shorten tests if thermal stable
+    adaptive_settle: bool = True  # Shorten warmup/cooldown when the next point is close to the last
+    
+    # Settle detection - wait for equilibrium instead of a fixed warmup/cooldown
+    # (warmup_time is then the minimum wait before a point can count as settled)
+    settle_detection: bool = True
+    settle_poll_interval: int = 2  # seconds between readings while settling
+    settle_window: int = 60  # seconds of readings the equilibrium checks look back over
+    settle_max_time: int = 180  # stop waiting and measure anyway
+    settle_temp_slope: float = 0.5  # max chip temperature trend, °C per minute
+    settle_hashrate_drift: float = 3.0  # max hashrate drift across the window, percent
+    settle_power_drift: float = 2.0  # max power drift across the window, percent
+    
+    # Shared-PSU budget (see power_budget) - how long a point may wait for headroom
+    power_wait_timeout: int = 900  # seconds; a point still not admitted is skipped
+    
+    # Sequential sampling - end a point once the estimates are precise enough
+    adaptive_sampling: bool = False
+    min_dwell_time: int = 120  # seconds at a point before an early stop is allowed (thermal soak)
+    hashrate_ci_target: float = 0.5  # 95% CI half-width, percent of mean hashrate
+    power_ci_target: float = 1.0  # 95% CI half-width, percent of mean power
+    error_ci_target: float = 0.05  # 95% CI half-width, absolute ASIC error percentage points
+    
+    # Reuse of recent measurements from earlier sessions (see measurement_cache).
+    # Off by default - a benchmark measures every point itself; Auto Tune turns it
+    # on so its Nano phases don't re-test points the precision sweep just measured
+    reuse_measurements: bool = False
+    measurement_max_age: int = 3600  # seconds a measured V/F point stays reusable
+    ambient_temp: Optional[float] = None  # room temperature (°C), if known
+    ambient_tolerance: float = 3.0  # max ambient change (°C) for a measurement to stay reusable
     
     # Resume capability
     enable_checkpoints: bool = True
     checkpoint_interval: int = 1  # Save after each test
     
     # Multi-device
-    parallel_devices: bool = False
+    parallel_devices: bool = False  # benchmark several devices at once (see fleet_runner)
+    max_parallel_devices: int = 8  # cap on devices benchmarking at the same time
     
     # Data analysis
     enable_plotting: bool = True
     export_csv: bool = True
     calculate_confidence: bool = True
+    capture_raw_samples: bool = True  # Append every sample to samples_<session_id>.bin
     
     def to_dict(self) -> Dict[str, Any]:
         result = asdict(self)
@@ -114,7 +151,9 @@ class BenchmarkConfig:
             data['strategy'] = SearchStrategy(data['strategy'])
         if 'optimization_goal' in data and isinstance(data['optimization_goal'], str):
             data['optimization_goal'] = OptimizationGoal(data['optimization_goal'])
-        return cls(**data)
+        # Settings dropped since a session was saved (e.g. settle_min_time) are ignored
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
     
     def save(self, filepath: Path):
         """Save configuration to file"""
@@ -165,6 +204,7 @@ class TestResult:
     rejected_samples: int
     stability_score: float  # 0-100
     error_percentage: float = 0.0  # ASIC error rate
+    reused_from: Optional[str] = None  # session that measured this point, if it was reused
     
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -193,6 +233,7 @@ class BenchmarkSession:
     auto_mode: Optional[bool] = None  # true for auto_tune runs
     logs: List[Dict[str, Any]] = None  # Event logs from benchmark
     stop_reason: Optional[str] = None  # Why benchmark stopped
+    samples_file: Optional[str] = None  # Raw per-sample log (see sample_store)
     
     def __post_init__(self):
         if self.logs is None:
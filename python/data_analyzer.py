@@ -10,6 +10,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Temperature rise per sample above which a chip counts as still heating up
+HEATING_SLOPE = 0.1
+
 
 @dataclass
 class StatisticalSummary:
@@ -151,30 +154,33 @@ class DataAnalyzer:
         
         Higher score = more stable
         """
+        return DataAnalyzer.stability_score_from_stats(
+            DataAnalyzer.calculate_statistics(hashrate_data) if hashrate_data else None,
+            DataAnalyzer.calculate_statistics(temperature_data) if temperature_data else None,
+            DataAnalyzer.calculate_statistics(power_data) if power_data else None
+        )
+    
+    @staticmethod
+    def stability_score_from_stats(hashrate_stats, temperature_stats, power_stats) -> float:
+        """
+        Stability score (0-100) from precomputed summaries
+        
+        Accepts StatisticalSummary or streaming RunningStats (anything with
+        variance and coefficient_of_variation); None skips that component.
+        """
         scores = []
         
-        # Hashrate stability (CV)
-        if hashrate_data:
-            hr_stats = DataAnalyzer.calculate_statistics(hashrate_data)
-            if hr_stats:
-                # Lower CV = more stable, normalize to 0-100
-                hr_score = max(0, 100 - hr_stats.coefficient_of_variation * 10)
-                scores.append(hr_score)
-        
-        # Temperature stability
-        if temperature_data:
-            temp_stats = DataAnalyzer.calculate_statistics(temperature_data)
-            if temp_stats:
-                # Lower variance = more stable
-                temp_score = max(0, 100 - temp_stats.variance * 2)
-                scores.append(temp_score)
+        # Hashrate stability (CV) - lower CV = more stable, normalize to 0-100
+        if hashrate_stats:
+            scores.append(max(0, 100 - hashrate_stats.coefficient_of_variation * 10))
+        
+        # Temperature stability - lower variance = more stable
+        if temperature_stats:
+            scores.append(max(0, 100 - temperature_stats.variance * 2))
         
         # Power stability
-        if power_data:
-            power_stats = DataAnalyzer.calculate_statistics(power_data)
-            if power_stats:
-                power_score = max(0, 100 - power_stats.coefficient_of_variation * 10)
-                scores.append(power_score)
+        if power_stats:
+            scores.append(max(0, 100 - power_stats.coefficient_of_variation * 10))
         
         if not scores:
             return 0.0
@@ -201,7 +207,7 @@ class DataAnalyzer:
         # Linear regression
         slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
         
-        is_heating = slope > 0.1  # Increasing more than 0.1°C per sample
+        is_heating = slope > HEATING_SLOPE  # Increasing more than 0.1°C per sample
         
         return float(slope), is_heating
     
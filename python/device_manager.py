@@ -1,19 +1,41 @@
 """
 Device manager for Bitaxe miners with API communication
-Uses fresh HTTP sessions per request to avoid async lifecycle issues
+Devices share a keep-alive connection pool owned by the DeviceManager
 """
 import asyncio
 import aiohttp
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict
 import logging
+import threading
 import time
 
+from async_runner import get_runner
+from clock import SYSTEM_CLOCK, Clock
+
 logger = logging.getLogger(__name__)
 
 # Default timeout for all HTTP requests
 DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
+# Connection pool defaults - the ESP32 web server only handles a couple of
+# sockets at once, so keep per-host concurrency low and reuse connections
+POOL_LIMIT = 256
+POOL_LIMIT_PER_HOST = 2
+POOL_KEEPALIVE_TIMEOUT = 15  # seconds an idle connection stays open
+POOL_DNS_TTL = 300  # seconds to cache hostname lookups
+
+# Fleet-wide operations run devices concurrently, at most this many at once
+FLEET_CONCURRENCY = 32
+
+# Circuit breaker - after this many consecutive failed requests a device is
+# treated as offline: reads fail fast while a background probe retries with
+# exponential backoff, and the first successful probe closes the breaker again
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_INITIAL_BACKOFF = 5.0  # seconds before the first probe
+BREAKER_MAX_BACKOFF = 120.0
+
 
 @dataclass
 class SystemInfo:
@@ -33,6 +55,10 @@ class SystemInfo:
     fan_speed: float = 0.0
     error_percentage: float = 0.0  # ASIC error rate from API
     expected_hashrate: float = 0.0  # Expected hashrate based on frequency/cores
+    best_session_diff: str = '0'
+    stratum_diff: float = 0.0  # Current pool difficulty
+    auto_fan: Optional[bool] = None  # None if the firmware doesn't report its fan mode
+    temp_target: Optional[float] = None  # auto-fan target temperature, if reported
     
     def is_valid(self) -> bool:
         """Check if data is valid"""
@@ -43,6 +69,96 @@ class SystemInfo:
         )
 
 
+@dataclass
+class DeviceOpResult:
+    """Outcome of a fleet operation on one device"""
+    name: str
+    success: bool
+    elapsed: float
+    error: Optional[str] = None
+    timed_out: bool = False
+    
+    def __bool__(self) -> bool:
+        return self.success
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ConnectionPool:
+    """
+    Long-lived aiohttp sessions shared by every device.
+
+    aiohttp sessions are bound to the event loop they were created on, so one
+    session is kept per loop. Within a loop all requests reuse keep-alive
+    connections from a single connector. The runner loop, benchmark threads and
+    per-request loops all use the pool, so the session map is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        limit: int = POOL_LIMIT,
+        limit_per_host: int = POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = POOL_KEEPALIVE_TIMEOUT,
+        dns_ttl: int = POOL_DNS_TTL,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get (or create) the session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._prune()
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    use_dns_cache=True,
+                    ttl_dns_cache=self.dns_ttl,
+                )
+                session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+                self._sessions[loop] = session
+                logger.debug(f"Created pooled HTTP session (limit={self.limit}, per_host={self.limit_per_host})")
+        return session
+
+    def _prune(self):
+        """
+        Forget sessions whose event loop has already been closed. Their sockets
+        can't be closed without the loop, so threads running their own loop must
+        await close() before closing it; a session found here is a leak.
+        The caller holds self._lock.
+        """
+        for loop in [l for l in self._sessions if l.is_closed()]:
+            session = self._sessions.pop(loop, None)
+            if session is not None and not session.closed:
+                logger.warning("Pooled HTTP session left open by a closed event loop "
+                               "(await pool.close() before loop.close())")
+
+    async def close(self):
+        """Close the session belonging to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+            self._prune()
+        if session and not session.closed:
+            await session.close()
+
+    @property
+    def open_sessions(self) -> int:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return sum(1 for s in sessions if not s.closed)
+
+
 class BitaxeDevice:
     """Interface for a single Bitaxe device"""
     
@@ -54,21 +170,119 @@ class BitaxeDevice:
         "BM1397": "max",
     }
     
-    def __init__(self, name: str, ip_address: str, model: str = "Unknown"):
+    def __init__(self, name: str, ip_address: str, model: str = "Unknown", pool: Optional[ConnectionPool] = None):
         self.name = name
         self.ip_address = ip_address
         self.base_url = f"http://{ip_address}"
         self.model = model
+        self.pool = pool
         self._default_voltage: Optional[int] = None
         self._default_frequency: Optional[int] = None
         self._initial_shares_accepted = 0
         self._initial_shares_rejected = 0
+        # Circuit breaker state
+        self._breaker_lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._breaker_open = False
+        self._backoff = BREAKER_INITIAL_BACKOFF
+        self._next_probe_at: Optional[float] = None
+        self._probe_future = None
+        self._last_error: Optional[str] = None
+        self._last_success: Optional[float] = None
+        self._last_failure: Optional[float] = None
+    
+    @property
+    def available(self) -> bool:
+        """False while the circuit breaker is open (device considered offline)"""
+        return not self._breaker_open
+    
+    def record_success(self):
+        """Note a successful request; closes the breaker if it was open"""
+        with self._breaker_lock:
+            was_open = self._breaker_open
+            self._consecutive_failures = 0
+            self._breaker_open = False
+            self._backoff = BREAKER_INITIAL_BACKOFF
+            self._next_probe_at = None
+            self._last_success = time.time()
+        if was_open:
+            logger.info(f"{self.name}: Device reachable again, circuit breaker closed")
+    
+    def record_failure(self, error: str):
+        """Note a failed request; trips the breaker after repeated failures"""
+        with self._breaker_lock:
+            self._consecutive_failures += 1
+            self._last_error = error
+            self._last_failure = time.time()
+            trip = not self._breaker_open and self._consecutive_failures >= BREAKER_FAILURE_THRESHOLD
+            if trip:
+                self._breaker_open = True
+        if trip:
+            logger.warning(
+                f"{self.name}: {self._consecutive_failures} consecutive failures ({error}), "
+                f"circuit breaker open - probing in background"
+            )
+            self._start_probe()
+    
+    def _start_probe(self):
+        if self._probe_future is not None and not self._probe_future.done():
+            return
+        self._probe_future = get_runner().submit(self._probe_until_online())
+    
+    async def _probe_until_online(self):
+        """Background probe with exponential backoff while the breaker is open"""
+        while self._breaker_open:
+            delay = self._backoff
+            self._next_probe_at = time.time() + delay
+            await asyncio.sleep(delay)
+            if not self._breaker_open:
+                break
+            if await self.get_system_info(bypass_breaker=True) is not None:
+                break
+            with self._breaker_lock:
+                self._backoff = min(self._backoff * 2, BREAKER_MAX_BACKOFF)
+            logger.debug(f"{self.name}: Still offline, next probe in {self._backoff:.0f}s")
+    
+    def stop_probe(self):
+        """Cancel any background probe (e.g. when the device is removed)"""
+        if self._probe_future is not None:
+            self._probe_future.cancel()
+            self._probe_future = None
+    
+    def health(self) -> Dict[str, Any]:
+        """Circuit breaker state for the API"""
+        next_probe_in = None
+        if self._breaker_open and self._next_probe_at:
+            next_probe_in = round(max(0.0, self._next_probe_at - time.time()), 1)
+        return {
+            'state': 'open' if self._breaker_open else 'closed',
+            'available': not self._breaker_open,
+            'consecutive_failures': self._consecutive_failures,
+            'last_error': self._last_error,
+            'last_success': self._last_success,
+            'last_failure': self._last_failure,
+            'backoff': self._backoff if self._breaker_open else None,
+            'next_probe_in': next_probe_in,
+        }
+    
+    @staticmethod
+    @asynccontextmanager
+    async def _open_session(pool: Optional[ConnectionPool]):
+        """Yield the pooled session, or a throwaway one when no pool is attached"""
+        if pool is not None:
+            yield pool.get_session()
+        else:
+            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
+                yield session
+    
+    def _session(self):
+        return self._open_session(self.pool)
     
     @classmethod
-    async def detect_device_info(cls, ip_address: str) -> Optional[Dict[str, Any]]:
+    async def detect_device_info(cls, ip_address: str, pool: Optional[ConnectionPool] = None) -> Optional[Dict[str, Any]]:
         """Auto-detect device info from API"""
         try:
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
+            async with cls._open_session(pool) as session:
                 async with session.get(f"http://{ip_address}/api/system/info") as resp:
                     if resp.status != 200:
                         return None
@@ -120,6 +334,10 @@ class BitaxeDevice:
                         'fan_speed': int(data.get('fanspeed', data.get('fanSpeed', 0))),
                         'fan_rpm': int(data.get('fanrpm', data.get('fanRpm', 0))),
                     }
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            # Nothing (or nothing Bitaxe-like) at this address - routine during subnet scans
+            logger.debug(f"No device detected at {ip_address}: {e!r}")
+            return None
         except Exception as e:
             logger.error(f"Error detecting device at {ip_address}: {e}")
             return None
@@ -141,7 +359,7 @@ class BitaxeDevice:
             
             logger.info(f"{self.name}: Setting fan mode: auto={auto_fan}, target={target_temp}")
             
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
+            async with self._session() as session:
                 async with session.patch(
                     f"{self.base_url}/api/system",
                     json=payload
@@ -149,22 +367,33 @@ class BitaxeDevice:
                     if resp.status != 200:
                         logger.error(f"{self.name}: Failed to set fan mode: {resp.status}")
                         return False
+                    self.record_success()
                     return True
                     
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            self.record_failure(repr(e))
+            logger.error(f"{self.name}: Error setting fan mode: {e!r}")
+            return False
         except Exception as e:
             logger.error(f"{self.name}: Error setting fan mode: {e}")
             return False
     
-    async def get_system_info(self) -> Optional[SystemInfo]:
-        """Fetch current system information"""
+    async def get_system_info(self, bypass_breaker: bool = False) -> Optional[SystemInfo]:
+        """Fetch current system information (fails fast while the breaker is open, unless bypassed)"""
+        if self._breaker_open and not bypass_breaker:
+            return None
+        # Once the breaker is open, failures are expected - keep the log quiet
+        log_failure = logger.debug if self._breaker_open else logger.error
         try:
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
+            async with self._session() as session:
                 async with session.get(f"{self.base_url}/api/system/info") as resp:
                     if resp.status != 200:
-                        logger.error(f"{self.name}: Failed to get system info: {resp.status}")
+                        log_failure(f"{self.name}: Failed to get system info: {resp.status}")
+                        self.record_failure(f"HTTP {resp.status}")
                         return None
                     
                     data = await resp.json()
+                    self.record_success()
                     
                     return SystemInfo(
                         hashrate=float(data.get('hashRate', 0)),
@@ -181,13 +410,19 @@ class BitaxeDevice:
                         timestamp=time.time(),
                         fan_speed=float(data.get('fanspeed', 0)),
                         error_percentage=float(data.get('errorPercentage', 0)),
-                        expected_hashrate=float(data.get('expectedHashrate', 0))
+                        expected_hashrate=float(data.get('expectedHashrate', 0)),
+                        best_session_diff=str(data.get('bestSessionDiff', '0')),
+                        stratum_diff=float(data.get('poolDifficulty') or data.get('stratumDiff') or 0),
+                        auto_fan=bool(int(data['autofanspeed'])) if data.get('autofanspeed') is not None else None,
+                        temp_target=float(data['temptarget']) if data.get('temptarget') is not None else None,
                     )
         except asyncio.TimeoutError:
-            logger.error(f"{self.name}: Timeout getting system info")
+            log_failure(f"{self.name}: Timeout getting system info")
+            self.record_failure("timeout")
             return None
         except aiohttp.ClientError as e:
-            logger.error(f"{self.name}: Connection error getting system info: {e}")
+            log_failure(f"{self.name}: Connection error getting system info: {e}")
+            self.record_failure(f"connection error: {e}")
             return None
         except Exception as e:
             logger.error(f"{self.name}: Error getting system info: {e}")
@@ -203,7 +438,7 @@ class BitaxeDevice:
             
             logger.info(f"{self.name}: Setting voltage={voltage}mV, frequency={frequency}MHz")
             
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
+            async with self._session() as session:
                 async with session.patch(
                     f"{self.base_url}/api/system",
                     json=payload
@@ -213,22 +448,26 @@ class BitaxeDevice:
                         return False
                     
                     logger.info(f"{self.name}: Successfully set voltage={voltage}mV, frequency={frequency}MHz")
+                    self.record_success()
                     return True
                 
         except asyncio.TimeoutError:
             logger.error(f"{self.name}: Timeout setting voltage/frequency")
+            self.record_failure("timeout")
             return False
         except aiohttp.ClientError as e:
             logger.error(f"{self.name}: Connection error setting voltage/frequency: {e}")
+            self.record_failure(f"connection error: {e}")
             return False
         except Exception as e:
             logger.error(f"{self.name}: Error setting voltage/frequency: {e}")
             return False
     
-    async def restart(self) -> bool:
-        """Restart the device"""
+    async def restart(self, clock: Optional[Clock] = None) -> bool:
+        """Restart the device (`clock` times the wait for it to come back)"""
+        clock = clock or SYSTEM_CLOCK
         try:
-            async with aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT) as session:
+            async with self._session() as session:
                 async with session.post(f"{self.base_url}/api/system/restart") as resp:
                     if resp.status != 200:
                         logger.error(f"{self.name}: Failed to restart: {resp.status}")
@@ -237,8 +476,8 @@ class BitaxeDevice:
                     logger.info(f"{self.name}: Restart initiated")
             
             # Wait for device to come back online
-            await asyncio.sleep(30)
-            return await self.wait_for_online()
+            await clock.sleep(30)
+            return await self.wait_for_online(clock=clock)
                 
         except asyncio.TimeoutError:
             logger.error(f"{self.name}: Timeout restarting")
@@ -250,19 +489,36 @@ class BitaxeDevice:
             logger.error(f"{self.name}: Error restarting: {e}")
             return False
     
-    async def wait_for_online(self, timeout: int = 60) -> bool:
+    async def wait_for_online(self, timeout: int = 60, clock: Optional[Clock] = None) -> bool:
         """Wait for device to come online"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            info = await self.get_system_info()
+        clock = clock or SYSTEM_CLOCK
+        start_time = clock.time()
+        while clock.time() - start_time < timeout:
+            # Actively probe even if the breaker is open - this is the probe
+            info = await self.get_system_info(bypass_breaker=True)
             if info and info.is_valid():
                 logger.info(f"{self.name}: Device online")
                 return True
-            await asyncio.sleep(5)
+            await clock.sleep(5)
         
         logger.error(f"{self.name}: Timeout waiting for device to come online")
         return False
     
+    @property
+    def has_defaults(self) -> bool:
+        """True once default voltage/frequency have been captured"""
+        return bool(self._default_voltage and self._default_frequency)
+    
+    @property
+    def defaults(self) -> Optional[Tuple[int, int]]:
+        """Captured default (voltage, frequency), if any"""
+        return (self._default_voltage, self._default_frequency) if self.has_defaults else None
+    
+    def set_defaults(self, voltage: int, frequency: int):
+        """Use known settings as defaults (e.g. ones captured by an earlier run)"""
+        self._default_voltage = voltage
+        self._default_frequency = frequency
+    
     async def save_defaults(self) -> bool:
         """Save current settings as defaults"""
         try:
@@ -309,21 +565,48 @@ class BitaxeDevice:
 class DeviceManager:
     """Manage multiple Bitaxe devices"""
     
-    def __init__(self):
+    def __init__(self, pool: Optional[ConnectionPool] = None):
         self.devices: Dict[str, BitaxeDevice] = {}
+        self.device_configs: Dict[str, Dict[str, Any]] = {}  # Raw devices.json entries (PSU etc.)
+        self.shared_psus: Dict[str, Dict[str, Any]] = {}  # shared_psus.json entries by id
+        self.pool = pool or ConnectionPool()
         
     def add_device(self, name: str, ip_address: str, model: str = "Unknown"):
         """Add a device to the manager"""
-        device = BitaxeDevice(name, ip_address, model)
+        device = BitaxeDevice(name, ip_address, model, pool=self.pool)
+        previous = self.devices.get(name)
+        if previous is not None:
+            previous.stop_probe()
         self.devices[name] = device
         logger.info(f"Added device: {name} ({ip_address})")
     
     def remove_device(self, name: str):
         """Remove a device from the manager"""
         if name in self.devices:
-            del self.devices[name]
+            self.devices.pop(name).stop_probe()
             logger.info(f"Removed device: {name}")
     
+    def clear(self):
+        """Remove all devices"""
+        for device in self.devices.values():
+            device.stop_probe()
+        self.devices = {}
+        logger.info("Cleared all devices")
+    
+    def set_device_configs(self, configs: List[Dict[str, Any]]):
+        """Remember the full config (PSU settings etc.) for each device"""
+        self.device_configs = {
+            cfg['name']: cfg for cfg in configs or []
+            if isinstance(cfg, dict) and cfg.get('name')
+        }
+    
+    def set_shared_psus(self, psus: List[Dict[str, Any]]):
+        """Remember the shared PSUs devices can be assigned to (psu.shared_psu_id)"""
+        self.shared_psus = {
+            psu['id']: psu for psu in psus or []
+            if isinstance(psu, dict) and psu.get('id')
+        }
+    
     def get_device(self, name: str) -> Optional[BitaxeDevice]:
         """Get a device by name"""
         return self.devices.get(name)
@@ -332,29 +615,104 @@ class DeviceManager:
         """List all device names"""
         return list(self.devices.keys())
     
-    async def initialize_all(self) -> Dict[str, bool]:
-        """Initialize all devices - check online status and save defaults"""
-        results = {}
-        for name, device in self.devices.items():
-            online = await device.wait_for_online(timeout=30)
-            if online:
-                await device.save_defaults()
-            results[name] = online
+    def get_health(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state for every device"""
+        return {name: device.health() for name, device in list(self.devices.items())}
+    
+    def sync_devices(self, configs: List[Dict[str, Any]]):
+        """Make the registered devices match a devices.json style list"""
+        wanted = {}
+        for cfg in configs or []:
+            if isinstance(cfg, dict) and cfg.get('name') and cfg.get('ip_address'):
+                wanted[cfg['name']] = cfg
+        
+        for name in [n for n in self.devices if n not in wanted]:
+            self.remove_device(name)
+        
+        for name, cfg in wanted.items():
+            device = self.devices.get(name)
+            if device is None or device.ip_address != cfg['ip_address']:
+                self.add_device(name, cfg['ip_address'], cfg.get('model', 'Unknown'))
+    
+    async def _run_fleet_op(
+        self,
+        label: str,
+        operation,
+        names: Optional[List[str]],
+        concurrency: int,
+        deadline: float
+    ) -> Dict[str, DeviceOpResult]:
+        """Run `operation(device)` on many devices concurrently with a per-device deadline"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        selected = [
+            (name, self.devices[name])
+            for name in (self.list_devices() if names is None else names)
+            if name in self.devices
+        ]
+        
+        async def run_one(name: str, device: BitaxeDevice) -> DeviceOpResult:
+            async with semaphore:
+                start = time.time()
+                try:
+                    success = await asyncio.wait_for(operation(device), timeout=deadline)
+                    return DeviceOpResult(name, bool(success), time.time() - start)
+                except asyncio.TimeoutError:
+                    logger.error(f"{name}: {label} exceeded {deadline}s deadline")
+                    return DeviceOpResult(name, False, time.time() - start,
+                                          error=f"Deadline of {deadline}s exceeded", timed_out=True)
+                except Exception as e:
+                    logger.error(f"{name}: Error during {label}: {e}")
+                    return DeviceOpResult(name, False, time.time() - start, error=str(e))
+        
+        start = time.time()
+        outcomes = await asyncio.gather(*(run_one(name, device) for name, device in selected))
+        results = {result.name: result for result in outcomes}
+        ok = sum(1 for r in outcomes if r.success)
+        logger.info(f"{label}: {ok}/{len(outcomes)} devices succeeded in {time.time() - start:.1f}s")
         return results
     
+    async def initialize_all(
+        self,
+        names: Optional[List[str]] = None,
+        concurrency: int = FLEET_CONCURRENCY,
+        online_timeout: int = 30,
+        deadline: float = 45,
+        reuse_defaults: bool = False
+    ) -> Dict[str, DeviceOpResult]:
+        """
+        Initialize all devices (or just `names`) - check online status and save defaults.
+        With reuse_defaults, devices whose defaults were already captured keep them.
+        """
+        async def initialize(device: BitaxeDevice) -> bool:
+            online = await device.wait_for_online(timeout=online_timeout)
+            if online and not (reuse_defaults and device.has_defaults):
+                await device.save_defaults()
+            return online
+        
+        return await self._run_fleet_op("initialize", initialize, names, concurrency, deadline)
+    
+    async def detect_device(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Auto-detect device info using the shared connection pool"""
+        return await BitaxeDevice.detect_device_info(ip_address, pool=self.pool)
+    
     async def cleanup_all(self):
-        """Cleanup - nothing to do with fresh sessions per request"""
-        logger.info("Cleanup complete (no persistent sessions)")
+        """Close the pooled HTTP session for the running event loop"""
+        await self.pool.close()
+        logger.info("Cleanup complete (connection pool closed)")
     
-    async def get_all_system_info(self) -> Dict[str, Optional[SystemInfo]]:
-        """Get system info from all devices"""
+    async def get_all_system_info(self, names: Optional[List[str]] = None) -> Dict[str, Optional[SystemInfo]]:
+        """Get system info from all devices (or just `names`) concurrently"""
         results = {}
         tasks = []
-        names = []
+        selected = []
         
-        for name, device in self.devices.items():
+        for name in (self.list_devices() if names is None else names):
+            device = self.devices.get(name)
+            if device is None:
+                continue
             tasks.append(device.get_system_info())
-            names.append(name)
+            selected.append(name)
+        names = selected
         
         infos = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -370,15 +728,25 @@ class DeviceManager:
     async def set_all_voltage_frequency(
         self,
         voltage: int,
-        frequency: int
+        frequency: int,
+        power_budget=None
     ) -> Dict[str, bool]:
-        """Set voltage/frequency on all devices"""
+        """
+        Set voltage/frequency on all devices. With a PowerBudget, devices on a
+        shared PSU each wait for headroom before their change is applied.
+        """
         results = {}
         tasks = []
         names = []
         
         for name, device in self.devices.items():
-            tasks.append(device.set_voltage_frequency(voltage, frequency))
+            if power_budget is not None:
+                tasks.append(power_budget.run_when_admitted(
+                    name, voltage, frequency,
+                    lambda device=device: device.set_voltage_frequency(voltage, frequency)
+                ))
+            else:
+                tasks.append(device.set_voltage_frequency(voltage, frequency))
             names.append(name)
         
         success_list = await asyncio.gather(*tasks, return_exceptions=True)
@@ -392,16 +760,42 @@ class DeviceManager:
         
         return results
     
-    async def restart_all(self) -> Dict[str, bool]:
-        """Restart all devices"""
-        results = {}
-        for name, device in self.devices.items():
-            results[name] = await device.restart()
-        return results
+    async def restart_all(
+        self,
+        names: Optional[List[str]] = None,
+        concurrency: int = FLEET_CONCURRENCY,
+        deadline: float = 120
+    ) -> Dict[str, DeviceOpResult]:
+        """Restart all devices (or just `names`) and wait for them to come back"""
+        return await self._run_fleet_op(
+            "restart", lambda device: device.restart(), names, concurrency, deadline
+        )
     
-    async def restore_all_defaults(self) -> Dict[str, bool]:
-        """Restore defaults on all devices"""
-        results = {}
-        for name, device in self.devices.items():
-            results[name] = await device.restore_defaults()
-        return results
+    async def restore_all_defaults(
+        self,
+        names: Optional[List[str]] = None,
+        concurrency: int = FLEET_CONCURRENCY,
+        deadline: float = 30
+    ) -> Dict[str, DeviceOpResult]:
+        """Restore defaults on all devices (or just `names`)"""
+        return await self._run_fleet_op(
+            "restore defaults", lambda device: device.restore_defaults(), names, concurrency, deadline
+        )
+
+# Process-wide registry shared by every app mounted in this process
+_device_manager: Optional[DeviceManager] = None
+_device_manager_lock = threading.Lock()
+
+
+def get_device_manager() -> DeviceManager:
+    """
+    Get the process-wide DeviceManager. AxeBench, AxeShed and AxePool all use
+    it, so each device has one connection pool, circuit breaker and background
+    probe however many apps the process serves.
+    """
+    global _device_manager
+    if _device_manager is None:
+        with _device_manager_lock:
+            if _device_manager is None:
+                _device_manager = DeviceManager()
+    return _device_manager
@@ -0,0 +1,233 @@
+"""
+Subnet discovery for Bitaxe miners
+
+Sweeps one or more CIDR ranges with bounded concurrency, probing each address
+through BitaxeDevice.detect_device_info with short timeouts. Scans run as jobs
+on the shared async loop; their progress can be polled or streamed.
+"""
+import asyncio
+import ipaddress
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+from async_runner import AsyncRunner, get_runner
+from device_manager import BitaxeDevice, ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 64
+MAX_CONCURRENCY = 256
+DEFAULT_PROBE_TIMEOUT = 2.0  # seconds per address (connect is capped lower)
+MAX_HOSTS = 4096  # refuse sweeps larger than a /20
+MAX_FINISHED_JOBS = 20  # finished jobs kept for status queries
+
+
+def expand_targets(cidrs: List[str], max_hosts: int = MAX_HOSTS) -> List[str]:
+    """Turn CIDR ranges (or single addresses) into a de-duplicated list of host IPs"""
+    hosts: Dict[str, None] = {}
+    for cidr in cidrs:
+        try:
+            network = ipaddress.ip_network(str(cidr).strip(), strict=False)
+        except ValueError as e:
+            raise ValueError(f"Invalid network '{cidr}': {e}")
+        if network.version != 4:
+            raise ValueError(f"Only IPv4 ranges are supported: {cidr}")
+        if network.num_addresses > max_hosts + 2:
+            raise ValueError(f"Range {cidr} is too large (max {max_hosts} hosts)")
+        for host in network.hosts():
+            hosts[str(host)] = None
+        if len(hosts) > max_hosts:
+            raise ValueError(f"Too many addresses to scan (max {max_hosts})")
+    return list(hosts)
+
+
+class DiscoveryJob:
+    """State and progress events for one subnet sweep"""
+
+    def __init__(self, cidrs: List[str], targets: List[str], concurrency: int, timeout: float):
+        self.id = uuid.uuid4().hex[:12]
+        self.cidrs = cidrs
+        self.targets = targets
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.status = 'pending'  # pending, running, complete, cancelled, error
+        self.scanned = 0
+        self.found: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.registration: Optional[Dict[str, Any]] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._future = None
+
+    @property
+    def total(self) -> int:
+        return len(self.targets)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('complete', 'cancelled', 'error')
+
+    def emit(self, event_type: str, **data):
+        """Record a progress event and wake any stream readers"""
+        with self._cond:
+            event = {'id': len(self.events), 'type': event_type, 'scanned': self.scanned,
+                     'total': self.total, 'found': len(self.found), **data}
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, status: str, **data):
+        """Set the final status and emit its event atomically, so readers never see
+        the job finished without the final event"""
+        with self._cond:
+            self.status = status
+            self.emit(status, **data)
+
+    def wait_for_events(self, after: int, timeout: float = 15.0) -> List[Dict[str, Any]]:
+        """Block until there are events with id >= after (or the timeout expires)"""
+        with self._cond:
+            if len(self.events) <= after and not self.finished:
+                self._cond.wait(timeout)
+            return self.events[after:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            'job_id': self.id,
+            'cidrs': self.cidrs,
+            'status': self.status,
+            'total': self.total,
+            'scanned': self.scanned,
+            'progress': round(100.0 * self.scanned / self.total, 1) if self.total else 100.0,
+            'found': list(self.found),
+            'error': self.error,
+            'registration': self.registration,
+            'elapsed': elapsed,
+        }
+
+
+class DiscoveryManager:
+    """Starts subnet sweeps on the shared async loop and tracks their jobs"""
+
+    def __init__(self, runner: Optional[AsyncRunner] = None):
+        self.runner = runner or get_runner()
+        self.jobs: Dict[str, DiscoveryJob] = {}
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        cidrs: List[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_PROBE_TIMEOUT,
+        on_complete: Optional[Callable[[DiscoveryJob], Any]] = None,
+    ) -> DiscoveryJob:
+        """
+        Start a sweep of the given ranges. Raises ValueError for bad input.
+
+        `on_complete` is called from a worker thread with the finished job
+        (e.g. to bulk-register what was found); its return value is stored
+        as job.registration.
+        """
+        if not cidrs:
+            raise ValueError("At least one CIDR range is required")
+        targets = expand_targets(cidrs)
+        concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY))
+        timeout = max(0.2, float(timeout))
+
+        job = DiscoveryJob(list(cidrs), targets, concurrency, timeout)
+        with self._lock:
+            self._prune()
+            self.jobs[job.id] = job
+        job._future = self.runner.submit(self._run(job, on_complete))
+        logger.info(f"Discovery {job.id}: scanning {job.total} addresses in {', '.join(job.cidrs)}")
+        return job
+
+    def get(self, job_id: str) -> Optional[DiscoveryJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if not job or job.finished or job._future is None:
+            return False
+        job._future.cancel()
+        return True
+
+    def _prune(self):
+        finished = [j for j in self.jobs.values() if j.finished]
+        finished.sort(key=lambda j: j.finished_at or 0)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self.jobs.pop(job.id, None)
+
+    async def _run(self, job: DiscoveryJob, on_complete):
+        job.status = 'running'
+        job.started_at = time.time()
+        job.emit('started')
+
+        # Dedicated short-timeout pool so a sweep never waits 10s on a dead address
+        pool = ConnectionPool(
+            limit=job.concurrency,
+            limit_per_host=1,
+            keepalive_timeout=1,
+            timeout=aiohttp.ClientTimeout(total=job.timeout, connect=min(job.timeout, 1.0)),
+        )
+        semaphore = asyncio.Semaphore(job.concurrency)
+
+        async def probe(ip: str):
+            async with semaphore:
+                info = await BitaxeDevice.detect_device_info(ip, pool=pool)
+            job.scanned += 1
+            # Anything answering /api/system/info without an ASIC isn't a miner
+            if info and info.get('asic_model'):
+                job.found.append(info)
+                job.emit('found', device=info)
+            elif job.scanned % 16 == 0 or job.scanned == job.total:
+                job.emit('progress')
+
+        # The outcome stays local until everything is done; job.status flips to a
+        # finished state only together with the final event
+        try:
+            await asyncio.gather(*(probe(ip) for ip in job.targets))
+            outcome = 'complete'
+        except asyncio.CancelledError:
+            outcome = 'cancelled'
+        except Exception as e:
+            logger.error(f"Discovery {job.id} failed: {e}")
+            outcome = 'error'
+            job.error = str(e)
+        finally:
+            await pool.close()
+
+        job.found.sort(key=lambda d: ipaddress.ip_address(d['ip']))
+        if outcome == 'complete' and on_complete and job.found:
+            try:
+                job.registration = await asyncio.get_running_loop().run_in_executor(None, on_complete, job)
+            except asyncio.CancelledError:
+                outcome = 'cancelled'
+            except Exception as e:
+                logger.error(f"Discovery {job.id}: registration failed: {e}")
+                job.registration = {'error': str(e)}
+
+        job.finished_at = time.time()
+        logger.info(f"Discovery {job.id} {outcome}: {len(job.found)} device(s) in "
+                    f"{job.finished_at - job.started_at:.1f}s")
+        job.finish(outcome, devices=job.found, registration=job.registration)
+
+
+# Global discovery manager instance
+_discovery: Optional[DiscoveryManager] = None
+
+
+def get_discovery() -> DiscoveryManager:
+    """Get the process-wide discovery manager"""
+    global _discovery
+    if _discovery is None:
+        _discovery = DiscoveryManager()
+    return _discovery
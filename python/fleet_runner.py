@@ -0,0 +1,208 @@
+"""
+Benchmark many devices at once
+
+BenchmarkEngine tunes one device per run. FleetRunner runs one engine per
+device on a single event loop, so a farm is tuned in about the time of its
+slowest device instead of the sum of all of them. Each device is isolated:
+
+- its own copy of the config and its own engine, hence its own session,
+  search strategy, journal and resume checkpoint (an interrupted device is
+  resumed like any single-device session)
+- its own status channel, a BenchmarkStatusStore holding that device's
+  latest status and log
+
+With config.parallel_devices off devices run one after another; with it on at
+most config.max_parallel_devices run at once. Every device waiting for a
+slot shows as 'queued'. A device that fails doesn't stop the others. Given a
+PowerBudget, devices sharing a PSU also wait for its headroom before each
+step up (see power_budget).
+"""
+import asyncio
+import copy
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmark_engine import BenchmarkEngine
+from clock import SYSTEM_CLOCK, Clock
+from config import BenchmarkConfig, BenchmarkSession, SafetyLimits
+from device_manager import DeviceManager
+from power_budget import PowerBudget
+from status_store import BenchmarkStatusStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FleetDeviceResult:
+    """Outcome of one device's benchmark in a fleet run"""
+    name: str
+    session: Optional[BenchmarkSession]
+    elapsed: float
+    error: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return self.session is not None and self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        session = self.session
+        return {
+            'name': self.name,
+            'session_id': session.session_id if session else None,
+            'status': session.status if session else 'error',
+            'tests': len(session.results) if session else 0,
+            'best_hashrate': session.best_hashrate if session else None,
+            'best_efficiency': session.best_efficiency if session else None,
+            'stop_reason': session.stop_reason if session else None,
+            'elapsed': self.elapsed,
+            'error': self.error,
+        }
+
+
+class FleetRunner:
+    """Run BenchmarkEngine on many devices concurrently"""
+
+    def __init__(
+        self,
+        config: BenchmarkConfig,
+        safety: SafetyLimits,
+        device_manager: DeviceManager,
+        session_dir: Path,
+        status_callback: Optional[Callable[[str, dict], None]] = None,
+        clock: Optional[Clock] = None,
+        power_budget: Optional[PowerBudget] = None
+    ):
+        self.config = config
+        self.safety = safety
+        self.device_manager = device_manager
+        self.session_dir = session_dir
+        # Called as status_callback(device_name, status) for every engine update
+        self.status_callback = status_callback
+        self.clock = clock or SYSTEM_CLOCK
+        # Devices on a shared PSU wait here before raising their draw
+        self.power_budget = power_budget
+
+        self.channels: Dict[str, BenchmarkStatusStore] = {}
+        self.engines: Dict[str, BenchmarkEngine] = {}
+        self.results: Dict[str, FleetDeviceResult] = {}
+        self.running = False
+        self._stopped = set()
+
+    @property
+    def concurrency(self) -> int:
+        """How many devices benchmark at once"""
+        if not self.config.parallel_devices:
+            return 1
+        return max(1, self.config.max_parallel_devices)
+
+    def _update(self, name: str, status: dict):
+        channel = self.channels[name]
+        channel.update(status)
+        if status.get('message'):
+            channel.append_log({
+                'time': datetime.now().isoformat(),
+                'message': status['message'],
+                'type': status.get('phase', 'info'),
+            })
+        if self.status_callback:
+            try:
+                self.status_callback(name, status)
+            except Exception as e:
+                logger.warning(f"{name}: fleet status callback failed: {e}")
+
+    async def run(self, device_names: List[str]) -> Dict[str, FleetDeviceResult]:
+        """Benchmark every device in `device_names`; returns each device's outcome"""
+        names = list(dict.fromkeys(device_names))
+        self.running = True
+        self._stopped.clear()
+        self.results = {}
+        self.engines = {}
+        self.channels = {
+            name: BenchmarkStatusStore({
+                'device': name,
+                'running': False,
+                'phase': 'queued',
+                'message': 'Waiting for a free slot',
+                'session_id': None,
+                'progress': 0,
+                'error': None,
+            })
+            for name in names
+        }
+
+        try:
+            init = await self.device_manager.initialize_all(names=names, reuse_defaults=True)
+            semaphore = asyncio.Semaphore(self.concurrency)
+            logger.info(f"Fleet benchmark of {len(names)} devices, {self.concurrency} at a time")
+
+            async def run_one(name: str) -> FleetDeviceResult:
+                async with semaphore:
+                    return await self._run_device(name, init.get(name))
+
+            start = self.clock.time()
+            outcomes = await asyncio.gather(*(run_one(name) for name in names))
+            self.results = {result.name: result for result in outcomes}
+            ok = sum(1 for r in outcomes if r)
+            logger.info(f"Fleet benchmark: {ok}/{len(outcomes)} devices completed in "
+                        f"{(self.clock.time() - start) / 60:.1f} min")
+            return self.results
+        finally:
+            self.running = False
+
+    async def _run_device(self, name: str, init_result) -> FleetDeviceResult:
+        start = self.clock.time()
+
+        def finish(session: Optional[BenchmarkSession], error: Optional[str] = None) -> FleetDeviceResult:
+            result = FleetDeviceResult(name, session, self.clock.time() - start, error)
+            phase = 'error' if error else 'complete'
+            message = error or f"Finished: {session.stop_reason or session.status}"
+            self._update(name, {'running': False, 'phase': phase, 'message': message, 'error': error})
+            self.results[name] = result
+            return result
+
+        if name in self._stopped:
+            return finish(None, "Stopped before it started")
+        if self.device_manager.get_device(name) is None:
+            return finish(None, f"Device {name} not found")
+        if init_result is not None and not init_result:
+            return finish(None, f"Device offline: {init_result.error or 'not responding'}")
+
+        engine = BenchmarkEngine(
+            copy.deepcopy(self.config),
+            copy.deepcopy(self.safety),
+            self.device_manager,
+            self.session_dir,
+            status_callback=lambda status: self._update(name, status),
+            clock=self.clock,
+            power_budget=self.power_budget
+        )
+        self.engines[name] = engine
+        self._update(name, {
+            'running': True,
+            'phase': 'initializing',
+            'message': 'Starting benchmark',
+            'session_id': engine.session_id,
+        })
+        try:
+            session = await engine.run_benchmark(name)
+        except Exception as e:
+            logger.error(f"{name}: fleet benchmark failed: {e}", exc_info=True)
+            return finish(engine.session, str(e))
+        if session.status == 'error':
+            return finish(session, session.stop_reason or 'Benchmark error')
+        return finish(session)
+
+    def stop(self, name: Optional[str] = None):
+        """Stop one device's benchmark, or every device's when `name` is None"""
+        names = [name] if name is not None else list(self.channels)
+        for device_name in names:
+            self._stopped.add(device_name)
+            engine = self.engines.get(device_name)
+            if engine:
+                engine.interrupted = True
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Current status of every device in the run (without the logs)"""
+        return {name: channel.fields() for name, channel in self.channels.items()}
@@ -0,0 +1,198 @@
+"""
+Per-device cache of recent V/F measurements
+
+Each benchmark phase builds a fresh engine and strategy, so without this a
+point measured by the precision sweep would be sampled again, for a full test
+duration, by every Nano tune that happens to include it. The engine records
+the result of every point it measured successfully here, together with the
+fan setting the device ran at and the measurement settings of the run, and
+before running a point the strategy asks for it checks the cache first; a
+fresh entry from another session is replayed instead of re-tested. Failed
+points aren't cached - they are tested again.
+
+An entry is only reused while it is valid:
+
+- it was measured at the same voltage, frequency and fan setting
+- it was measured at least as thoroughly as the current run would measure
+  the point (test duration, sample interval, cycles per test)
+- it is younger than the configured maximum age
+- if both it and the current run know the ambient temperature, they differ by
+  no more than the configured tolerance
+
+Entries live in <session_dir>/measurements/<device>.json and expired ones are
+dropped whenever the file is written.
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from session_journal import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "measurements"
+CACHE_VERSION = 2
+
+# Measurement settings recorded with each entry; an entry is reusable by a run
+# whose settings it meets (see _at_least_as_strict)
+MEASUREMENT_SETTINGS = ('benchmark_duration', 'sample_interval', 'cycles_per_test')
+
+
+def fan_setting(auto_fan: Optional[bool], fan_speed: float, temp_target: Optional[float]) -> Optional[str]:
+    """
+    Cache label for a device's fan configuration, e.g. 'auto:60' or 'manual:80'.
+
+    None if the device doesn't report its fan mode - measurements can't be
+    matched to a fan setting then, so they aren't cached.
+    """
+    if auto_fan is None:
+        return None
+    if auto_fan:
+        return 'auto' if temp_target is None else f"auto:{int(temp_target)}"
+    return f"manual:{int(round(fan_speed))}"
+
+
+def measurement_settings(config) -> Dict[str, int]:
+    """The settings of a BenchmarkConfig that decide how thoroughly a point is measured"""
+    return {name: int(getattr(config, name)) for name in MEASUREMENT_SETTINGS}
+
+
+def _at_least_as_strict(cached: Dict[str, Any], wanted: Dict[str, int]) -> bool:
+    """True if a point measured with `cached` settings is good enough for `wanted`"""
+    try:
+        return (cached['benchmark_duration'] >= wanted['benchmark_duration']
+                and cached['sample_interval'] <= wanted['sample_interval']
+                and cached['cycles_per_test'] >= wanted['cycles_per_test'])
+    except (KeyError, TypeError):
+        return False
+
+
+def _key(voltage: int, frequency: int, fan: str, settings: Dict[str, int]) -> str:
+    measured = ':'.join(str(settings[name]) for name in MEASUREMENT_SETTINGS)
+    return f"{int(voltage)}:{int(frequency)}:{fan}:{measured}"
+
+
+class MeasurementCache:
+    """Recent measurements of one device"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._entries = data.get('entries') or {}
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Ignoring unreadable measurement cache {self.path}: {e}")
+        return self._entries
+
+    def get(
+        self,
+        voltage: int,
+        frequency: int,
+        fan: str,
+        settings: Dict[str, int],
+        now: float,
+        max_age: float,
+        ambient: Optional[float] = None,
+        ambient_tolerance: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The most recent valid entry for a point, else None.
+
+        An entry is {'voltage', 'frequency', 'fan', 'settings', 'result':
+        TestResult dict, 'measured_at', 'session_id', 'ambient'}.
+        """
+        with self._lock:
+            candidates = [
+                e for e in self._load().values()
+                if e.get('voltage') == int(voltage) and e.get('frequency') == int(frequency)
+                and e.get('fan') == fan
+            ]
+        best = None
+        for entry in candidates:
+            if now - entry.get('measured_at', 0) > max_age:
+                continue
+            if not _at_least_as_strict(entry.get('settings') or {}, settings):
+                continue
+            cached_ambient = entry.get('ambient')
+            if (ambient is not None and cached_ambient is not None and ambient_tolerance is not None
+                    and abs(ambient - cached_ambient) > ambient_tolerance):
+                continue
+            if best is None or entry['measured_at'] > best['measured_at']:
+                best = entry
+        return best
+
+    def put(
+        self,
+        voltage: int,
+        frequency: int,
+        fan: str,
+        settings: Dict[str, int],
+        result: Dict[str, Any],
+        measured_at: float,
+        session_id: str,
+        ambient: Optional[float] = None,
+    ):
+        """Record a point's measurement (`result` is its TestResult dict)"""
+        with self._lock:
+            self._load()[_key(voltage, frequency, fan, settings)] = {
+                'voltage': int(voltage),
+                'frequency': int(frequency),
+                'fan': fan,
+                'settings': dict(settings),
+                'result': result,
+                'measured_at': measured_at,
+                'session_id': session_id,
+                'ambient': ambient,
+            }
+
+    def save(self, now: float, max_age: float):
+        """Write the cache, dropping entries older than `max_age`"""
+        with self._lock:
+            entries = self._load()
+            for key in [k for k, e in entries.items() if now - e.get('measured_at', 0) > max_age]:
+                del entries[key]
+            data = {'version': CACHE_VERSION, 'entries': dict(entries)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, data, indent=None)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Could not save measurement cache {self.path}: {e}")
+
+    def clear(self):
+        """Forget every measurement of this device"""
+        with self._lock:
+            self._entries = {}
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+_caches: Dict[Path, MeasurementCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_measurement_cache(session_dir: Path, device_name: str) -> MeasurementCache:
+    """Get the shared measurement cache for a device"""
+    path = (Path(session_dir) / CACHE_DIR / f"{device_name}.json").resolve()
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = MeasurementCache(path)
+    return cache
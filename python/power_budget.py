@@ -0,0 +1,404 @@
+"""
+Power budget for devices sharing a PSU
+
+Devices assigned to a shared PSU (shared_psus.json, referenced from each
+device's psu.shared_psu_id) all draw from one supply, and its safe_watts is
+only safe for their sum. PowerBudget keeps that sum under safe_watts when
+several of them ramp up at once - concurrent benchmarks, AxeShed profile
+switches, bulk applies:
+
+- the live draw of each device comes from the freshest reading available:
+  ones the benchmark engine reports while it samples, or the telemetry cache
+- before a V/F change its draw at the new point is predicted by scaling the
+  current reading by V²·f (the same dynamic power model the engine uses to
+  size settle times); a device with no reading counts at its model's
+  max_power
+- a change that lowers the draw, or that keeps the PSU's total under
+  safe_watts, is admitted at once and its predicted draw is reserved until
+  readings at the new point have had time to settle and arrive
+- anything else is deferred: acquire() waits for it, run_when_admitted()
+  applies it in the background, and either goes ahead as soon as new readings
+  or expired reservations leave enough headroom. Deferred changes on a PSU
+  are admitted oldest first
+- a device has at most one change pending in the background: a newer one
+  (deferred or applied at once) supersedes it via supersede(), so a stale
+  profile can't land on top of a later one
+
+Standalone devices aren't tracked here; their own limit is SafetyLimits.max_power.
+
+The budget only sees changes made through it, so every app in a process uses
+the one from get_power_budget() - in the unified app AxeBench and AxeShed
+share it. Another process (the standalone AxeBench next to a separately run
+AxeShed, or a CLI benchmark) has a budget of its own and can't see this one's
+reservations or deferred changes; with devices on a shared PSU, run only one
+of them at a time or keep safe_watts low enough to cover both.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from clock import SYSTEM_CLOCK, Clock
+from config import get_device_profile
+from device_manager import DeviceManager, SystemInfo, get_device_manager
+from telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_TTL = 60.0  # seconds an admitted change counts at least at its predicted draw
+READING_MAX_AGE = 300.0  # seconds a power reading is trusted (longer than any warmup or cooldown gap)
+POLL_INTERVAL = 2.0  # seconds between admission checks of a deferred change
+UNKNOWN_DEVICE_WATTS = 25.0  # assumed draw of a device of unknown model with no reading
+PREDICTION_MARGIN = 1.05  # on predicted increases - leakage keeps rising as the chip heats
+
+
+@dataclass
+class _Reading:
+    watts: float
+    voltage: int
+    frequency: int
+    at: float
+
+
+@dataclass
+class _Reservation:
+    watts: float
+    voltage: int
+    frequency: int
+    expires: float
+
+
+@dataclass
+class _Waiter:
+    ticket: int
+    name: str
+    psu_id: str
+    voltage: int
+    frequency: int
+
+
+@dataclass
+class _Pending:
+    voltage: int
+    frequency: int
+    superseded: bool = False
+
+
+class PowerBudgetTimeout(Exception):
+    """A change waited longer than allowed for headroom on its shared PSU"""
+
+
+class PowerBudget:
+    """Admits or defers V/F changes so each shared PSU stays under safe_watts"""
+
+    def __init__(
+        self,
+        device_manager: DeviceManager,
+        telemetry=None,
+        clock: Optional[Clock] = None,
+        reservation_ttl: float = RESERVATION_TTL,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.device_manager = device_manager
+        self.telemetry = telemetry  # optional TelemetryCollector for cached readings
+        self.clock = clock or SYSTEM_CLOCK
+        self.reservation_ttl = reservation_ttl
+        self.poll_interval = poll_interval
+        self._lock = threading.RLock()
+        self._readings: Dict[str, _Reading] = {}
+        self._reservations: Dict[str, _Reservation] = {}
+        self._waiters: List[_Waiter] = []
+        self._pending: Dict[str, _Pending] = {}
+        self._tickets = itertools.count(1)
+
+    # -- topology ----------------------------------------------------------
+
+    def psu_for(self, name: str) -> Optional[Dict[str, Any]]:
+        """The shared PSU a device draws from, or None if it has its own supply"""
+        psu = (self.device_manager.device_configs.get(name) or {}).get('psu') or {}
+        psu_id = psu.get('shared_psu_id')
+        if not psu_id:
+            return None
+        return self.device_manager.shared_psus.get(psu_id)
+
+    def _members(self, psu_id: str) -> List[str]:
+        return [
+            name for name, cfg in self.device_manager.device_configs.items()
+            if ((cfg.get('psu') or {}).get('shared_psu_id')) == psu_id
+        ]
+
+    @staticmethod
+    def _limit(psu: Dict[str, Any]) -> float:
+        safe = psu.get('safe_watts')
+        if safe is None:
+            safe = float(psu.get('capacity_watts') or 0) * 0.8
+        return float(safe)
+
+    # -- draw --------------------------------------------------------------
+
+    def observe(self, name: str, info: SystemInfo):
+        """Record a live reading of a device (called by whoever just polled it)"""
+        if not info or info.power <= 0:
+            return
+        with self._lock:
+            self._readings[name] = _Reading(info.power, info.voltage, info.frequency, self.clock.time())
+
+    def _reading(self, name: str) -> Optional[_Reading]:
+        now = self.clock.time()
+        own = self._readings.get(name)
+        if own is not None and now - own.at > READING_MAX_AGE:
+            own = None
+        if self.telemetry is not None:
+            cached = self.telemetry.get_reading(name)
+            if (cached is not None and cached.info is not None and cached.info.power > 0
+                    and cached.age <= READING_MAX_AGE):
+                # Age-compare on the telemetry's own (wall clock) terms
+                if own is None or cached.age < now - own.at:
+                    info = cached.info
+                    return _Reading(info.power, info.voltage, info.frequency, now - cached.age)
+        return own
+
+    def _reservation(self, name: str) -> Optional[_Reservation]:
+        reservation = self._reservations.get(name)
+        if reservation is None:
+            return None
+        now = self.clock.time()
+        if now > reservation.expires:
+            # Only a reading at the reserved point can stand in for it
+            reading = self._reading(name)
+            at_point = (reading is not None and reading.voltage == reservation.voltage
+                        and reading.frequency == reservation.frequency)
+            if at_point or now > reservation.expires + READING_MAX_AGE:
+                del self._reservations[name]
+                return None
+        return reservation
+
+    def draw(self, name: str) -> float:
+        """Watts a device counts for: its reading, or its reservation if higher"""
+        reading = self._reading(name)
+        reservation = self._reservation(name)
+        watts = reading.watts if reading else None
+        if reservation is not None:
+            watts = max(watts or 0.0, reservation.watts)
+        if watts is None:
+            watts = self._unknown_draw(name)
+        return watts
+
+    def _unknown_draw(self, name: str) -> float:
+        device = self.device_manager.get_device(name)
+        profile = get_device_profile(device.model if device else None)
+        return float(profile.get('max_power', UNKNOWN_DEVICE_WATTS))
+
+    def predict(self, name: str, voltage: int, frequency: int) -> float:
+        """Expected draw of a device at voltage/frequency"""
+        reading = self._reading(name)
+        if reading is None or reading.voltage <= 0 or reading.frequency <= 0:
+            return self._unknown_draw(name)
+        scale = (voltage / reading.voltage) ** 2 * (frequency / reading.frequency)
+        if scale > 1:
+            scale *= PREDICTION_MARGIN
+        return reading.watts * scale
+
+    async def refresh(self, psu_id: str):
+        """Poll the members of a PSU that have no recent reading"""
+        with self._lock:
+            stale = [name for name in self._members(psu_id) if self._reading(name) is None]
+        devices = [(name, self.device_manager.get_device(name)) for name in stale]
+        devices = [(name, device) for name, device in devices if device is not None]
+        if not devices:
+            return
+        infos = await asyncio.gather(*(device.get_system_info() for _, device in devices), return_exceptions=True)
+        for (name, _), info in zip(devices, infos):
+            if isinstance(info, SystemInfo):
+                self.observe(name, info)
+
+    def load(self, psu_id: str) -> float:
+        """Current total draw counted against a shared PSU"""
+        with self._lock:
+            return sum(self.draw(name) for name in self._members(psu_id))
+
+    # -- admission ---------------------------------------------------------
+
+    def _fits(self, name: str, psu: Dict[str, Any], voltage: int, frequency: int) -> bool:
+        predicted = self.predict(name, voltage, frequency)
+        current = self.draw(name)
+        if predicted <= current and self._reading(name) is not None:
+            return True  # lowers a known draw
+        return self.load(psu['id']) - current + predicted <= self._limit(psu)
+
+    def try_admit(self, name: str, voltage: int, frequency: int, ticket: Optional[int] = None) -> bool:
+        """
+        Admit a change now if the PSU has room for it (always, for standalone
+        devices). Deferred changes that are older and would also fit go first.
+        """
+        psu = self.psu_for(name)
+        if psu is None:
+            return True
+        with self._lock:
+            if not self._fits(name, psu, voltage, frequency):
+                return False
+            for waiter in self._waiters:
+                if waiter.ticket == ticket:
+                    break
+                if (waiter.psu_id == psu['id'] and waiter.name != name
+                        and self._fits(waiter.name, psu, waiter.voltage, waiter.frequency)):
+                    return False
+            predicted = self.predict(name, voltage, frequency)
+            self._reservations[name] = _Reservation(
+                predicted, voltage, frequency, self.clock.time() + self.reservation_ttl
+            )
+            return True
+
+    async def acquire(
+        self,
+        name: str,
+        voltage: int,
+        frequency: int,
+        timeout: Optional[float] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_wait: Optional[Callable[[float, float, float], None]] = None,
+        clock: Optional[Clock] = None,
+    ) -> bool:
+        """
+        Wait until a change is admitted; False on timeout or should_stop().
+        on_wait(waited_seconds, load, safe_watts) is called while deferred.
+        """
+        psu = self.psu_for(name)
+        if psu is None:
+            return True
+        await self.refresh(psu['id'])
+        if self.try_admit(name, voltage, frequency):
+            return True
+        clock = clock or self.clock
+        with self._lock:
+            waiter = _Waiter(next(self._tickets), name, psu['id'], voltage, frequency)
+            self._waiters.append(waiter)
+        logger.info(f"{name}: {voltage}mV @ {frequency}MHz deferred - {psu.get('name', psu['id'])} "
+                    f"at {self.load(psu['id']):.1f}W of {self._limit(psu):.1f}W")
+        start = clock.time()
+        try:
+            while True:
+                waited = clock.time() - start
+                if should_stop and should_stop():
+                    return False
+                if timeout is not None and waited >= timeout:
+                    logger.warning(f"{name}: no PSU headroom for {voltage}mV @ {frequency}MHz after {waited:.0f}s")
+                    return False
+                if on_wait:
+                    on_wait(waited, self.load(psu['id']), self._limit(psu))
+                await clock.sleep(self.poll_interval)
+                await self.refresh(psu['id'])
+                if self.try_admit(name, voltage, frequency, ticket=waiter.ticket):
+                    logger.info(f"{name}: {voltage}mV @ {frequency}MHz admitted after {clock.time() - start:.0f}s")
+                    return True
+        finally:
+            with self._lock:
+                self._waiters.remove(waiter)
+
+    def release(self, name: str):
+        """Drop a device's reservation (its change failed, or it went back to defaults)"""
+        with self._lock:
+            self._reservations.pop(name, None)
+
+    def supersede(self, name: str) -> Optional[Dict[str, int]]:
+        """
+        Drop a device's pending background change because a newer one replaces
+        it; returns the dropped change's voltage/frequency, if there was one.
+        """
+        with self._lock:
+            pending = self._pending.pop(name, None)
+            if pending is None:
+                return None
+            pending.superseded = True
+        logger.info(f"{name}: deferred {pending.voltage}mV @ {pending.frequency}MHz superseded")
+        return {'voltage': pending.voltage, 'frequency': pending.frequency}
+
+    def run_when_admitted(
+        self,
+        name: str,
+        voltage: int,
+        frequency: int,
+        apply: Callable[[], Awaitable[bool]],
+        timeout: Optional[float] = None,
+    ) -> Awaitable[Optional[bool]]:
+        """
+        Make this the device's pending change (superseding any earlier one) and
+        return a coroutine that waits for admission, then runs `apply()`. It
+        gives apply()'s result, False if never admitted, or None if superseded.
+        """
+        pending = _Pending(voltage, frequency)
+        self.supersede(name)
+        with self._lock:
+            self._pending[name] = pending
+        return self._run_pending(name, pending, apply, timeout)
+
+    async def _run_pending(
+        self,
+        name: str,
+        pending: _Pending,
+        apply: Callable[[], Awaitable[bool]],
+        timeout: Optional[float],
+    ) -> Optional[bool]:
+        voltage, frequency = pending.voltage, pending.frequency
+        try:
+            admitted = await self.acquire(
+                name, voltage, frequency, timeout=timeout, should_stop=lambda: pending.superseded
+            )
+            if pending.superseded:
+                return None
+            if not admitted:
+                return False
+            try:
+                success = await apply()
+            except Exception as e:
+                logger.error(f"{name}: deferred apply of {voltage}mV @ {frequency}MHz failed: {e}")
+                success = False
+            if not success:
+                self.release(name)
+            return bool(success)
+        finally:
+            with self._lock:
+                if self._pending.get(name) is pending:
+                    del self._pending[name]
+
+    # -- reporting ---------------------------------------------------------
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per shared PSU: limit, counted load, per-device draw and deferred changes"""
+        with self._lock:
+            result = {}
+            for psu_id, psu in self.device_manager.shared_psus.items():
+                members = self._members(psu_id)
+                devices = {name: round(self.draw(name), 1) for name in members}
+                reservations = {name: self._reservation(name) for name in members}
+                result[psu_id] = {
+                    'name': psu.get('name'),
+                    'safe_watts': self._limit(psu),
+                    'warning_watts': psu.get('warning_watts'),
+                    'load': round(sum(devices.values()), 1),
+                    'devices': devices,
+                    'reserved': {
+                        name: round(r.watts, 1) for name, r in reservations.items() if r is not None
+                    },
+                    'deferred': [
+                        {'device': w.name, 'voltage': w.voltage, 'frequency': w.frequency}
+                        for w in self._waiters if w.psu_id == psu_id
+                    ],
+                }
+            return result
+
+
+_power_budget: Optional[PowerBudget] = None
+_power_budget_lock = threading.Lock()
+
+
+def get_power_budget() -> PowerBudget:
+    """Get the process-wide budget, shared by every app mounted in this process"""
+    global _power_budget
+    if _power_budget is None:
+        with _power_budget_lock:
+            if _power_budget is None:
+                _power_budget = PowerBudget(get_device_manager(), get_telemetry())
+    return _power_budget
@@ -0,0 +1,188 @@
+"""
+Raw per-sample telemetry store for benchmark sessions
+
+Every sample _run_single_test takes is appended to samples_<session_id>.bin as
+a fixed-width little-endian record (SAMPLE_DTYPE). Records are buffered and
+written once, in order, so capture costs one small append per flush - nothing
+is ever rewritten. SampleReader memory-maps the file for analysis without
+loading it.
+
+File layout: 32-byte header (magic, format version, record size), then
+records back to back. A trailing partial record (e.g. after a crash) is
+ignored by the reader and trimmed when the writer reopens the file.
+"""
+import logging
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"AXESMP01"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHH20x")  # magic, version, record size
+HEADER_SIZE = HEADER.size
+
+SAMPLE_DTYPE = np.dtype([
+    ('test_index', '<u4'),  # n-th test point attempted in the session
+    ('timestamp', '<f8'),  # clock time of the sample
+    ('elapsed', '<f4'),  # seconds since sampling for this point began
+    ('voltage', '<u2'),  # requested core voltage (mV)
+    ('frequency', '<u2'),  # requested frequency (MHz)
+    ('hashrate', '<f4'),
+    ('temperature', '<f4'),
+    ('vr_temp', '<f4'),  # 0 if the device doesn't report it
+    ('power', '<f4'),
+    ('input_voltage', '<f4'),
+    ('error_percentage', '<f4'),
+    ('fan_speed', '<f4'),
+])
+
+DEFAULT_BUFFER_SIZE = 256  # records held in memory between writes
+
+
+def samples_path(session_dir: Path, session_id: str) -> Path:
+    """Where a session's raw samples live"""
+    return Path(session_dir) / f"samples_{session_id}.bin"
+
+
+def _read_header(f, path: Path):
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated sample file header")
+    magic, version, record_size = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a sample file")
+    if version != FORMAT_VERSION or record_size != SAMPLE_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported sample format v{version} ({record_size}-byte records)")
+
+
+class SampleWriter:
+    """Buffered append-only writer for one session's samples"""
+
+    def __init__(self, path: Path, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = Path(path)
+        self._buffer = np.zeros(max(1, buffer_size), dtype=SAMPLE_DTYPE)
+        self._pending = 0
+        self._file = None
+        self.count = 0  # records written or buffered by this writer
+
+    def open(self):
+        """Open for appending, creating the file (or trimming a torn tail) as needed"""
+        if self._file is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with open(self.path, 'r+b') as f:
+                _read_header(f, self.path)
+                size = self.path.stat().st_size
+                whole = HEADER_SIZE + (size - HEADER_SIZE) // SAMPLE_DTYPE.itemsize * SAMPLE_DTYPE.itemsize
+                if whole != size:
+                    logger.warning(f"{self.path}: dropping {size - whole} bytes of a partial record")
+                    f.truncate(whole)
+            self._file = open(self.path, 'ab')
+        else:
+            self._file = open(self.path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, SAMPLE_DTYPE.itemsize))
+            self._file.flush()
+
+    def append(
+        self,
+        test_index: int,
+        timestamp: float,
+        elapsed: float,
+        voltage: int,
+        frequency: int,
+        hashrate: float,
+        temperature: float,
+        power: float,
+        vr_temp: Optional[float] = None,
+        input_voltage: float = 0.0,
+        error_percentage: float = 0.0,
+        fan_speed: float = 0.0,
+    ):
+        """Buffer one sample; written out when the buffer fills or on flush()"""
+        self._buffer[self._pending] = (
+            test_index, timestamp, elapsed, voltage, frequency, hashrate, temperature,
+            vr_temp or 0.0, power, input_voltage or 0.0, error_percentage or 0.0, fan_speed or 0.0,
+        )
+        self._pending += 1
+        self.count += 1
+        if self._pending >= len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Write buffered samples to disk"""
+        if not self._pending:
+            return
+        try:
+            self.open()
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self._file.flush()
+        except OSError as e:
+            logger.error(f"Failed to write samples to {self.path}: {e}")
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SampleReader:
+    """Memory-mapped, read-only view of a session's samples"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            _read_header(f, self.path)
+        count = (self.path.stat().st_size - HEADER_SIZE) // SAMPLE_DTYPE.itemsize
+        if count > 0:
+            self.samples = np.memmap(self.path, dtype=SAMPLE_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.samples = np.zeros(0, dtype=SAMPLE_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(SAMPLE_DTYPE.names)
+
+    def test_indices(self) -> List[int]:
+        """Test indexes that have samples, in order"""
+        return [int(i) for i in np.unique(self.samples['test_index'])]
+
+    def for_test(self, test_index: int) -> np.ndarray:
+        """Samples of one test point (a copy, independent of the map)"""
+        return np.array(self.samples[self.samples['test_index'] == test_index])
+
+    def column(self, name: str, test_index: Optional[int] = None) -> np.ndarray:
+        """One field, optionally limited to a single test point"""
+        if test_index is None:
+            return self.samples[name]
+        return self.samples[name][self.samples['test_index'] == test_index]
+
+    def to_dict(self, test_index: Optional[int] = None) -> Dict[str, list]:
+        """Column lists (JSON-friendly)"""
+        data = self.samples if test_index is None else self.for_test(test_index)
+        return {name: data[name].tolist() for name in SAMPLE_DTYPE.names}
+
+    def to_dataframe(self, test_index: Optional[int] = None):
+        """pandas DataFrame of all samples or one test point"""
+        import pandas as pd
+        data = self.samples if test_index is None else self.for_test(test_index)
+        return pd.DataFrame(np.array(data))
+
+    def close(self):
+        """Drop the map (it is unmapped once no views of it remain)"""
+        self.samples = np.zeros(0, dtype=SAMPLE_DTYPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,6 +5,10 @@ Includes integration with AdaptiveProgression for smart tuning.
 from typing import List, Tuple, Set, Optional, Dict, Any
 from abc import ABC, abstractmethod
 import logging
+
+import numpy as np
+from scipy import stats
+
 from config import SearchStrategy, BenchmarkConfig, SafetyLimits
 
 # Import the AdaptiveProgression strategy
@@ -19,9 +23,23 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def serpentine_index(row: int, idx: int, count: int) -> int:
+    """
+    Frequency index for step `idx` of grid row `row` in serpentine order.
+    
+    Even rows run up the frequency list and odd rows run back down, so each
+    voltage bump starts next to the point just tested instead of swinging
+    the chip from its hottest setting back to its coolest.
+    """
+    return idx if row % 2 == 0 else count - 1 - idx
+
+
 class SearchStrategyBase(ABC):
     """Base class for search strategies"""
     
+    # Subclass attributes (JSON-serializable as-is) saved by get_state()
+    STATE_ATTRS: Tuple[str, ...] = ()
+    
     def __init__(self, config: BenchmarkConfig, safety: SafetyLimits):
         self.config = config
         self.safety = safety
@@ -68,8 +86,10 @@ class SearchStrategyBase(ABC):
         if (voltage, frequency) in self.tested_combinations:
             return True
         
-        if voltage in self.max_stable_freq:
-            if frequency > self.max_stable_freq[voltage]:
+        # At or above a frequency that already failed at this voltage (either
+        # scan direction - a stable result never rules out higher points)
+        for unstable_v, unstable_f in self.unstable_points:
+            if unstable_v == voltage and frequency >= unstable_f:
                 return True
         
         return False
@@ -91,6 +111,32 @@ class SearchStrategyBase(ABC):
     def estimate_total_tests(self) -> int:
         """Estimate total number of tests - override in subclass"""
         return 0
+    
+    def get_state(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot of the search progress (for resume)"""
+        state = {
+            'strategy': type(self).__name__,
+            'tested_combinations': sorted([v, f] for v, f in self.tested_combinations),
+            'unstable_points': sorted([v, f] for v, f in self.unstable_points),
+            'results': [list(r) for r in self.results],
+            'max_stable_freq': [[v, f] for v, f in self.max_stable_freq.items()],
+        }
+        for attr in self.STATE_ATTRS:
+            state[attr] = getattr(self, attr)
+        return state
+    
+    def restore_state(self, state: Dict[str, Any]):
+        """Restore progress saved by get_state() on a strategy built from the same config"""
+        if state.get('strategy') != type(self).__name__:
+            raise ValueError(f"Saved state is for {state.get('strategy')}, not {type(self).__name__}")
+        self.tested_combinations = {tuple(c) for c in state.get('tested_combinations', [])}
+        self.unstable_points = {tuple(c) for c in state.get('unstable_points', [])}
+        self.results = [tuple(r) for r in state.get('results', [])]
+        self.max_stable_freq = {v: f for v, f in state.get('max_stable_freq', [])}
+        for attr in self.STATE_ATTRS:
+            if attr in state:
+                setattr(self, attr, state[attr])
+        logger.info(f"Restored {type(self).__name__} state: {len(self.tested_combinations)} combinations tested")
 
 
 class AdaptiveProgressionWrapper(SearchStrategyBase):
@@ -213,11 +259,23 @@ class AdaptiveProgressionWrapper(SearchStrategyBase):
     def get_status(self) -> dict:
         """Get current tuning status"""
         return self.adaptive.get_status()
+    
+    def get_state(self) -> Dict[str, Any]:
+        state = super().get_state()
+        state['adaptive'] = self.adaptive.get_state()
+        return state
+    
+    def restore_state(self, state: Dict[str, Any]):
+        super().restore_state(state)
+        if 'adaptive' in state:
+            self.adaptive.restore_state(state['adaptive'])
 
 
 class LinearSearch(SearchStrategyBase):
     """Linear grid search - tests all combinations"""
     
+    STATE_ATTRS = ('current_v_idx', 'current_f_idx')
+    
     def __init__(self, config: BenchmarkConfig, safety: SafetyLimits):
         super().__init__(config, safety)
         self.voltages = list(range(
@@ -243,7 +301,7 @@ class LinearSearch(SearchStrategyBase):
         while self.current_v_idx < len(self.voltages):
             while self.current_f_idx < len(self.frequencies):
                 voltage = self.voltages[self.current_v_idx]
-                frequency = self.frequencies[self.current_f_idx]
+                frequency = self.frequencies[serpentine_index(self.current_v_idx, self.current_f_idx, len(self.frequencies))]
                 self.current_f_idx += 1
                 
                 if not self.should_skip(voltage, frequency):
@@ -261,6 +319,8 @@ class LinearSearch(SearchStrategyBase):
 class BinarySearch(SearchStrategyBase):
     """Binary search for optimal voltage at each frequency"""
     
+    STATE_ATTRS = ('current_freq_idx',)
+    
     def __init__(self, config: BenchmarkConfig, safety: SafetyLimits):
         super().__init__(config, safety)
         self.frequencies = list(range(
@@ -315,11 +375,22 @@ class BinarySearch(SearchStrategyBase):
     
     def is_complete(self) -> bool:
         return self.current_freq_idx >= len(self.frequencies)
+    
+    def get_state(self) -> Dict[str, Any]:
+        state = super().get_state()
+        state['binary_state'] = [[freq, low, high] for freq, (low, high) in self.binary_state.items()]
+        return state
+    
+    def restore_state(self, state: Dict[str, Any]):
+        super().restore_state(state)
+        self.binary_state = {freq: (low, high) for freq, low, high in state.get('binary_state', [])}
 
 
 class AdaptiveGridSearch(SearchStrategyBase):
     """Adaptive grid search - coarse first, then refine around best"""
     
+    STATE_ATTRS = ('phase', 'refined_voltages', 'refined_frequencies', 'current_v_idx', 'current_f_idx')
+    
     def __init__(self, config: BenchmarkConfig, safety: SafetyLimits):
         super().__init__(config, safety)
         self.phase = "coarse"
@@ -362,7 +433,9 @@ class AdaptiveGridSearch(SearchStrategyBase):
         while self.current_v_idx < len(self.coarse_voltages):
             while self.current_f_idx < len(self.coarse_frequencies):
                 voltage = self.coarse_voltages[self.current_v_idx]
-                frequency = self.coarse_frequencies[self.current_f_idx]
+                frequency = self.coarse_frequencies[
+                    serpentine_index(self.current_v_idx, self.current_f_idx, len(self.coarse_frequencies))
+                ]
                 self.current_f_idx += 1
                 
                 if not self.should_skip(voltage, frequency):
@@ -396,6 +469,13 @@ class AdaptiveGridSearch(SearchStrategyBase):
         self.refined_voltages = list(range(v_start, v_stop + 1, self.config.voltage_step))
         self.refined_frequencies = list(range(f_start, f_stop + 1, self.config.frequency_step))
         
+        # Start from the corner nearest the last coarse point rather than jumping across the range
+        last_v, last_f = self.results[-1][0], self.results[-1][1]
+        if abs(last_v - v_stop) < abs(last_v - v_start):
+            self.refined_voltages.reverse()
+        if abs(last_f - f_stop) < abs(last_f - f_start):
+            self.refined_frequencies.reverse()
+        
         self.current_v_idx = 0
         self.current_f_idx = 0
     
@@ -403,7 +483,9 @@ class AdaptiveGridSearch(SearchStrategyBase):
         while self.current_v_idx < len(self.refined_voltages):
             while self.current_f_idx < len(self.refined_frequencies):
                 voltage = self.refined_voltages[self.current_v_idx]
-                frequency = self.refined_frequencies[self.current_f_idx]
+                frequency = self.refined_frequencies[
+                    serpentine_index(self.current_v_idx, self.current_f_idx, len(self.refined_frequencies))
+                ]
                 self.current_f_idx += 1
                 
                 if not self.should_skip(voltage, frequency):
@@ -420,6 +502,278 @@ class AdaptiveGridSearch(SearchStrategyBase):
         return self.current_v_idx >= len(self.refined_voltages)
 
 
+class _GaussianProcess:
+    """
+    Minimal GP regression (RBF kernel) over inputs scaled to [0, 1].
+    
+    Targets are standardized; the length scale is picked from a short list
+    by log marginal likelihood, which is plenty for the few dozen points a
+    benchmark produces.
+    """
+    
+    LENGTH_SCALES = (0.15, 0.25, 0.4, 0.7)
+    
+    def __init__(self, noise: float = 0.05):
+        self.noise = noise
+        self.length_scale = self.LENGTH_SCALES[0]
+        self._x = None
+        
+    @staticmethod
+    def _kernel(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+        d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(-1)
+        return np.exp(-0.5 * d2 / length_scale ** 2)
+    
+    def fit(self, x: np.ndarray, y: np.ndarray) -> '_GaussianProcess':
+        self._mean = float(y.mean())
+        self._scale = float(y.std()) or 1.0
+        z = (y - self._mean) / self._scale
+        best = None
+        for length_scale in self.LENGTH_SCALES:
+            k = self._kernel(x, x, length_scale) + (self.noise + 1e-8) * np.eye(len(x))
+            try:
+                chol = np.linalg.cholesky(k)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, z))
+            log_likelihood = -0.5 * z @ alpha - np.log(np.diag(chol)).sum()
+            if best is None or log_likelihood > best[0]:
+                best = (log_likelihood, length_scale, chol, alpha)
+        _, self.length_scale, self._chol, self._alpha = best
+        self._x = x
+        return self
+    
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Posterior mean and standard deviation (in target units)"""
+        k = self._kernel(x, self._x, self.length_scale)
+        mu = k @ self._alpha
+        v = np.linalg.solve(self._chol, k.T)
+        var = np.clip(1.0 - (v ** 2).sum(0), 1e-12, None)
+        return self._mean + mu * self._scale, np.sqrt(var) * self._scale
+
+
+class BayesianSearch(SearchStrategyBase):
+    """
+    Bayesian optimization over the voltage/frequency grid.
+    
+    Gaussian-process surrogates are fitted to hashrate, efficiency and
+    (log) error rate of the points tested so far. The next point is the
+    untested one with the highest expected improvement of the goal's
+    objective, weighted by the modelled probability that its error rate is
+    under target. Known-bad regions are never proposed: above the frequency
+    of a point that failed outright (no hashrate) at or below its voltage,
+    and at or above a point that hit a temperature/power/fan limit. The search stops once no candidate is
+    expected to improve meaningfully, or after bayes_max_tests points.
+    """
+    
+    STATE_ATTRS = ('observations', 'limit_points', 'stop_message', 'done')
+    
+    # Objective weights (hashrate, efficiency) per optimization goal
+    GOAL_WEIGHTS = {
+        'max_hashrate': (1.0, 0.0),
+        'efficient': (0.0, 1.0),
+        'max_efficiency': (0.0, 1.0),
+    }
+    DEFAULT_WEIGHTS = (0.5, 0.5)
+    
+    # Error rate (%) beyond which a measurement says nothing about the objective
+    USABLE_ERROR = 50.0
+    # Error rates are capped at this multiple of the target before modelling,
+    # so a few dead points don't swamp the surface near the target
+    ERROR_CAP = 4.0
+    
+    def __init__(self, config: BenchmarkConfig, safety: SafetyLimits):
+        super().__init__(config, safety)
+        self.voltages = list(range(
+            config.voltage_start,
+            min(config.voltage_stop + 1, safety.max_voltage),
+            config.voltage_step
+        ))
+        self.frequencies = list(range(
+            config.frequency_start,
+            min(config.frequency_stop + 1, safety.max_frequency),
+            config.frequency_step
+        ))
+        self.candidates = [(v, f) for v in self.voltages for f in self.frequencies]
+        self._scaled = self._scale(np.array(self.candidates, dtype=float).reshape(-1, 2))
+        
+        goal = getattr(config.optimization_goal, 'value', config.optimization_goal)
+        self.weights = self.GOAL_WEIGHTS.get(goal, self.DEFAULT_WEIGHTS)
+        self.initial_points = max(2, config.bayes_initial_points)
+        self.max_tests = config.bayes_max_tests or max(self.initial_points + 4, len(self.candidates) // 3)
+        
+        # [voltage, frequency, hashrate, efficiency, error_pct, stable]
+        self.observations: List[List[float]] = []
+        self.limit_points: List[List[int]] = []
+        self.stop_message: Optional[str] = None
+        self.done = not self.candidates
+        
+        logger.info(f"Bayesian search: {len(self.voltages)} voltages x {len(self.frequencies)} frequencies, "
+                    f"budget {self.max_tests} tests, goal {goal}")
+    
+    def _scale(self, points: np.ndarray) -> np.ndarray:
+        lo = np.array([self.config.voltage_start, self.config.frequency_start], dtype=float)
+        span = np.array([
+            max(1, self.config.voltage_stop - self.config.voltage_start),
+            max(1, self.config.frequency_stop - self.config.frequency_start),
+        ], dtype=float)
+        return (points - lo) / span
+    
+    def estimate_total_tests(self) -> int:
+        return min(self.max_tests, len(self.candidates))
+    
+    # -- observations ------------------------------------------------------
+    
+    def _observe(self, voltage: int, frequency: int, hashrate: float, efficiency: float,
+                 error_pct: float, stable: bool):
+        self.observations = [o for o in self.observations if (o[0], o[1]) != (voltage, frequency)]
+        self.observations.append([voltage, frequency, hashrate, efficiency, error_pct, bool(stable)])
+        self.tested_combinations.add((voltage, frequency))
+    
+    def record_result(self, voltage: int, frequency: int, hashrate: float,
+                      error_pct: float, stable: bool,
+                      efficiency: float = None, fan_speed: int = None,
+                      chip_temp: float = None, vr_temp: float = None,
+                      power: float = None):
+        """Record a tested point (limit breaches count as constraint violations)"""
+        if not efficiency and hashrate > 0 and power:
+            efficiency = power / (hashrate / 1000)
+        
+        if chip_temp is not None and chip_temp >= self.safety.max_chip_temp:
+            self.record_limit_hit("temp", f"Chip temp {chip_temp:.1f}°C >= limit {self.safety.max_chip_temp}°C", voltage, frequency)
+        elif vr_temp is not None and vr_temp >= self.safety.max_vr_temp:
+            self.record_limit_hit("temp", f"VR temp {vr_temp:.1f}°C >= limit {self.safety.max_vr_temp}°C", voltage, frequency)
+        elif power is not None and power >= self.safety.max_power:
+            self.record_limit_hit("power", f"Power {power:.1f}W >= limit {self.safety.max_power}W", voltage, frequency)
+        
+        fan_target = getattr(self.config, 'fan_target', None)
+        if fan_target and fan_speed is not None and fan_speed > fan_target:
+            self.record_limit_hit("fan", f"Fan {fan_speed}% > target {fan_target}%", voltage, frequency)
+        
+        if hashrate <= 0:
+            # Failed outright - rule out the region; a high error rate alone only feeds the model
+            self.unstable_points.add((voltage, frequency))
+        elif stable:
+            self.results.append((voltage, frequency, hashrate, efficiency or 0.0))
+        self._observe(voltage, frequency, hashrate, efficiency or 0.0, error_pct, stable and hashrate > 0)
+    
+    def add_result(self, voltage: int, frequency: int, hashrate: float, efficiency: float):
+        """Legacy add_result - a stable point with unknown error rate"""
+        self.record_result(voltage, frequency, hashrate, 0.0, True, efficiency=efficiency)
+    
+    def mark_unstable(self, voltage: int, frequency: int):
+        super().mark_unstable(voltage, frequency)
+        self._observe(voltage, frequency, 0.0, 0.0, 100.0, False)
+    
+    def record_limit_hit(self, limit_type: str, message: str, voltage: int, frequency: int):
+        """Rule out this point and everything hotter (same or higher V and F)"""
+        if voltage is None or frequency is None:
+            return
+        if [voltage, frequency] not in self.limit_points:
+            self.limit_points.append([voltage, frequency])
+            logger.info(f"Bayesian search: {limit_type} limit at {voltage}mV @ {frequency}MHz - {message}")
+        self.tested_combinations.add((voltage, frequency))
+    
+    # -- selection ---------------------------------------------------------
+    
+    def _allowed(self, voltage: int, frequency: int) -> bool:
+        if (voltage, frequency) in self.tested_combinations:
+            return False
+        for v, f in self.unstable_points:
+            if voltage <= v and frequency >= f:
+                return False
+        for v, f in self.limit_points:
+            if voltage >= v and frequency >= f:
+                return False
+        return True
+    
+    def _references(self) -> Tuple[float, float]:
+        """Best hashrate and best (lowest) efficiency measured so far"""
+        measured = [o for o in self.observations if o[2] > 0 and o[4] < self.USABLE_ERROR]
+        hr_ref = max((o[2] for o in measured), default=0.0) or 1.0
+        eff_ref = min((o[3] for o in measured if o[3] > 0), default=1.0)
+        return hr_ref, eff_ref
+    
+    def _objective(self, hashrate: np.ndarray, efficiency: np.ndarray) -> np.ndarray:
+        """Goal score: weighted hashrate and inverse efficiency, each relative to the best seen"""
+        hr_ref, eff_ref = self._references()
+        w_hr, w_eff = self.weights
+        return w_hr * hashrate / hr_ref + w_eff * eff_ref / np.maximum(efficiency, 1e-6)
+    
+    def _initial_point(self, allowed: List[int]) -> int:
+        """Space-filling start: the first allowed grid corner, then the point farthest from all tested"""
+        if not self.observations:
+            return allowed[0]
+        tested = self._scale(np.array([o[:2] for o in self.observations], dtype=float))
+        pts = self._scaled[allowed]
+        distance = np.sqrt(((pts[:, None, :] - tested[None, :, :]) ** 2).sum(-1)).min(1)
+        return allowed[int(np.argmax(distance))]
+    
+    def _acquisition(self, allowed: List[int]) -> Tuple[np.ndarray, float]:
+        """Constrained expected improvement for each allowed candidate, and the best objective"""
+        obs = np.array([o[:5] for o in self.observations], dtype=float)
+        x = self._scale(obs[:, :2])
+        pts = self._scaled[allowed]
+        measured = (obs[:, 2] > 0) & (obs[:, 4] < self.USABLE_ERROR)
+        stable = np.array([o[5] for o in self.observations], dtype=bool)
+        
+        # Probability of meeting the error target
+        log_error = np.log1p(np.clip(obs[:, 4], 0, self.ERROR_CAP * self.config.target_error))
+        err_mu, err_sd = _GaussianProcess().fit(x, log_error).predict(pts)
+        p_stable = stats.norm.cdf((np.log1p(self.config.target_error) - err_mu) / err_sd)
+        
+        if measured.sum() < 2:
+            # Nothing to model the objective on yet - explore where stability is likely
+            return p_stable, 0.0
+        
+        hr_mu, hr_sd = _GaussianProcess().fit(x[measured], obs[measured, 2]).predict(pts)
+        eff_mu, eff_sd = _GaussianProcess().fit(x[measured], obs[measured, 3]).predict(pts)
+        mu = self._objective(hr_mu, eff_mu)
+        # First-order propagation of the two surrogates' uncertainty
+        hr_ref, eff_ref = self._references()
+        w_hr, w_eff = self.weights
+        sd = np.sqrt((w_hr * hr_sd / hr_ref) ** 2 + (w_eff * eff_ref * eff_sd / np.maximum(eff_mu, 1e-6) ** 2) ** 2)
+        sd = np.maximum(sd, 1e-9)
+        
+        # Improve on the best point that met the error target (or the worst measured, if none has)
+        scores = self._objective(obs[measured, 2], obs[measured, 3])
+        best = float(scores[stable[measured]].max()) if stable.any() else float(scores.min())
+        improvement = mu - best
+        z = improvement / sd
+        ei = improvement * stats.norm.cdf(z) + sd * stats.norm.pdf(z)
+        return np.clip(ei, 0, None) * p_stable, best
+    
+    def get_next_combination(self) -> Optional[Tuple[int, int]]:
+        if self.done:
+            return None
+        allowed = [i for i, (v, f) in enumerate(self.candidates) if self._allowed(v, f)]
+        if not allowed:
+            return self._finish("Every remaining point is tested or ruled out")
+        if len(self.observations) >= self.max_tests:
+            return self._finish(f"Test budget reached ({self.max_tests} points)")
+        
+        if len(self.observations) < self.initial_points:
+            choice = self._initial_point(allowed)
+        else:
+            score, best = self._acquisition(allowed)
+            choice_pos = int(np.argmax(score))
+            threshold = self.config.bayes_min_improvement / 100.0 * abs(best)
+            if best and score[choice_pos] < threshold:
+                return self._finish(f"Converged: expected improvement below {self.config.bayes_min_improvement}% "
+                                    f"after {len(self.observations)} tests")
+            choice = allowed[choice_pos]
+        
+        return self.candidates[choice]
+    
+    def _finish(self, message: str) -> None:
+        self.done = True
+        self.stop_message = message
+        logger.info(f"Bayesian search complete: {message}")
+        return None
+    
+    def is_complete(self) -> bool:
+        return self.done
+
+
 def create_search_strategy(
     strategy_type: SearchStrategy,
     config: BenchmarkConfig,
@@ -445,6 +799,9 @@ def create_search_strategy(
     elif strategy_name in ('adaptive_grid', 'adaptive-grid', 'coarse_fine'):
         return AdaptiveGridSearch(config, safety)
     
+    elif strategy_name in ('bayesian', 'bayes', 'gp'):
+        return BayesianSearch(config, safety)
+    
     elif strategy_name in ('adaptive_progression', 'adaptive-progression', 'smart', 'chase'):
         if ADAPTIVE_AVAILABLE:
             return AdaptiveProgressionWrapper(config, safety)
@@ -0,0 +1,279 @@
+"""
+SQLite index of saved benchmark sessions
+
+Listing sessions used to mean opening and parsing every session_*.json just
+to show a device, a start time and a test count. SessionIndex keeps one row
+of that summary per session in <session_dir>/sessions.db:
+
+- the engine updates a row when it saves a session, and the web UI does so
+  when it rewrites or deletes one
+- sync() reconciles the table with the directory by file mtime and size,
+  re-reading only files that changed since they were indexed
+- list() filters, sorts and pages in SQL, so a page costs the same whatever
+  the size of the history
+
+The database is only a cache of the session files; deleting it just means the
+next sync() rebuilds it.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "sessions.db"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    device TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    status TEXT,
+    tests INTEGER,
+    stop_reason TEXT,
+    has_logs INTEGER,
+    mode TEXT,
+    tune_type TEXT,
+    auto_mode INTEGER
+);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start_time);
+CREATE INDEX IF NOT EXISTS sessions_device ON sessions (device, start_time);
+CREATE INDEX IF NOT EXISTS sessions_mode ON sessions (mode, start_time);
+CREATE INDEX IF NOT EXISTS sessions_status ON sessions (status, start_time);
+"""
+
+_COLUMNS = ('id', 'device', 'start_time', 'end_time', 'status', 'tests', 'stop_reason',
+            'has_logs', 'mode', 'tune_type', 'auto_mode')
+SORT_COLUMNS = ('start_time', 'end_time', 'device', 'status', 'tests', 'mode')
+
+
+def summarize_session(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The /api/sessions list entry for a session document"""
+    device_name = 'Unknown'
+    if session_data.get('device_configs'):
+        device_name = session_data['device_configs'][0].get('name', 'Unknown')
+
+    mode = session_data.get('mode') or session_data.get('tune_type') or 'benchmark'
+    auto_flag = session_data.get('auto_mode')
+    if auto_flag is None and isinstance(mode, str) and mode.startswith('auto'):
+        auto_flag = True
+
+    return {
+        'id': session_data['session_id'],
+        'device': device_name,
+        'start_time': session_data['start_time'],
+        'end_time': session_data.get('end_time'),
+        'status': session_data['status'],
+        'tests': len(session_data.get('results') or []),
+        'stop_reason': session_data.get('stop_reason'),
+        'has_logs': bool(session_data.get('logs')),
+        'mode': mode,
+        'tune_type': session_data.get('tune_type', mode),
+        'auto_mode': auto_flag,
+    }
+
+
+class SessionIndex:
+    """Session summaries for one sessions directory"""
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        self.path = self.session_dir / INDEX_FILE
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._synced = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.session_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS sessions")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # -- maintenance -------------------------------------------------------
+
+    def _upsert(self, conn: sqlite3.Connection, summary: Dict[str, Any], session_file: Path):
+        stat = session_file.stat()
+        row = dict(summary, file=session_file.name, mtime=stat.st_mtime, size=stat.st_size)
+        for flag in ('has_logs', 'auto_mode'):
+            if row[flag] is not None:
+                row[flag] = int(bool(row[flag]))
+        names = ('file', 'mtime', 'size') + _COLUMNS
+        conn.execute(
+            f"INSERT OR REPLACE INTO sessions ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            [row[n] for n in names],
+        )
+
+    def update(self, session_file: Path, session_data: Optional[Dict[str, Any]] = None):
+        """Index (or re-index) one saved session file"""
+        session_file = Path(session_file)
+        try:
+            if session_data is None:
+                with open(session_file, 'r') as f:
+                    session_data = json.load(f)
+            summary = summarize_session(session_data)
+            with self._lock:
+                conn = self._connect()
+                self._upsert(conn, summary, session_file)
+                conn.commit()
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            logger.error(f"Could not index session {session_file}: {e}")
+
+    def remove(self, session_id: str):
+        """Drop a session from the index"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Could not remove session {session_id} from index: {e}")
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        Bring the index in line with the session files on disk.
+
+        Only files whose mtime or size differ from the indexed row are read.
+        Returns (sessions re-indexed, sessions removed).
+        """
+        files = {}
+        for session_file in self.session_dir.glob('session_*.json'):
+            try:
+                stat = session_file.stat()
+            except FileNotFoundError:
+                continue
+            files[session_file.name] = (session_file, stat.st_mtime, stat.st_size)
+
+        updated = removed = 0
+        try:
+            with self._lock:
+                conn = self._connect()
+                indexed = {row['file']: (row['id'], row['mtime'], row['size'])
+                           for row in conn.execute("SELECT id, file, mtime, size FROM sessions")}
+                for name, (session_id, _, _) in indexed.items():
+                    if name not in files:
+                        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                        removed += 1
+                for name, (session_file, mtime, size) in files.items():
+                    known = indexed.get(name)
+                    if known and known[1] == mtime and known[2] == size:
+                        continue
+                    try:
+                        with open(session_file, 'r') as f:
+                            self._upsert(conn, summarize_session(json.load(f)), session_file)
+                        updated += 1
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.error(f"Error loading session {session_file}: {e}")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Session index sync failed: {e}")
+        finally:
+            self._synced.set()
+        if updated or removed:
+            logger.info(f"Session index: {updated} updated, {removed} removed")
+        return updated, removed
+
+    def wait_synced(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first sync() to finish"""
+        return self._synced.wait(timeout)
+
+    # -- queries -----------------------------------------------------------
+
+    def list(
+        self,
+        device: Optional[str] = None,
+        mode: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sort: str = 'start_time',
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Session summaries matching the filters, and how many match in total.
+
+        `since`/`until` compare against start_time as ISO strings. A date-only
+        `until` such as 2025-01-31 includes the whole of that day.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort sessions by {sort!r}")
+        where, params = [], []
+        for column, value in (('device', device), ('mode', mode), ('status', status)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            where.append("start_time >= ?")
+            params.append(since)
+        if until:
+            operator, bound = _until_bound(until)
+            where.append(f"start_time {operator} ?")
+            params.append(bound)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        order = f" ORDER BY {sort} {'DESC' if descending else 'ASC'}, id"
+        page = ""
+        page_params: List[Any] = []
+        if limit is not None:
+            page = " LIMIT ? OFFSET ?"
+            page_params = [max(0, int(limit)), max(0, int(offset))]
+
+        with self._lock:
+            conn = self._connect()
+            total = conn.execute(f"SELECT COUNT(*) FROM sessions{clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM sessions{clause}{order}{page}", params + page_params
+            ).fetchall()
+
+        sessions = []
+        for row in rows:
+            entry = dict(row)
+            entry['has_logs'] = bool(entry['has_logs'])
+            if entry['auto_mode'] is not None:
+                entry['auto_mode'] = bool(entry['auto_mode'])
+            sessions.append(entry)
+        return sessions, total
+
+
+def _until_bound(until: str) -> Tuple[str, str]:
+    """
+    Comparison for an `until` filter. start_time carries a time of day, so it
+    sorts after the bare date - a date bound becomes "before the next day".
+    """
+    try:
+        day = date.fromisoformat(until)
+    except ValueError:
+        return '<=', until
+    return '<', (day + timedelta(days=1)).isoformat()
+
+
+_indexes: Dict[Path, SessionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_session_index(session_dir: Path) -> SessionIndex:
+    """Get the shared index for a sessions directory"""
+    key = Path(session_dir).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SessionIndex(key)
+    return index
@@ -0,0 +1,192 @@
+"""
+Append-only journal for running benchmark sessions
+
+While a benchmark runs, results and log events are appended to
+journal_<session_id>.jsonl as one compact JSON line each, instead of
+re-serializing the whole session after every test. When the run ends the
+journal is compacted into the usual session_<session_id>.json with an atomic
+replace and then removed.
+
+A journal left behind by a crash can be replayed into the same dict shape as
+a saved session, so the session endpoints can still serve it.
+
+Alongside the journal the engine keeps resume_<session_id>.json: the search
+strategy's serialized state plus engine counters, atomically replaced before
+each test point. Together they let an interrupted run continue exactly where
+it stopped.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+# Session fields that grow during a run and are journaled entry by entry
+_LIST_FIELDS = ('results', 'logs')
+
+
+def journal_path(session_dir: Path, session_id: str) -> Path:
+    """Where a running session's journal lives"""
+    return Path(session_dir) / f"journal_{session_id}.jsonl"
+
+
+def resume_state_path(session_dir: Path, session_id: str) -> Path:
+    """Where a session's resume state (strategy snapshot) lives"""
+    return Path(session_dir) / f"resume_{session_id}.json"
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any], indent: Optional[int] = 2, default=None):
+    """Write JSON to a temp file and rename it over `path` (never leaves a torn file)"""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent, default=default)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SessionJournal:
+    """Appends session events as JSON lines"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def start(self, session: Dict[str, Any]):
+        """Begin a fresh journal from a session dict (existing results/logs are carried over)"""
+        header = {k: v for k, v in session.items() if k not in _LIST_FIELDS}
+        header['journal_version'] = JOURNAL_VERSION
+        with self._lock:
+            self._close()
+            self._file = open(self.path, 'w')
+            self._write('session', header)
+            for result in session.get('results') or []:
+                self._write('result', result)
+            for entry in session.get('logs') or []:
+                self._write('log', entry)
+
+    def _write(self, kind: str, data: Any):
+        if self._file is None:
+            return
+        try:
+            self._file.write(json.dumps({'t': kind, 'd': data}, separators=(',', ':'), default=str) + '\n')
+            self._file.flush()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to write session journal {self.path}: {e}")
+
+    def append_result(self, result: Dict[str, Any]):
+        with self._lock:
+            self._write('result', result)
+
+    def append_log(self, entry: Dict[str, Any]):
+        with self._lock:
+            self._write('log', entry)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def compact(self, session: Dict[str, Any], target: Path):
+        """Atomically write the final session document and drop the journal"""
+        self.close()
+        write_json_atomic(target, session)
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def replay(path: Path) -> Optional[Dict[str, Any]]:
+    """Rebuild a session dict from a journal (a torn last line is ignored)"""
+    session: Optional[Dict[str, Any]] = None
+    results = []
+    logs = []
+    try:
+        with open(path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"{path}: skipping unreadable journal line {line_no}")
+                    continue
+                kind, data = entry.get('t'), entry.get('d')
+                if kind == 'session':
+                    session = dict(data)
+                    session.pop('journal_version', None)
+                elif kind == 'result':
+                    results.append(data)
+                elif kind == 'log':
+                    logs.append(data)
+    except FileNotFoundError:
+        return None
+    if session is None:
+        return None
+    session['results'] = results
+    session['logs'] = logs
+    return session
+
+
+def load_checkpoint(session_dir: Path, session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Everything needed to resume a session: {'session': ..., 'resume': ...}.
+
+    None unless both the session data (journal or saved document) and its
+    resume state exist.
+    """
+    path = resume_state_path(session_dir, session_id)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r') as f:
+            resume = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Unreadable resume state {path}: {e}")
+        return None
+    session = load_session_data(session_dir, session_id)
+    if session is None:
+        return None
+    return {'session': session, 'resume': resume}
+
+
+def list_checkpoints(session_dir: Path) -> List[Dict[str, Any]]:
+    """Summaries of sessions that can be resumed, newest first"""
+    checkpoints = []
+    for path in Path(session_dir).glob('resume_*.json'):
+        session_id = path.stem[len('resume_'):]
+        checkpoint = load_checkpoint(session_dir, session_id)
+        if not checkpoint:
+            continue
+        session = checkpoint['session']
+        devices = session.get('device_configs') or [{}]
+        checkpoints.append({
+            'session_id': session_id,
+            'device': devices[0].get('name'),
+            'start_time': session.get('start_time'),
+            'status': session.get('status'),
+            'mode': session.get('mode'),
+            'tests_completed': len(session.get('results') or []),
+            'saved_at': path.stat().st_mtime,
+        })
+    checkpoints.sort(key=lambda c: c['saved_at'], reverse=True)
+    return checkpoints
+
+
+def load_session_data(session_dir: Path, session_id: str) -> Optional[Dict[str, Any]]:
+    """Saved session document, or the replayed journal of a session still running"""
+    session_file = Path(session_dir) / f"session_{session_id}.json"
+    if session_file.exists():
+        with open(session_file, 'r') as f:
+            return json.load(f)
+    return replay(journal_path(session_dir, session_id))
@@ -0,0 +1,167 @@
+"""
+Indexed, append-only session log files
+
+Each session's log entries are written to logs_<session_id>.jsonl (one JSON
+object per line) with a companion logs_<session_id>.idx holding the byte
+offset of every line as a little-endian uint64. Entry N (1-based sequence
+number) starts at idx[N - 1], so a reader can jump straight to "everything
+after seq" without parsing the session document or the lines before it.
+
+The engine writes the file while a benchmark runs. Sessions recorded before
+this existed get their log file built once from the session document the
+first time their logs are paged.
+"""
+import json
+import logging
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OFFSET = struct.Struct('<Q')
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 2000
+
+
+def log_path(session_dir: Path, session_id: str) -> Path:
+    """Where a session's log lines live"""
+    return Path(session_dir) / f"logs_{session_id}.jsonl"
+
+
+def index_path(session_dir: Path, session_id: str) -> Path:
+    """Where a session's log line offsets live"""
+    return Path(session_dir) / f"logs_{session_id}.idx"
+
+
+class SessionLogWriter:
+    """Appends log entries and their offsets"""
+
+    def __init__(self, session_dir: Path, session_id: str):
+        self.path = log_path(session_dir, session_id)
+        self.index = index_path(session_dir, session_id)
+        self.count = 0
+        self._log = None
+        self._idx = None
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def open(self, entries: Optional[List[Dict[str, Any]]] = None):
+        """
+        Open for appending.
+
+        With `entries` (the session's logs so far) the file is kept if it
+        already holds exactly that many lines and rewritten otherwise; without
+        them any existing file is replaced.
+        """
+        existing = _indexed_count(self.index)
+        if entries is not None and existing == len(entries) and self.path.exists():
+            self._log = open(self.path, 'ab')
+            self._idx = open(self.index, 'ab')
+            self._offset = self._log.tell()
+            self.count = existing
+            return
+        self._log = open(self.path, 'wb')
+        self._idx = open(self.index, 'wb')
+        self._offset = 0
+        self.count = 0
+        for entry in entries or ():
+            self._write(entry)
+        self._flush()
+
+    def _write(self, entry: Dict[str, Any]):
+        line = (json.dumps(entry, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+        self._log.write(line)
+        # Offset goes in after the line, so an indexed entry is always complete
+        self._idx.write(OFFSET.pack(self._offset))
+        self._offset += len(line)
+        self.count += 1
+
+    def _flush(self):
+        self._log.flush()
+        self._idx.flush()
+
+    def append(self, entry: Dict[str, Any]):
+        with self._lock:
+            if self._log is None:
+                return
+            try:
+                self._write(entry)
+                self._flush()
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Failed to write session log {self.path}: {e}")
+
+    def close(self):
+        with self._lock:
+            for f in (self._log, self._idx):
+                if f is not None:
+                    f.close()
+            self._log = self._idx = None
+
+
+def _indexed_count(index: Path) -> int:
+    try:
+        return index.stat().st_size // OFFSET.size
+    except FileNotFoundError:
+        return 0
+
+
+def build_log_file(session_dir: Path, session_id: str, entries: Iterable[Dict[str, Any]]):
+    """Write a session's log file from a list of entries (for older sessions)"""
+    writer = SessionLogWriter(session_dir, session_id)
+    writer.open(list(entries))
+    writer.close()
+
+
+def read_logs(
+    session_dir: Path,
+    session_id: str,
+    after: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    types: Optional[Iterable[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    One page of a session's logs: entries with seq > `after`, oldest first.
+
+    `types` keeps only entries of those types; the page then still holds up
+    to `limit` matching entries and `next` points past the last line read.
+    Returns None if the session has no log file.
+    """
+    path = log_path(session_dir, session_id)
+    index = index_path(session_dir, session_id)
+    if not path.exists() or not index.exists():
+        return None
+
+    total = _indexed_count(index)
+    after = max(0, min(int(after), total))
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    wanted = set(types) if types else None
+
+    logs = []
+    seq = after
+    if after < total:
+        with open(index, 'rb') as idx:
+            idx.seek(after * OFFSET.size)
+            start, = OFFSET.unpack(idx.read(OFFSET.size))
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while seq < total and len(logs) < limit:
+                line = f.readline()
+                if not line:
+                    break
+                seq += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"{path}: skipping unreadable log line {seq}")
+                    continue
+                if wanted is None or entry.get('type') in wanted:
+                    logs.append(dict(entry, seq=seq))
+
+    return {
+        'logs': logs,
+        'next': seq,
+        'total': total,
+        'has_more': seq < total,
+    }
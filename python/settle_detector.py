@@ -0,0 +1,118 @@
+"""
+Equilibrium detection after a settings change
+
+A fixed warmup is too long for a one-step move and too short for a big one:
+the chip keeps heating (and the fan and power keep moving) well past it. The
+engine instead polls the device every few seconds and feeds the readings to
+a SettleDetector, which calls the device settled once, over its window of
+the last `window` seconds of readings:
+
+- the chip temperature trend is flatter than temp_slope (°C per minute)
+- hashrate and power drift by less than their tolerances (percent of the
+  mean across the window, from a least-squares trend)
+
+Hashrate and power readings are noisy, so a trend only counts by how far it
+exceeds the 95% confidence half-width of the fitted slope - scatter around a
+flat level doesn't hold a point back, a real trend still does. The window is
+set in seconds so the fit always spans enough time to resolve a slow drift,
+whatever the poll interval.
+
+The caller enforces the minimum and maximum wait around it.
+"""
+from collections import deque
+from typing import Optional
+
+from streaming_stats import LinearTrend, WindowedStats
+
+
+class SettleDetector:
+    """Rolling equilibrium check over the last `window` seconds of readings"""
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        interval: float = 2.0,
+        temp_slope: float = 0.5,
+        hashrate_drift: float = 3.0,
+        power_drift: float = 2.0,
+    ):
+        self.window = window
+        self.size = max(3, int(round(window / max(interval, 0.1))) + 1)
+        self.temp_slope = temp_slope
+        self.hashrate_drift = hashrate_drift
+        self.power_drift = power_drift
+        self._temp = LinearTrend(window=self.size)
+        self._hashrate = LinearTrend(window=self.size)
+        self._power = LinearTrend(window=self.size)
+        self._hashrate_level = WindowedStats(self.size)
+        self._power_level = WindowedStats(self.size)
+        self._times = deque(maxlen=self.size)
+        self._t0: Optional[float] = None
+        self.readings = 0
+
+    def push(self, timestamp: float, hashrate: float, temperature: float, power: float):
+        """Add one reading (timestamp in seconds)"""
+        if self._t0 is None:
+            self._t0 = timestamp
+        t = timestamp - self._t0  # keep the trend inputs small
+        self._temp.push(temperature, t)
+        self._hashrate.push(hashrate, t)
+        self._power.push(power, t)
+        self._hashrate_level.push(hashrate)
+        self._power_level.push(power)
+        self._times.append(t)
+        self.readings += 1
+
+    @property
+    def span(self) -> float:
+        """Seconds covered by the current window"""
+        return self._times[-1] - self._times[0] if len(self._times) > 1 else 0.0
+
+    @staticmethod
+    def _beyond_noise(trend: LinearTrend) -> float:
+        """Slope magnitude that reading noise can't account for"""
+        half_width = trend.slope_half_width()
+        return max(0.0, abs(trend.slope) - (half_width or 0.0))
+
+    @property
+    def temp_rate(self) -> float:
+        """Chip temperature trend, °C per minute"""
+        return self._temp.slope * 60.0
+
+    def _drift(self, trend: LinearTrend, level: WindowedStats) -> Optional[float]:
+        mean = level.mean
+        if not mean:
+            return None
+        return self._beyond_noise(trend) * self.span / abs(mean) * 100.0
+
+    @property
+    def hashrate_drift_pct(self) -> Optional[float]:
+        return self._drift(self._hashrate, self._hashrate_level)
+
+    @property
+    def power_drift_pct(self) -> Optional[float]:
+        return self._drift(self._power, self._power_level)
+
+    @property
+    def settled(self) -> bool:
+        if not self._temp.full or self.span <= 0:
+            return False
+        if self._beyond_noise(self._temp) * 60.0 > self.temp_slope:
+            return False
+        hashrate_drift = self.hashrate_drift_pct
+        power_drift = self.power_drift_pct
+        if hashrate_drift is None or hashrate_drift > self.hashrate_drift:
+            return False
+        if power_drift is None or power_drift > self.power_drift:
+            return False
+        return True
+
+    def describe(self) -> str:
+        """Current trends, for status messages"""
+        if self.readings < 2:
+            return "waiting for readings"
+        hashrate_drift = self.hashrate_drift_pct
+        power_drift = self.power_drift_pct
+        return (f"temp {self.temp_rate:+.2f}°C/min, "
+                f"hashrate drift {hashrate_drift if hashrate_drift is not None else 0:.1f}%, "
+                f"power drift {power_drift if power_drift is not None else 0:.1f}%")
@@ -0,0 +1,233 @@
+"""
+Thread-safe store for the live benchmark status shown in the web UI
+
+The benchmark thread updates the status on every callback (often once per
+sample) while request threads read it. BenchmarkStatusStore keeps it behind
+a lock and bumps a revision counter on every change, so readers can tell
+whether anything moved. Growing fields are bounded: the console message queue
+and the session log are ring buffers, and the V/F combos already seen are a
+set. Persistence to benchmark_state.json is debounced onto a background timer
+instead of rewriting the file on every update.
+
+Every session log entry also gets a sequence number that keeps counting up
+for the life of the process, so a stream consumer (see
+/api/benchmark/stream) can ask for "everything after N" and pick up where it
+left off after a reconnect.
+
+The store behaves like the dict it replaces (status['phase'] = ...,
+status.get('config'), status.update(...)), so existing call sites keep
+working.
+"""
+import json
+import logging
+import threading
+from collections import deque
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from session_journal import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_QUEUE_SIZE = 500  # console messages not yet cleared by the UI
+SESSION_LOG_SIZE = 2000  # most recent in-memory log entries
+SAVE_DELAY = 2.0  # seconds between a change and the state file being written
+
+# Fields kept as ring buffers, with their capacity
+_RING_FIELDS = {
+    'message_queue': MESSAGE_QUEUE_SIZE,
+    'session_logs': SESSION_LOG_SIZE,
+}
+_COMBO_FIELD = 'seen_combos'
+
+
+class BenchmarkStatusStore(MutableMapping):
+    """Locked, revisioned status dict with bounded buffers and debounced saving"""
+
+    def __init__(self, defaults: Dict[str, Any], state_file: Optional[Path] = None, save_delay: float = SAVE_DELAY):
+        self.state_file = Path(state_file) if state_file else None
+        self.save_delay = save_delay
+        self.revision = 0
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._data: Dict[str, Any] = {}
+        self.log_seq = 0  # sequence number of the newest log entry
+        self._log_events: deque = deque(maxlen=SESSION_LOG_SIZE)  # (seq, entry)
+        self._combos = set()
+        self._save_timer: Optional[threading.Timer] = None
+        for key, value in defaults.items():
+            self._set(key, value)
+
+    # -- dict interface ----------------------------------------------------
+
+    def _bump(self):
+        self.revision += 1
+        self._changed.notify_all()
+
+    def _set(self, key: str, value: Any):
+        if key in _RING_FIELDS:
+            value = deque(value or (), maxlen=_RING_FIELDS[key])
+        elif key == _COMBO_FIELD:
+            self._combos = {tuple(c) for c in value or ()}
+            value = self._combos
+        self._data[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key: str, value: Any):
+        with self._lock:
+            self._set(key, value)
+            self._bump()
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            del self._data[key]
+            self._bump()
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def update(self, other=(), **kwargs):
+        """Apply several fields as one change (one revision bump)"""
+        with self._lock:
+            for key, value in dict(other, **kwargs).items():
+                self._set(key, value)
+            self._bump()
+
+    # -- bounded buffers ---------------------------------------------------
+
+    def append_message(self, phase: str, message: str):
+        """Queue a console message for the UI"""
+        with self._lock:
+            self._ring('message_queue').append({'phase': phase, 'message': message})
+            self._bump()
+
+    def append_log(self, entry: Dict[str, Any]):
+        """Add an entry to the in-memory session log"""
+        with self._lock:
+            self._ring('session_logs').append(entry)
+            self.log_seq += 1
+            self._log_events.append((self.log_seq, entry))
+            self._bump()
+
+    def _ring(self, key: str) -> deque:
+        ring = self._data.get(key)
+        if not isinstance(ring, deque):
+            self._set(key, ring)
+            ring = self._data[key]
+        return ring
+
+    def add_combo(self, combo: Tuple[int, int]) -> int:
+        """Note a V/F combo as seen; returns how many distinct combos have been seen"""
+        with self._lock:
+            if combo not in self._combos:
+                if self._data.get(_COMBO_FIELD) is not self._combos:
+                    self._data[_COMBO_FIELD] = self._combos
+                self._combos.add(combo)
+                self._bump()
+            return len(self._combos)
+
+    @property
+    def combo_count(self) -> int:
+        with self._lock:
+            return len(self._combos)
+
+    def logs_since(self, seq: int, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Log entries newer than `seq`, oldest first, and the sequence number
+        of the last one returned (`seq` itself if there are none). Entries
+        that have already dropped out of the ring buffer are skipped; a
+        cursor from before a server restart starts over from the beginning.
+        """
+        with self._lock:
+            if seq > self.log_seq:
+                seq = 0
+            newer = []
+            for entry_seq, entry in reversed(self._log_events):
+                if entry_seq <= seq:
+                    break
+                newer.append((entry_seq, entry))
+        newer.reverse()
+        if limit is not None:
+            newer = newer[:limit]
+        if not newer:
+            return [], seq
+        return [entry for _, entry in newer], newer[-1][0]
+
+    def wait_for_change(self, revision: int, timeout: Optional[float] = None) -> int:
+        """Block until the revision differs from `revision` (or timeout); returns the current revision"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.revision != revision, timeout)
+            return self.revision
+
+    # -- snapshots and persistence -----------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Shallow, JSON-friendly copy of the current status"""
+        with self._lock:
+            data = {}
+            for key, value in self._data.items():
+                if isinstance(value, deque):
+                    value = list(value)
+                elif key == _COMBO_FIELD:
+                    value = sorted(list(c) for c in value)
+                data[key] = value
+            return data
+
+    def fields(self) -> Dict[str, Any]:
+        """Snapshot without the buffers (what a status delta is computed from)"""
+        with self._lock:
+            data = {k: v for k, v in self._data.items() if k not in _RING_FIELDS and k != _COMBO_FIELD}
+            data['seen_combo_count'] = len(self._combos)
+            return data
+
+    def save(self):
+        """Schedule a write of the state file (coalesces bursts of updates)"""
+        if not self.state_file:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self._save_now)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write the state file now, cancelling any pending write"""
+        if not self.state_file:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+        self._save_now()
+
+    def _save_now(self):
+        with self._lock:
+            self._save_timer = None
+            state = self.snapshot()
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.state_file, state, indent=None, default=str)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not save benchmark state: {e}")
+
+    def load(self):
+        """Merge a previously saved state file into the store"""
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load benchmark state: {e}")
+            return
+        if isinstance(data, dict):
+            self.update(data)
@@ -0,0 +1,323 @@
+"""
+Constant-memory streaming aggregators for benchmark samples
+
+Each aggregator takes one value at a time and keeps O(1) state, so a test
+point costs the same memory whether it collects 40 samples or 40,000:
+
+- RunningStats: count, mean, variance (Welford), min/max and CI half-width
+- WindowedStats: mean/std over the last N values (Welford with removal)
+- LinearTrend: least-squares slope and its confidence half-width, cumulative
+  or over a sliding window
+- P2Quantile: P-squared quantile estimate (Jain & Chlamtac, 1985)
+- IQRFilteredStats: RunningStats over values inside the Tukey fences, with
+  the quartiles tracked by P2Quantile
+"""
+import math
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from scipy import stats
+
+_T_CRITICAL: Dict[Tuple[float, int], float] = {}
+
+
+def t_critical(confidence: float, dof: int) -> float:
+    """Two-sided Student t critical value (cached - scipy's ppf is slow per sample)"""
+    key = (confidence, dof)
+    value = _T_CRITICAL.get(key)
+    if value is None:
+        value = float(stats.t.ppf((1 + confidence) / 2, dof))
+        if len(_T_CRITICAL) < 4096:
+            _T_CRITICAL[key] = value
+    return value
+
+
+class RunningStats:
+    """Welford mean/variance plus min/max"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(max(0.0, self.variance))
+
+    @property
+    def pstdev(self) -> float:
+        """Population standard deviation (ddof=0)"""
+        return math.sqrt(max(0.0, self._m2 / self.count)) if self.count else 0.0
+
+    @property
+    def coefficient_of_variation(self) -> float:
+        """std_dev / mean in percent"""
+        return self.std_dev / self.mean * 100 if self.mean else 0.0
+
+    def ci_half_width(self, confidence: float = 0.95) -> Optional[float]:
+        """Half-width of the t confidence interval for the mean (None if < 2 samples)"""
+        if self.count < 2:
+            return None
+        return t_critical(confidence, self.count - 1) * self.std_dev / math.sqrt(self.count)
+
+
+class WindowedStats:
+    """Mean and standard deviation over the most recent `size` values"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._values = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float):
+        if len(self._values) >= self.size:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        n = len(self._values)
+        delta = value - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float):
+        n = len(self._values)  # already excludes `value`
+        if n == 0:
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        old_mean = self.mean - (value - self.mean) / n
+        self._m2 = max(0.0, self._m2 - (value - old_mean) * (value - self.mean))
+        self.mean = old_mean
+
+    @property
+    def pstdev(self) -> float:
+        """Population standard deviation of the window"""
+        return math.sqrt(self._m2 / len(self._values)) if self._values else 0.0
+
+
+class LinearTrend:
+    """
+    Incremental least-squares fit of y against x.
+
+    x defaults to the sample index. With `window` set, only the last `window`
+    points are fitted (matching a linregress over data[-window:]).
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self._points = deque() if window else None
+        self._next_x = 0
+        self.count = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._cxy = 0.0
+        self._m2x = 0.0
+        self._m2y = 0.0
+
+    def push(self, y: float, x: Optional[float] = None):
+        if x is None:
+            x = self._next_x
+        self._next_x = x + 1
+        if self._points is not None:
+            if len(self._points) >= self.window:
+                self._remove(*self._points.popleft())
+            self._points.append((x, y))
+        self.count += 1
+        dx = x - self._mean_x
+        dy = y - self._mean_y
+        self._mean_x += dx / self.count
+        self._mean_y += dy / self.count
+        self._cxy += dx * (y - self._mean_y)
+        self._m2x += dx * (x - self._mean_x)
+        self._m2y += dy * (y - self._mean_y)
+
+    def _remove(self, x: float, y: float):
+        n = self.count - 1
+        if n == 0:
+            self.count = 0
+            self._mean_x = self._mean_y = self._cxy = self._m2x = self._m2y = 0.0
+            return
+        old_mean_x = self._mean_x - (x - self._mean_x) / n
+        old_mean_y = self._mean_y - (y - self._mean_y) / n
+        self._cxy -= (x - old_mean_x) * (y - self._mean_y)
+        self._m2x -= (x - old_mean_x) * (x - self._mean_x)
+        self._m2y = max(0.0, self._m2y - (y - old_mean_y) * (y - self._mean_y))
+        self._mean_x, self._mean_y, self.count = old_mean_x, old_mean_y, n
+
+    @property
+    def full(self) -> bool:
+        """True once a windowed trend has `window` points"""
+        return self.window is None or self.count >= self.window
+
+    @property
+    def slope(self) -> float:
+        if self.count < 2 or self._m2x <= 0:
+            return 0.0
+        return self._cxy / self._m2x
+
+    def slope_half_width(self, confidence: float = 0.95) -> Optional[float]:
+        """Confidence half-width of the slope, from the scatter around the fit"""
+        if self.count < 3 or self._m2x <= 0:
+            return None
+        residual = max(0.0, self._m2y - self._cxy ** 2 / self._m2x)
+        return t_critical(confidence, self.count - 2) * math.sqrt(residual / (self.count - 2) / self._m2x)
+
+
+class P2Quantile:
+    """
+    P-squared streaming quantile estimator.
+
+    Keeps five markers instead of the data. The first five values are held
+    exactly; after that the estimate is approximate but usually within a few
+    percent of the true quantile for unimodal data.
+    """
+
+    def __init__(self, p: float):
+        if not 0.0 < p < 1.0:
+            raise ValueError("p must be between 0 and 1")
+        self.p = p
+        self.count = 0
+        self._q: List[float] = []
+        self._n = [0, 1, 2, 3, 4]
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def push(self, value: float):
+        self.count += 1
+        q = self._q
+        if self.count <= 5:
+            q.append(value)
+            q.sort()
+            return
+
+        n = self._n
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while k < 3 and value >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        for i in (1, 2, 3):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self._q, self._n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current estimate (exact, linearly interpolated, for <= 5 values)"""
+        if not self._q:
+            return None
+        if self.count > 5:
+            return self._q[2]
+        pos = self.p * (len(self._q) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(self._q) - 1)
+        return self._q[lo] + (self._q[hi] - self._q[lo]) * (pos - lo)
+
+
+class IQRFilteredStats:
+    """
+    Streaming counterpart of DataAnalyzer.remove_outliers_iqr.
+
+    Every value goes into `raw`; values inside [q1 - k*IQR, q3 + k*IQR] also
+    go into the clean stats. The first `warmup` values are held until the
+    quartile estimates have something to go on, then judged together. Later
+    values are judged against the fences at the time they arrive, so the
+    result can differ slightly from a two-pass filter over the full series.
+    """
+
+    def __init__(self, multiplier: float = 1.5, warmup: int = 12):
+        self.multiplier = multiplier
+        self.warmup = warmup
+        self.raw = RunningStats()
+        self._clean = RunningStats()
+        self._q1 = P2Quantile(0.25)
+        self._q3 = P2Quantile(0.75)
+        self._pending: Optional[List[float]] = []
+
+    def push(self, value: float):
+        self.raw.push(value)
+        self._q1.push(value)
+        self._q3.push(value)
+        if self._pending is not None:
+            self._pending.append(value)
+            if len(self._pending) >= self.warmup:
+                for held in self._pending:
+                    if self._inside(held):
+                        self._clean.push(held)
+                self._pending = None
+            return
+        if self._inside(value):
+            self._clean.push(value)
+
+    def fences(self) -> Optional[Tuple[float, float]]:
+        q1, q3 = self._q1.value, self._q3.value
+        if q1 is None or q3 is None:
+            return None
+        iqr = q3 - q1
+        return q1 - self.multiplier * iqr, q3 + self.multiplier * iqr
+
+    def _inside(self, value: float) -> bool:
+        bounds = self.fences()
+        return bounds is None or bounds[0] <= value <= bounds[1]
+
+    @property
+    def clean(self) -> RunningStats:
+        """Stats over the non-outlier values seen so far"""
+        if self._pending is None:
+            return self._clean
+        # Still in warmup: judge the held values against the current fences
+        held = RunningStats()
+        keep_all = len(self._pending) < 4  # too few to call anything an outlier
+        for value in self._pending:
+            if keep_all or self._inside(value):
+                held.push(value)
+        return held
+
+    @property
+    def rejected(self) -> int:
+        return self.raw.count - self.clean.count
@@ -0,0 +1,216 @@
+"""
+Background telemetry collector for the device fleet
+
+Polls every device registered with a DeviceManager on a fixed cadence and keeps
+the latest SystemInfo per device in memory. Route handlers read from this cache
+instead of hitting the miners directly, so any number of open dashboards costs
+the devices one request per poll interval.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from async_runner import AsyncRunner, get_runner
+from device_manager import DeviceManager, SystemInfo, get_device_manager
+
+logger = logging.getLogger(__name__)
+
+# Poll cadence and default freshness bound (seconds), overridable per deployment
+DEFAULT_INTERVAL = float(os.environ.get('AXEBENCH_TELEMETRY_INTERVAL', '5'))
+DEFAULT_MAX_AGE = float(os.environ.get('AXEBENCH_TELEMETRY_MAX_AGE', '15'))
+
+
+@dataclass
+class TelemetryReading:
+    """Latest poll result for one device"""
+    info: Optional[SystemInfo]  # None if the last fetch failed
+    fetched_at: float  # time.time() of the fetch
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def online(self) -> bool:
+        return self.info is not None
+
+
+class TelemetryCollector:
+    """
+    Polls devices in the background and serves cached readings.
+
+    All fetching happens on the shared AsyncRunner loop. Concurrent cache misses
+    for the same device wait on a single in-flight request instead of each
+    issuing their own.
+    """
+
+    def __init__(
+        self,
+        device_manager: DeviceManager,
+        interval: float = DEFAULT_INTERVAL,
+        max_age: float = DEFAULT_MAX_AGE,
+        runner: Optional[AsyncRunner] = None,
+    ):
+        self.device_manager = device_manager
+        self.interval = interval
+        self.max_age = max_age
+        self.runner = runner or get_runner()
+        self._readings: Dict[str, TelemetryReading] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}  # only touched on the runner loop
+        self._batches = set()  # strong refs to running fetch tasks
+        self._poll_future = None
+        self._lifecycle_lock = threading.Lock()  # start() runs from request threads
+
+    # ---- lifecycle -------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._poll_future is not None and not self._poll_future.done()
+
+    def start(self):
+        """Start the background poll task (no-op if already running)"""
+        with self._lifecycle_lock:
+            if self.running:
+                return
+            self._poll_future = self.runner.submit(self._poll_loop())
+        logger.info(f"Telemetry collector started (interval={self.interval}s, max_age={self.max_age}s)")
+
+    def stop(self):
+        """Stop the background poll task"""
+        with self._lifecycle_lock:
+            future, self._poll_future = self._poll_future, None
+        if future is not None:
+            future.cancel()
+            logger.info("Telemetry collector stopped")
+
+    async def _poll_loop(self):
+        while True:
+            started = time.time()
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Telemetry poll error: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    # ---- fetching (runner loop) ------------------------------------------
+
+    async def refresh(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[SystemInfo]]:
+        """
+        Fetch fresh readings for the given devices (all registered devices by default).
+
+        Devices that already have a fetch in flight join it; the rest are
+        fetched together in one concurrent batch.
+        """
+        if names is None:
+            names = self.device_manager.list_devices()
+        names = list(dict.fromkeys(names))
+        pending = {name: self._inflight.get(name) for name in names}
+        new = [name for name, fut in pending.items() if fut is None]
+        if new:
+            pending.update(self._start_batch(new))
+        results = {}
+        for name in names:
+            # Shield so one cancelled waiter doesn't cancel the fetch for everyone
+            results[name] = await asyncio.shield(pending[name])
+        self._forget_removed()
+        return results
+
+    async def _fetch(self, name: str) -> Optional[SystemInfo]:
+        """Fetch one device, sharing any request already in flight for it"""
+        return (await self.refresh([name]))[name]
+
+    def _start_batch(self, names) -> Dict[str, asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        futures = {name: loop.create_future() for name in names}
+        self._inflight.update(futures)
+        task = asyncio.ensure_future(self._fetch_batch(futures))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+        return futures
+
+    async def _fetch_batch(self, futures: Dict[str, asyncio.Future]):
+        infos = {}
+        completed = False
+        try:
+            infos = await self.device_manager.get_all_system_info(list(futures))
+            completed = True
+        except Exception as e:
+            logger.error(f"Telemetry fetch error: {e}")
+        finally:
+            fetched_at = time.time()
+            for name, fut in futures.items():
+                if self._inflight.get(name) is fut:
+                    del self._inflight[name]
+                info = infos.get(name)
+                if completed and name in self.device_manager.devices:
+                    self._readings[name] = TelemetryReading(info=info, fetched_at=fetched_at)
+                if not fut.done():
+                    fut.set_result(info)
+
+    def _forget_removed(self):
+        for name in [n for n in self._readings if n not in self.device_manager.devices]:
+            self._readings.pop(name, None)
+
+    async def get(self, name: str, max_age: Optional[float] = None) -> Optional[SystemInfo]:
+        """Cached reading if fresh enough, otherwise a (single-flight) live fetch"""
+        reading = self.get_reading(name)
+        limit = self.max_age if max_age is None else max_age
+        if reading is not None and reading.age <= limit:
+            return reading.info
+        return await self._fetch(name)
+
+    async def get_many(self, names: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Optional[SystemInfo]]:
+        """get() for several devices; stale ones are fetched concurrently"""
+        names = list(names)
+        limit = self.max_age if max_age is None else max_age
+        results = {}
+        stale = []
+        for name in names:
+            reading = self.get_reading(name)
+            if reading is not None and reading.age <= limit:
+                results[name] = reading.info
+            else:
+                stale.append(name)
+        if stale:
+            results.update(await self.refresh(stale))
+        return {name: results.get(name) for name in names}
+
+    # ---- sync accessors (Flask threads) -----------------------------------
+
+    def get_reading(self, name: str) -> Optional[TelemetryReading]:
+        """Last reading for a device without triggering a fetch"""
+        return self._readings.get(name)
+
+    def get_info(self, name: str, max_age: Optional[float] = None, timeout: float = 15) -> Optional[SystemInfo]:
+        """Blocking version of get() for sync route handlers"""
+        self.start()
+        reading = self.get_reading(name)
+        limit = self.max_age if max_age is None else max_age
+        if reading is not None and reading.age <= limit:
+            return reading.info
+        return self.runner.run(self.get(name, max_age), timeout=timeout)
+
+    def get_infos(self, names: Iterable[str], max_age: Optional[float] = None, timeout: float = 15) -> Dict[str, Optional[SystemInfo]]:
+        """Blocking version of get_many() for sync route handlers"""
+        self.start()
+        return self.runner.run(self.get_many(names, max_age), timeout=timeout)
+
+
+_telemetry: Optional[TelemetryCollector] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> TelemetryCollector:
+    """Get the process-wide collector, polling the shared device registry"""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = TelemetryCollector(get_device_manager())
+    return _telemetry
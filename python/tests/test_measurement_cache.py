@@ -0,0 +1,53 @@
+"""Reuse rules of the per-device measurement cache"""
+from measurement_cache import MeasurementCache, fan_setting
+
+SETTINGS = {'benchmark_duration': 120, 'sample_interval': 5, 'cycles_per_test': 1}
+
+
+def cache_with_point(tmp_path, **kwargs):
+    cache = MeasurementCache(tmp_path / 'gamma.json')
+    options = dict(fan='auto:60', settings=SETTINGS, measured_at=1000.0, ambient=22.0)
+    options.update(kwargs)
+    cache.put(1200, 500, result={'hashrate': 1000.0}, session_id='s1', **options)
+    return cache
+
+
+def test_fan_setting_labels():
+    assert fan_setting(True, 50, 60) == 'auto:60'
+    assert fan_setting(True, 50, None) == 'auto'
+    assert fan_setting(False, 79.6, 60) == 'manual:80'
+    assert fan_setting(None, 50, 60) is None
+
+
+def test_entry_matches_point_fan_and_age(tmp_path):
+    cache = cache_with_point(tmp_path)
+    assert cache.get(1200, 500, 'auto:60', SETTINGS, now=1100, max_age=3600)['session_id'] == 's1'
+    assert cache.get(1200, 525, 'auto:60', SETTINGS, now=1100, max_age=3600) is None
+    assert cache.get(1200, 500, 'manual:100', SETTINGS, now=1100, max_age=3600) is None
+    assert cache.get(1200, 500, 'auto:60', SETTINGS, now=5000, max_age=3600) is None
+
+
+def test_entry_must_be_measured_at_least_as_thoroughly(tmp_path):
+    cache = cache_with_point(tmp_path)
+    quicker = dict(SETTINGS, benchmark_duration=60, sample_interval=10)
+    longer = dict(SETTINGS, benchmark_duration=300)
+    assert cache.get(1200, 500, 'auto:60', quicker, now=1100, max_age=3600) is not None
+    assert cache.get(1200, 500, 'auto:60', longer, now=1100, max_age=3600) is None
+
+
+def test_ambient_tolerance(tmp_path):
+    cache = cache_with_point(tmp_path)
+    options = dict(now=1100, max_age=3600, ambient_tolerance=3.0)
+    assert cache.get(1200, 500, 'auto:60', SETTINGS, ambient=24.0, **options) is not None
+    assert cache.get(1200, 500, 'auto:60', SETTINGS, ambient=30.0, **options) is None
+    assert cache.get(1200, 500, 'auto:60', SETTINGS, ambient=None, **options) is not None
+
+
+def test_save_drops_expired_entries(tmp_path):
+    cache = cache_with_point(tmp_path)
+    cache.put(1250, 525, 'auto:60', SETTINGS, {'hashrate': 1100.0}, measured_at=4000.0, session_id='s2')
+    cache.save(now=5000, max_age=3600)
+
+    reloaded = MeasurementCache(tmp_path / 'gamma.json')
+    assert len(reloaded) == 1
+    assert reloaded.get(1250, 525, 'auto:60', SETTINGS, now=5000, max_age=3600)['session_id'] == 's2'
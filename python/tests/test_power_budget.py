@@ -0,0 +1,89 @@
+"""Shared-PSU budget behaviour of the benchmark engine, against the simulator"""
+import asyncio
+
+import benchmark_engine
+from benchmark_engine import BenchmarkEngine
+from bitaxe_simulator import SimulatorFleet
+from clock import VirtualClock
+from config import BenchmarkConfig, SafetyLimits, SearchStrategy
+from device_manager import DeviceManager
+from power_budget import PowerBudget
+
+
+def test_budget_timeout_skips_point_without_telling_strategy(tmp_path, monkeypatch):
+    strategies = []
+
+    def recording_strategy(*args, **kwargs):
+        strategy = create_search_strategy(*args, **kwargs)
+        strategies.append(strategy)
+        return strategy
+
+    create_search_strategy = benchmark_engine.create_search_strategy
+    monkeypatch.setattr(benchmark_engine, 'create_search_strategy', recording_strategy)
+
+    async def run():
+        clock = VirtualClock()
+        fleet = SimulatorFleet.build(1, model="gamma", base_port=18650, seed=1, clock=clock)
+        await fleet.start()
+        device_manager = DeviceManager()
+        try:
+            device = fleet.devices_config()[0]
+            device_manager.add_device(device['name'], device['ip_address'], 'gamma')
+            # A PSU too small for any point: every admission times out
+            device_manager.set_device_configs([dict(device, psu={'shared_psu_id': 'rack'})])
+            device_manager.set_shared_psus([{'id': 'rack', 'name': 'Rack', 'safe_watts': 1}])
+            config = BenchmarkConfig(
+                strategy=SearchStrategy.LINEAR,
+                voltage_start=1200, voltage_stop=1300, voltage_step=50,
+                frequency_start=500, frequency_stop=600, frequency_step=50,
+                power_wait_timeout=30,
+            )
+            engine = BenchmarkEngine(
+                config, SafetyLimits(), device_manager, tmp_path,
+                clock=clock, power_budget=PowerBudget(device_manager, clock=clock)
+            )
+            return await engine.run_benchmark(device['name'])
+        finally:
+            await device_manager.cleanup_all()
+            await fleet.stop()
+
+    session = asyncio.run(run())
+
+    assert session.status == 'completed'
+    assert session.results == []
+    assert session.stop_reason.startswith('No PSU headroom')
+    strategy, = strategies
+    assert strategy.results == []
+    assert strategy.unstable_points == set()
+    assert strategy.tested_combinations == set()
+
+
+def test_newer_deferred_change_supersedes_older():
+    applied = []
+
+    def apply_at(voltage, frequency):
+        async def apply():
+            applied.append((voltage, frequency))
+            return True
+        return apply
+
+    async def run():
+        clock = VirtualClock()
+        device_manager = DeviceManager()
+        device_manager.set_device_configs([{'name': 'miner', 'psu': {'shared_psu_id': 'rack'}}])
+        device_manager.set_shared_psus([{'id': 'rack', 'name': 'Rack', 'safe_watts': 1}])
+        budget = PowerBudget(device_manager, clock=clock)
+
+        older = asyncio.ensure_future(budget.run_when_admitted('miner', 1200, 600, apply_at(1200, 600)))
+        await clock.sleep(5)
+        assert budget.supersede('miner') == {'voltage': 1200, 'frequency': 600}
+        newer = asyncio.ensure_future(budget.run_when_admitted('miner', 1150, 550, apply_at(1150, 550)))
+        await clock.sleep(5)
+        device_manager.shared_psus['rack']['safe_watts'] = 1000
+        try:
+            return await asyncio.gather(older, newer)
+        finally:
+            await device_manager.cleanup_all()
+
+    assert asyncio.run(run()) == [None, True]
+    assert applied == [(1150, 550)]
@@ -0,0 +1,44 @@
+"""Raw sample files"""
+import numpy as np
+import pytest
+
+from sample_store import HEADER_SIZE, SAMPLE_DTYPE, SampleReader, SampleWriter, samples_path
+
+
+def write(path, test_index, count, buffer_size=4):
+    writer = SampleWriter(path, buffer_size=buffer_size)
+    for i in range(count):
+        writer.append(test_index, timestamp=100.0 + i, elapsed=float(i), voltage=1200, frequency=500,
+                      hashrate=1000.0 + i, temperature=60.0, power=20.0)
+    writer.close()
+
+
+def test_round_trip_across_buffer_flushes(tmp_path):
+    path = samples_path(tmp_path, 's1')
+    write(path, 0, 5)
+    write(path, 1, 3)
+
+    with SampleReader(path) as reader:
+        assert len(reader) == 8
+        assert reader.test_indices() == [0, 1]
+        np.testing.assert_array_equal(reader.column('hashrate', 1), [1000.0, 1001.0, 1002.0])
+        assert reader.to_dict(0)['elapsed'] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_torn_tail_is_ignored_then_trimmed(tmp_path):
+    path = samples_path(tmp_path, 's1')
+    write(path, 0, 2)
+    with open(path, 'ab') as f:
+        f.write(b'\x00' * (SAMPLE_DTYPE.itemsize // 2))
+
+    assert len(SampleReader(path)) == 2
+    write(path, 1, 1)
+    assert path.stat().st_size == HEADER_SIZE + 3 * SAMPLE_DTYPE.itemsize
+    assert SampleReader(path).test_indices() == [0, 1]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'samples_x.bin'
+    path.write_bytes(b'not a sample file at all, really' * 2)
+    with pytest.raises(ValueError):
+        SampleReader(path)
@@ -0,0 +1,74 @@
+"""Session summaries in the SQLite index"""
+import json
+
+from session_index import SessionIndex
+
+
+def write_session(session_dir, session_id, start_time, device='gamma-1', status='completed'):
+    path = session_dir / f"session_{session_id}.json"
+    path.write_text(json.dumps({
+        'session_id': session_id,
+        'start_time': start_time,
+        'status': status,
+        'device_configs': [{'name': device}],
+        'results': [{}, {}],
+    }))
+    return path
+
+
+def ids(sessions):
+    return [s['id'] for s in sessions]
+
+
+def test_sync_indexes_new_changed_and_removed_files(tmp_path):
+    index = SessionIndex(tmp_path)
+    write_session(tmp_path, 'a', '2025-01-30T09:00:00')
+    write_session(tmp_path, 'b', '2025-01-31T09:00:00')
+    assert index.sync() == (2, 0)
+    assert index.sync() == (0, 0)
+
+    write_session(tmp_path, 'b', '2025-01-31T09:00:00', status='failed')
+    (tmp_path / 'session_a.json').unlink()
+    assert index.sync() == (1, 1)
+    sessions, total = index.list()
+    assert total == 1
+    assert sessions[0]['status'] == 'failed'
+    assert sessions[0]['tests'] == 2
+
+
+def test_date_only_until_includes_that_whole_day(tmp_path):
+    index = SessionIndex(tmp_path)
+    write_session(tmp_path, 'before', '2025-01-30T23:59:59')
+    write_session(tmp_path, 'morning', '2025-01-31T00:00:00')
+    write_session(tmp_path, 'evening', '2025-01-31T23:59:59.500000')
+    write_session(tmp_path, 'after', '2025-02-01T00:00:00')
+    index.sync()
+
+    sessions, total = index.list(until='2025-01-31', descending=False)
+    assert ids(sessions) == ['before', 'morning', 'evening']
+    assert total == 3
+
+    sessions, _ = index.list(since='2025-01-31', until='2025-01-31', descending=False)
+    assert ids(sessions) == ['morning', 'evening']
+
+
+def test_timestamp_until_is_inclusive(tmp_path):
+    index = SessionIndex(tmp_path)
+    write_session(tmp_path, 'morning', '2025-01-31T08:00:00')
+    write_session(tmp_path, 'evening', '2025-01-31T20:00:00')
+    index.sync()
+
+    sessions, _ = index.list(until='2025-01-31T08:00:00')
+    assert ids(sessions) == ['morning']
+
+
+def test_filters_and_paging(tmp_path):
+    index = SessionIndex(tmp_path)
+    for day in range(1, 6):
+        write_session(tmp_path, f"g{day}", f"2025-03-0{day}T12:00:00", device='gamma-1')
+    write_session(tmp_path, 'other', '2025-03-03T12:00:00', device='supra-1')
+    index.sync()
+
+    sessions, total = index.list(device='gamma-1', limit=2, offset=1)
+    assert total == 5
+    assert ids(sessions) == ['g4', 'g3']
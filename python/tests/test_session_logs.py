@@ -0,0 +1,44 @@
+"""Indexed session log files"""
+from session_logs import SessionLogWriter, build_log_file, read_logs
+
+
+def entries(count):
+    return [{'type': 'info' if i % 2 else 'warning', 'message': f"line {i}"} for i in range(1, count + 1)]
+
+
+def test_pages_follow_sequence_numbers(tmp_path):
+    build_log_file(tmp_path, 's1', entries(5))
+
+    page = read_logs(tmp_path, 's1', after=0, limit=2)
+    assert [e['seq'] for e in page['logs']] == [1, 2]
+    assert page['next'] == 2 and page['total'] == 5 and page['has_more']
+
+    page = read_logs(tmp_path, 's1', after=page['next'], limit=10)
+    assert [e['message'] for e in page['logs']] == ['line 3', 'line 4', 'line 5']
+    assert not page['has_more']
+
+
+def test_type_filter_still_fills_the_page(tmp_path):
+    build_log_file(tmp_path, 's1', entries(6))
+
+    page = read_logs(tmp_path, 's1', limit=2, types=['info'])
+    assert [e['seq'] for e in page['logs']] == [1, 3]
+    assert page['next'] == 3
+
+
+def test_reopen_keeps_a_matching_file_and_appends(tmp_path):
+    logs = entries(3)
+    build_log_file(tmp_path, 's1', logs)
+
+    writer = SessionLogWriter(tmp_path, 's1')
+    writer.open(logs)
+    writer.append({'type': 'info', 'message': 'resumed'})
+    writer.close()
+
+    page = read_logs(tmp_path, 's1')
+    assert page['total'] == 4
+    assert page['logs'][-1] == {'type': 'info', 'message': 'resumed', 'seq': 4}
+
+
+def test_missing_log_file(tmp_path):
+    assert read_logs(tmp_path, 'nope') is None
@@ -0,0 +1,34 @@
+"""Equilibrium detection on synthetic readings"""
+import math
+import random
+
+from settle_detector import SettleDetector
+
+
+def feed(detector, start, stop, interval=2.0, noise=0.05, temp=lambda t: 60.0, seed=1):
+    rng = random.Random(seed)
+    t = start
+    while t <= stop:
+        detector.push(t, 1000.0 * (1 + rng.gauss(0, noise)), temp(t) + rng.gauss(0, 0.2),
+                      20.0 * (1 + rng.gauss(0, noise)))
+        t += interval
+
+
+def test_window_is_sized_in_seconds():
+    assert SettleDetector(window=60, interval=2).size == 31
+    assert SettleDetector(window=60, interval=5).size == 13
+
+
+def test_noisy_flat_readings_settle_once_the_window_fills():
+    detector = SettleDetector(window=60, interval=2)
+    feed(detector, 0, 50)
+    assert not detector.settled
+    feed(detector, 52, 60)
+    assert detector.settled
+
+
+def test_warming_chip_is_not_settled():
+    # 10°C first-order rise with a 20s time constant, still ~1.5°C/min at 60s
+    detector = SettleDetector(window=60, interval=2)
+    feed(detector, 0, 60, temp=lambda t: 60.0 - 10.0 * math.exp(-t / 20.0))
+    assert not detector.settled
@@ -32,7 +32,7 @@ import time
 __version__ = "2.1.0"
 
 from config import BenchmarkConfig, SafetyLimits, PRESETS, get_device_profile, OptimizationGoal
-from device_manager import DeviceManager
+from device_manager import get_device_manager
 from benchmark_engine import BenchmarkEngine
 from licensing import get_licensing
 from auth_decorator import require_patreon_auth
@@ -49,7 +49,7 @@ CORS(app)
 # Global state
 config_dir = Path.home() / ".bitaxe-benchmark"
 sessions_dir = config_dir / "sessions"
-device_manager = DeviceManager()
+device_manager = get_device_manager()
 current_benchmark: Optional[Thread] = None
 current_engine = None  # Reference to current benchmark engine
 current_session_id: Optional[str] = None
@@ -119,6 +119,15 @@ def load_benchmark_state() -> None:
         logger.warning(f"Could not load benchmark state: {e}")
 
 
+def close_loop(loop):
+    """Close the device pool's session for a per-request event loop, then the loop"""
+    try:
+        loop.run_until_complete(device_manager.pool.close())
+    except Exception as e:
+        logger.error(f"Error closing connection pool: {e}")
+    loop.close()
+
+
 def _numeric(val, default=0):
     try:
         n = float(val)
@@ -416,7 +425,7 @@ def apply_profile_internal(device_name: str, profile_name: str):
         if not success or not fan_success:
             raise RuntimeError('Failed to apply profile settings')
     finally:
-        loop.close()
+        close_loop(loop)
 
 
 def build_benchmark_config_from_request(data: dict, preset_obj=None):
@@ -592,7 +601,7 @@ def run_single_benchmark(device_name: str, cfg: BenchmarkConfig, safety: SafetyL
         persist_session_mode(session.session_id, run_mode or 'benchmark')
         return session
     finally:
-        loop.close()
+        close_loop(loop)
 
 
 def run_auto_tune_sequence(device_name: str, data: dict):
@@ -1337,7 +1346,7 @@ def get_psu_devices(psu_id):
                     if info:
                         power = info.power
                 finally:
-                    loop.close()
+                    close_loop(loop)
             
             psu_devices.append({
                 'name': device_name,
@@ -1401,7 +1410,7 @@ def set_fan_speed(device_name):
         logger.error(f"Error setting fan mode: {e}")
         success = False
     finally:
-        loop.close()
+        close_loop(loop)
     
     if success:
         return jsonify({'status': 'ok', 'auto': auto_fan, 'target_temp': target_temp})
@@ -1545,7 +1554,7 @@ def apply_profile(device_name, profile_name):
         logger.error(f"Error applying profile: {e}")
         success = False
     finally:
-        loop.close()
+        close_loop(loop)
     
     if success:
         return jsonify({
@@ -1594,7 +1603,7 @@ def apply_device_settings(device_name):
         logger.error(f"Error applying settings: {e}")
         return jsonify({'error': str(e)}), 500
     finally:
-        loop.close()
+        close_loop(loop)
     
     if success:
         return jsonify({
@@ -1624,7 +1633,7 @@ def restart_device_route(device_name):
         logger.error(f"Error restarting device: {e}")
         return jsonify({'error': str(e)}), 500
     finally:
-        loop.close()
+        close_loop(loop)
     
     if success:
         return jsonify({
@@ -1656,7 +1665,7 @@ def save_custom_profile(device_name):
         logger.error(f"Error getting device info: {e}")
         info = None
     finally:
-        loop.close()
+        close_loop(loop)
     
     if not info:
         return jsonify({'error': 'Could not get device info'}), 500
@@ -15,7 +15,7 @@ Features:
 - Pool management (AxePool)
 - Real-time monitoring and logging
 """
-from flask import Flask, render_template, jsonify, request, send_file, redirect, session, send_from_directory
+from flask import Flask, render_template, jsonify, request, send_file, redirect, session, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 from presets import PRESETS, get_preset_by_id, DEFAULT_PRESET_ID
 import secrets
@@ -24,15 +24,26 @@ import json
 import logging
 from pathlib import Path
 from threading import Thread
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from datetime import datetime
 import time
 
 __version__ = "2.1.0"
 
 from config import BenchmarkConfig, SafetyLimits, PRESETS, get_device_profile, OptimizationGoal
-from device_manager import DeviceManager
+from device_manager import get_device_manager
+from async_runner import get_runner, run_async
+from telemetry import get_telemetry
+from discovery import get_discovery
+from sample_store import SampleReader, samples_path
+from status_store import BenchmarkStatusStore
+from measurement_cache import get_measurement_cache
+from session_index import SORT_COLUMNS as SESSION_SORT_COLUMNS, get_session_index
+from session_logs import build_log_file, index_path as log_index_path, log_path, read_logs
+from session_journal import journal_path, list_checkpoints, load_checkpoint, load_session_data, resume_state_path
 from benchmark_engine import BenchmarkEngine
+from fleet_runner import FleetRunner
+from power_budget import get_power_budget
 from licensing import get_licensing
 from auth_decorator import require_patreon_auth
 from tier_restrictions import TierRestrictions, require_feature
@@ -48,20 +59,27 @@ CORS(app)
 # Global state
 config_dir = Path.home() / ".bitaxe-benchmark"
 sessions_dir = config_dir / "sessions"
-device_manager = DeviceManager()
+device_manager = get_device_manager()
+telemetry = get_telemetry()  # Cached live readings for UI polling
+power_budget = get_power_budget()  # Keeps shared PSUs under safe_watts (shared with AxeShed)
 current_benchmark: Optional[Thread] = None
 current_engine = None  # Reference to current benchmark engine
 current_session_id: Optional[str] = None
 auto_tune_thread: Optional[Thread] = None
 auto_tune_running = False
 auto_tune_stop_requested = False
+fleet_runner: Optional[FleetRunner] = None  # Current multi-device benchmark, if any
+fleet_thread: Optional[Thread] = None
+RESTART_TIMEOUT = 120  # Device restart includes waiting for it to come back online
 AUTO_TUNE_STEPS = [
     {'goal': 'max_hashrate', 'profile_name': 'MAX_AUTO', 'quiet_target': None},
     {'goal': 'balanced', 'profile_name': 'BALANCED_AUTO', 'quiet_target': None},
     {'goal': 'efficient', 'profile_name': 'EFFICIENT_AUTO', 'quiet_target': None},
     {'goal': 'quiet', 'profile_name': 'QUIET_AUTO', 'quiet_target': 60},
 ]
-benchmark_status = {
+benchmark_state_file = config_dir / "benchmark_state.json"
+# Shared with the benchmark thread - a locked store, not a plain dict
+benchmark_status = BenchmarkStatusStore({
     'running': False,
     'progress': 0,
     'current_test': '',
@@ -79,14 +97,11 @@ benchmark_status = {
     'config': None,      # Last benchmark config used
     'safety_limits': None,  # Safety limits used for this run
     'seen_combos': [],   # Lightweight tracking of unique V/F combos tested
-}
+}, benchmark_state_file)
 
 
 
 
-config_dir = Path.home() / ".bitaxe-benchmark"
-benchmark_state_file = config_dir / "benchmark_state.json"
-
 def _numeric(val, default=0):
     try:
         n = float(val)
@@ -157,8 +172,8 @@ def record_status_message(message: str, level: str = 'info'):
         'message': message,
         'type': level
     }
-    benchmark_status.setdefault('session_logs', []).append(entry)
-    benchmark_status.setdefault('message_queue', []).append({'phase': level, 'message': message})
+    benchmark_status.append_log(entry)
+    benchmark_status.append_message(level, message)
     save_benchmark_state()
 
 def reset_progress_state():
@@ -168,6 +183,25 @@ def reset_progress_state():
     benchmark_status['progress'] = 0
     benchmark_status['seen_combos'] = []
 
+SETTLE_SETTINGS = {
+    'settle_poll_interval': int,
+    'settle_window': int,
+    'settle_max_time': int,
+    'settle_temp_slope': float,
+    'settle_hashrate_drift': float,
+    'settle_power_drift': float,
+}
+
+
+def apply_settle_settings(cfg: BenchmarkConfig, data: dict):
+    """Apply settle-detection fields from a request (warmup_time stays the minimum wait)"""
+    if 'settle_detection' in data:
+        cfg.settle_detection = bool(data['settle_detection'])
+    for key, cast in SETTLE_SETTINGS.items():
+        if data.get(key) is not None:
+            setattr(cfg, key, cast(data[key]))
+
+
 def build_benchmark_config_from_request(data: dict, preset_obj=None):
     """Build BenchmarkConfig and SafetyLimits from request payload."""
     cfg = BenchmarkConfig()
@@ -197,6 +231,7 @@ def build_benchmark_config_from_request(data: dict, preset_obj=None):
     set_if('cooldown', 'cooldown_time')
     set_if('cooldown_time', 'cooldown_time')
     set_if('cycles_per_test', 'cycles_per_test')
+    apply_settle_settings(cfg, data)
     if data.get('strategy'):
         from config import SearchStrategy
         cfg.strategy = SearchStrategy(data['strategy'])
@@ -214,6 +249,12 @@ def build_benchmark_config_from_request(data: dict, preset_obj=None):
         cfg.export_csv = bool(data['export_csv'])
     if data.get('target_error') is not None:
         cfg.target_error = float(data['target_error'])
+    if 'reuse_measurements' in data:
+        cfg.reuse_measurements = bool(data['reuse_measurements'])
+    if data.get('measurement_max_age') is not None:
+        cfg.measurement_max_age = int(data['measurement_max_age'])
+    if data.get('ambient_temp') is not None:
+        cfg.ambient_temp = float(data['ambient_temp'])
     if data.get('optimization_goal'):
         try:
             cfg.optimization_goal = OptimizationGoal(data['optimization_goal'])
@@ -352,6 +393,28 @@ def select_goal_best(results: list, goal: str):
         return (r.get('avg_hashrate', 0) / p) * (r.get('stability_score', 80) or 80)
     return max(results, key=score)
 
+def apply_vf_within_budget(device_name: str, voltage: int, frequency: int, apply) -> Tuple[Optional[bool], Optional[Dict]]:
+    """
+    Run `apply()` (a coroutine function that sets V/F) now if the device's
+    shared PSU has headroom for it, otherwise queue it on the shared loop to
+    run once it does. Either way it replaces any change still queued for the
+    device. Returns (whether it applied, or None if it was deferred; the
+    replaced queued change's voltage/frequency, if any).
+    """
+    replaced = power_budget.supersede(device_name)
+    if not power_budget.try_admit(device_name, voltage, frequency):
+        logger.info(f"{device_name}: {voltage}mV @ {frequency}MHz deferred until its shared PSU has headroom")
+        get_runner().submit(power_budget.run_when_admitted(device_name, voltage, frequency, apply))
+        return None, replaced
+    try:
+        success = run_async(apply())
+    except Exception:
+        power_budget.release(device_name)
+        raise
+    if not success:
+        power_budget.release(device_name)
+    return success, replaced
+
 def apply_profile_internal(device_name: str, profile_name: str):
     """Apply profile without HTTP context; reuse apply_profile logic."""
     device = device_manager.get_device(device_name)
@@ -370,46 +433,32 @@ def apply_profile_internal(device_name: str, profile_name: str):
     fan_target = profile.get('fan_target')
     if not voltage or not frequency:
         raise RuntimeError('Invalid profile data')
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        success = loop.run_until_complete(device.set_voltage_frequency(voltage, frequency))
-        fan_success = True
-        if fan_target and success:
-            fan_success = loop.run_until_complete(device.set_fan_mode(auto_fan=True, target_temp=fan_target))
-            if not fan_success:
+    
+    async def apply() -> bool:
+        applied = await device.set_voltage_frequency(voltage, frequency)
+        if fan_target and applied:
+            if not await device.set_fan_mode(auto_fan=True, target_temp=fan_target):
                 logger.warning(f"Failed to set fan target for {device_name}, but V/F applied successfully")
-        if not success:
-            raise RuntimeError('Failed to apply profile')
-    finally:
-        loop.close()
+        return applied
+    
+    success, _ = apply_vf_within_budget(device_name, voltage, frequency, apply)
+    if success is False:
+        raise RuntimeError('Failed to apply profile')
 
 def save_benchmark_state() -> None:
-    """Persist benchmark_status to disk so the UI can restore after refresh/restart."""
-    try:
-        config_dir.mkdir(parents=True, exist_ok=True)
-        # Use a shallow copy to avoid surprises, everything inside should be JSON-serialisable
-        state = dict(benchmark_status)
-        with open(benchmark_state_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, default=str)
-    except Exception as e:
-        logger.warning(f"Could not save benchmark state: {e}")
+    """Persist benchmark_status to disk so the UI can restore after refresh/restart (debounced)."""
+    benchmark_status.save()
 
 def load_benchmark_state() -> None:
     """Load benchmark_status from disk if present."""
-    if not benchmark_state_file.exists():
-        return
-    try:
-        with open(benchmark_state_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            benchmark_status.update(data)
-    except Exception as e:
-        logger.warning(f"Could not load benchmark state: {e}")
+    benchmark_status.load()
 
 # Attempt to load any previous state at startup
 load_benchmark_state()
 
+# Bring the session index up to date in the background (only changed files are read)
+Thread(target=get_session_index(sessions_dir).sync, name='session-index-sync', daemon=True).start()
+
 def load_devices():
     """Load device configurations"""
     devices_file = config_dir / "devices.json"
@@ -423,6 +472,8 @@ def load_devices():
                 dev_data['ip_address'],
                 dev_data.get('model', 'Unknown')
             )
+        device_manager.set_device_configs(devices_data)
+    load_shared_psus()
 
 
 # Legacy index route removed in favor of static file serving
@@ -1136,28 +1187,21 @@ def get_psu_devices(psu_id):
     psu_devices = []
     total_power = 0
     
-    for d in devices_data:
-        if d.get('psu', {}).get('shared_psu_id') == psu_id:
-            device_name = d.get('name')
-            device = device_manager.get_device(device_name)
-            
-            power = 0
-            if device:
-                # Get live power data
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    info = loop.run_until_complete(device.get_system_info())
-                    if info:
-                        power = info.power
-                finally:
-                    loop.close()
-            
-            psu_devices.append({
-                'name': device_name,
-                'power': power
-            })
-            total_power += power
+    names = [d.get('name') for d in devices_data if d.get('psu', {}).get('shared_psu_id') == psu_id]
+    # Live power data from the telemetry cache (stale devices refreshed together)
+    infos = telemetry.get_infos([n for n in names if device_manager.get_device(n)])
+    
+    for device_name in names:
+        power = 0
+        info = infos.get(device_name)
+        if info:
+            power = info.power
+        
+        psu_devices.append({
+            'name': device_name,
+            'power': power
+        })
+        total_power += power
     
     return jsonify({
         'psu_id': psu_id,
@@ -1166,6 +1210,15 @@ def get_psu_devices(psu_id):
     })
 
 
+@app.route('/api/psus/budget')
+@require_patreon_auth
+def get_psu_budget():
+    """Counted load, reservations and deferred V/F changes per shared PSU"""
+    load_devices_with_psu()  # keeps device_manager's PSU assignments current
+    load_shared_psus()
+    return jsonify(power_budget.status())
+
+
 @app.route('/api/models', methods=['GET'])
 def get_models():
     """Get available device models and their configurations"""
@@ -1183,17 +1236,12 @@ def detect_devices():
     if not ip:
         return jsonify({'error': 'IP address required'}), 400
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
     try:
         from device_manager import BitaxeDevice
-        info = loop.run_until_complete(BitaxeDevice.detect_device_info(ip))
+        info = run_async(BitaxeDevice.detect_device_info(ip, pool=device_manager.pool))
     except Exception as e:
         logger.error(f"Error detecting device: {e}")
         info = None
-    finally:
-        loop.close()
     
     if not info:
         return jsonify({'error': 'Could not connect to device'}), 404
@@ -1201,6 +1249,138 @@ def detect_devices():
     return jsonify(info)
 
 
+def register_discovered_devices(found, ips=None):
+    """Add discovered devices to devices.json, respecting the tier device limit"""
+    licensing = get_licensing()
+    device_limit = licensing.get_status().get('device_limit', 1)
+    
+    devices_data = load_devices_with_psu()
+    known_ips = {d.get('ip_address') for d in devices_data}
+    known_names = {d.get('name') for d in devices_data}
+    added, skipped = [], []
+    
+    for dev in found:
+        ip = dev.get('ip')
+        if ips is not None and ip not in ips:
+            continue
+        if ip in known_ips:
+            skipped.append({'ip': ip, 'reason': 'already registered'})
+            continue
+        if len(devices_data) >= device_limit:
+            skipped.append({'ip': ip, 'reason': f'device limit reached ({device_limit} devices)'})
+            continue
+        
+        # Hostnames can collide across a fleet - suffix with the last octet if so
+        name = dev.get('suggested_name') or f"Bitaxe-{ip.split('.')[-1]}"
+        if name in known_names:
+            name = f"{name}-{ip.split('.')[-1]}"
+        
+        devices_data.append({
+            'name': name,
+            'ip_address': ip,
+            'model': dev.get('model', 'Unknown'),
+            'psu': {
+                'type': 'standalone',
+                'capacity_watts': 25,
+                'safe_watts': 20,
+                'warning_watts': 17.5
+            }
+        })
+        device_manager.add_device(name, ip, dev.get('model', 'Unknown'))
+        known_ips.add(ip)
+        known_names.add(name)
+        added.append({'name': name, 'ip': ip, 'model': dev.get('model', 'Unknown')})
+    
+    if added:
+        save_devices_with_psu(devices_data)
+        device_manager.set_device_configs(devices_data)
+    logger.info(f"Registered {len(added)} discovered device(s), skipped {len(skipped)}")
+    return {'added': added, 'skipped': skipped}
+
+
+@app.route('/api/discovery/scan', methods=['POST'])
+@require_patreon_auth
+def start_discovery():
+    """Start a subnet sweep for Bitaxe devices"""
+    data = request.json or {}
+    cidrs = data.get('cidrs') or ([data['cidr']] if data.get('cidr') else [])
+    if isinstance(cidrs, str):
+        cidrs = [c for c in cidrs.replace(',', ' ').split() if c]
+    
+    on_complete = None
+    if data.get('register'):
+        on_complete = lambda job: register_discovered_devices(job.found)
+    
+    try:
+        job = get_discovery().start(
+            cidrs,
+            concurrency=data.get('concurrency', 64),
+            timeout=data.get('timeout', 2.0),
+            on_complete=on_complete
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'status': 'started', 'job_id': job.id, 'total': job.total}), 202
+
+
+@app.route('/api/discovery/<job_id>', methods=['GET'])
+@require_patreon_auth
+def get_discovery_job(job_id):
+    """Get progress and results of a discovery job"""
+    job = get_discovery().get(job_id)
+    if not job:
+        return jsonify({'error': 'Discovery job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/discovery/<job_id>/stream')
+@require_patreon_auth
+def stream_discovery_job(job_id):
+    """Server-sent events with discovery progress until the job finishes"""
+    job = get_discovery().get(job_id)
+    if not job:
+        return jsonify({'error': 'Discovery job not found'}), 404
+    
+    def generate():
+        sent = 0
+        while True:
+            events = job.wait_for_events(sent)
+            if not events:
+                yield ": keepalive\n\n"
+            for event in events:
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            sent += len(events)
+            if job.finished and sent >= len(job.events):
+                break
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/discovery/<job_id>/cancel', methods=['POST'])
+@require_patreon_auth
+def cancel_discovery_job(job_id):
+    """Cancel a running discovery job"""
+    if not get_discovery().cancel(job_id):
+        return jsonify({'error': 'Discovery job not found or already finished'}), 404
+    return jsonify({'status': 'cancelling'})
+
+
+@app.route('/api/discovery/<job_id>/register', methods=['POST'])
+@require_patreon_auth
+def register_discovery_job(job_id):
+    """Bulk-register devices found by a discovery job (optionally only some IPs)"""
+    job = get_discovery().get(job_id)
+    if not job:
+        return jsonify({'error': 'Discovery job not found'}), 404
+    
+    data = request.json or {}
+    ips = data.get('ips')
+    result = register_discovered_devices(list(job.found), set(ips) if ips else None)
+    return jsonify(result)
+
+
 @app.route('/api/devices/<device_name>/fan', methods=['POST'])
 @require_patreon_auth
 def set_fan_speed(device_name):
@@ -1213,16 +1393,11 @@ def set_fan_speed(device_name):
     auto_fan = data.get('auto', True)
     target_temp = data.get('target_temp')
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
     try:
-        success = loop.run_until_complete(device.set_fan_mode(auto_fan, target_temp))
+        success = run_async(device.set_fan_mode(auto_fan, target_temp))
     except Exception as e:
         logger.error(f"Error setting fan mode: {e}")
         success = False
-    finally:
-        loop.close()
     
     if success:
         return jsonify({'status': 'ok', 'auto': auto_fan, 'target_temp': target_temp})
@@ -1230,6 +1405,16 @@ def set_fan_speed(device_name):
         return jsonify({'error': 'Failed to set fan mode'}), 500
 
 
+@app.route('/api/devices/<device_name>/measurements', methods=['DELETE'])
+@require_patreon_auth
+def clear_device_measurements(device_name):
+    """Forget a device's cached measurements (e.g. after a cooling change) so every point is re-tested"""
+    cache = get_measurement_cache(sessions_dir, device_name)
+    cleared = len(cache)
+    cache.clear()
+    return jsonify({'status': 'ok', 'cleared': cleared})
+
+
 # Profile management
 profiles_dir = config_dir / "profiles"
 
@@ -1308,25 +1493,35 @@ def apply_profile(device_name, profile_name):
     if not voltage or not frequency:
         return jsonify({'error': 'Invalid profile data'}), 400
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    fan_result = {}
     
-    try:
-        # Apply voltage and frequency
-        success = loop.run_until_complete(device.set_voltage_frequency(voltage, frequency))
-        
-        # Apply fan target if specified
-        fan_success = True
-        if fan_target and success:
-            fan_success = loop.run_until_complete(device.set_fan_mode(auto_fan=True, target_temp=fan_target))
-            if not fan_success:
+    async def apply() -> bool:
+        # Apply voltage and frequency, then the fan target if specified
+        applied = await device.set_voltage_frequency(voltage, frequency)
+        if fan_target and applied:
+            fan_result['ok'] = await device.set_fan_mode(auto_fan=True, target_temp=fan_target)
+            if not fan_result['ok']:
                 logger.warning(f"Failed to set fan target for {device_name}, but V/F applied successfully")
+        return applied
+    
+    replaced = None
+    try:
+        success, replaced = apply_vf_within_budget(device_name, voltage, frequency, apply)
     except Exception as e:
         logger.error(f"Error applying profile: {e}")
         success = False
-    finally:
-        loop.close()
+    fan_success = fan_result.get('ok', True)
     
+    if success is None:
+        return jsonify({
+            'status': 'deferred',
+            'device': device_name,
+            'profile': profile_name,
+            'voltage': voltage,
+            'frequency': frequency,
+            'replaced': replaced,
+            'message': 'Waiting for headroom on the shared PSU'
+        }), 202
     if success:
         return jsonify({
             'status': 'applied',
@@ -1335,7 +1530,8 @@ def apply_profile(device_name, profile_name):
             'voltage': voltage,
             'frequency': frequency,
             'fan_target': fan_target,
-            'fan_applied': fan_success if fan_target else None
+            'fan_applied': fan_success if fan_target else None,
+            'replaced': replaced
         })
     else:
         return jsonify({'error': 'Failed to apply profile'}), 500
@@ -1365,23 +1561,29 @@ def apply_device_settings(device_name):
     except (ValueError, TypeError):
         return jsonify({'error': 'Invalid voltage or frequency value'}), 400
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
     try:
-        success = loop.run_until_complete(device.set_voltage_frequency(voltage, frequency))
+        success, replaced = apply_vf_within_budget(device_name, voltage, frequency,
+                                                   lambda: device.set_voltage_frequency(voltage, frequency))
     except Exception as e:
         logger.error(f"Error applying settings: {e}")
         return jsonify({'error': str(e)}), 500
-    finally:
-        loop.close()
     
+    if success is None:
+        return jsonify({
+            'status': 'deferred',
+            'device': device_name,
+            'voltage': voltage,
+            'frequency': frequency,
+            'replaced': replaced,
+            'message': 'Waiting for headroom on the shared PSU'
+        }), 202
     if success:
         return jsonify({
             'status': 'applied',
             'device': device_name,
             'voltage': voltage,
-            'frequency': frequency
+            'frequency': frequency,
+            'replaced': replaced
         })
     else:
         return jsonify({'error': 'Failed to apply settings'}), 500
@@ -1395,16 +1597,12 @@ def restart_device_route(device_name):
     if not device:
         return jsonify({'error': 'Device not found'}), 404
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
     try:
-        success = loop.run_until_complete(device.restart())
+        # restart() waits for the device to come back online
+        success = run_async(device.restart(), timeout=RESTART_TIMEOUT)
     except Exception as e:
         logger.error(f"Error restarting device: {e}")
         return jsonify({'error': str(e)}), 500
-    finally:
-        loop.close()
     
     if success:
         return jsonify({
@@ -1427,16 +1625,11 @@ def save_custom_profile(device_name):
     profile_file = profiles_dir / f"{device_name}.json"
     
     # Get current device settings
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
     try:
-        info = loop.run_until_complete(device.get_system_info())
+        info = run_async(device.get_system_info())
     except Exception as e:
         logger.error(f"Error getting device info: {e}")
         info = None
-    finally:
-        loop.close()
     
     if not info:
         return jsonify({'error': 'Could not get device info'}), 500
@@ -1613,49 +1806,95 @@ def get_device_status(device_name):
     if not device:
         return jsonify({'error': 'Device not found'}), 404
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
     try:
-        # Create a fresh session for this request - safe to run alongside benchmark
-        import aiohttp
-        
-        async def get_info():
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                try:
-                    async with session.get(f"http://{device.ip_address}/api/system/info") as resp:
-                        if resp.status != 200:
-                            return None
-                        data = await resp.json()
-                        return {
-                            'hashrate': float(data.get('hashRate', 0)),
-                            'temperature': float(data.get('temp', 0)),
-                            'vr_temp': float(data.get('vrTemp', 0)) if 'vrTemp' in data else 0,
-                            'power': float(data.get('power', 0)),
-                            'voltage': int(data.get('coreVoltage', 0)),
-                            'frequency': int(data.get('frequency', 0)),
-                            'input_voltage': float(data.get('voltage', 0)),
-                            'fan_speed': float(data.get('fanspeed', 0)),
-                            'error_percentage': float(data.get('errorPercentage', 0)),
-                            'best_diff': str(data.get('bestDiff', '0')),
-                            'best_session_diff': str(data.get('bestSessionDiff', '0')),
-                            'stratum_diff': float(data.get('poolDifficulty') or data.get('stratumDiff') or 0)
-                        }
-                except Exception as e:
-                    logger.error(f"{device_name}: Error in get_info: {e}")
-                    return None
-        
-        info = loop.run_until_complete(get_info())
+        # Served from the telemetry cache; only hits the device if the reading is stale
+        info = telemetry.get_info(device_name)
     except Exception as e:
         logger.error(f"{device_name}: Error getting system info: {e}")
         info = None
-    finally:
-        loop.close()
     
     if not info:
         return jsonify({'error': 'Failed to get device info'}), 500
     
-    return jsonify(info)
+    return jsonify({
+        'hashrate': info.hashrate,
+        'temperature': info.temperature,
+        'vr_temp': info.vr_temp or 0,
+        'power': info.power,
+        'voltage': info.voltage,
+        'frequency': info.frequency,
+        'input_voltage': info.input_voltage,
+        'fan_speed': info.fan_speed,
+        'error_percentage': info.error_percentage,
+        'best_diff': str(info.best_diff),
+        'best_session_diff': info.best_session_diff,
+        'stratum_diff': info.stratum_diff
+    })
+
+
+@app.route('/api/devices/health')
+@require_patreon_auth
+def get_devices_health():
+    """Circuit breaker state (reachability, failures, next probe) for every device"""
+    return jsonify(device_manager.get_health())
+
+
+@app.route('/api/fleet/status')
+@require_patreon_auth
+def get_fleet_status():
+    """Latest telemetry for every device (or ?names=a,b) in one response"""
+    names = []
+    for arg in request.args.getlist('names'):
+        names.extend(n.strip() for n in arg.split(',') if n.strip())
+    if not names:
+        names = device_manager.list_devices()
+    
+    # Look each device up once - it may be removed or re-synced while readings are fetched
+    found = {n: device_manager.get_device(n) for n in names}
+    known = [n for n, device in found.items() if device]
+    unknown = [n for n, device in found.items() if not device]
+    
+    try:
+        max_age = float(request.args['max_age']) if 'max_age' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'max_age must be a number'}), 400
+    
+    # Fresh readings come from the cache, stale ones are refreshed in one concurrent batch
+    try:
+        infos = telemetry.get_infos(known, max_age=max_age, timeout=20)
+    except Exception as e:
+        logger.error(f"Error getting fleet status: {e}")
+        infos = {}
+    
+    devices = {}
+    for name in known:
+        info = infos.get(name)
+        reading = telemetry.get_reading(name)
+        entry = {
+            'online': info is not None,
+            'age': round(reading.age, 1) if reading else None,
+            'breaker': found[name].health()['state'],
+        }
+        if info is not None:
+            entry.update({
+                'hashrate': round(info.hashrate, 2),
+                'temperature': round(info.temperature, 1),
+                'vr_temp': round(info.vr_temp, 1) if info.vr_temp else 0,
+                'power': round(info.power, 2),
+                'voltage': info.voltage,
+                'frequency': info.frequency,
+                'fan_speed': info.fan_speed,
+                'error_percentage': round(info.error_percentage, 2),
+            })
+        devices[name] = entry
+    
+    return jsonify({
+        'timestamp': time.time(),
+        'online': sum(1 for d in devices.values() if d['online']),
+        'total': len(devices),
+        'devices': devices,
+        'unknown': unknown
+    })
 
 
 @app.route('/api/presets')
@@ -1714,14 +1953,26 @@ def get_device_profile_route(device_model):
 
 @app.route('/api/benchmark/start', methods=['POST'])
 @require_patreon_auth
-def start_benchmark():
-    """Start a benchmark"""
+def start_benchmark(resume_checkpoint=None):
+    """Start a benchmark (or continue one from a checkpoint, see resume_benchmark)"""
     global current_benchmark, current_session_id, benchmark_status, auto_tune_thread, auto_tune_stop_requested
     
     if benchmark_status['running']:
         return jsonify({'error': 'Benchmark already running'}), 400
+    if fleet_thread and fleet_thread.is_alive():
+        return jsonify({'error': 'Fleet benchmark running'}), 400
     
     data = request.json
+    resume_session_id = None
+    if resume_checkpoint:
+        saved = resume_checkpoint['session']
+        resume_session_id = saved['session_id']
+        # Recovery options may come with the request; everything else is the saved run's
+        data = {
+            **(data or {}),
+            'device': saved['device_configs'][0]['name'],
+            'mode': saved.get('mode') or 'benchmark',
+        }
     device_name = data.get('device')
     preset = data.get('preset')
     run_mode = data.get('mode', 'benchmark')
@@ -1819,6 +2070,17 @@ def start_benchmark():
         config.export_csv = bool(data['export_csv'])
     if data.get('target_error'):
         config.target_error = float(data['target_error'])
+    if 'adaptive_sampling' in data:
+        config.adaptive_sampling = bool(data['adaptive_sampling'])
+    if data.get('min_dwell_time'):
+        config.min_dwell_time = int(data['min_dwell_time'])
+    if data.get('hashrate_ci_target'):
+        config.hashrate_ci_target = float(data['hashrate_ci_target'])
+    if data.get('power_ci_target'):
+        config.power_ci_target = float(data['power_ci_target'])
+    if data.get('error_ci_target'):
+        config.error_ci_target = float(data['error_ci_target'])
+    apply_settle_settings(config, data)
     
     safety = SafetyLimits()
     
@@ -1831,6 +2093,9 @@ def start_benchmark():
         safety.max_power = float(data['max_power'])
     if data.get('max_vr_temp'):
         safety.max_vr_temp = float(data['max_vr_temp'])
+    if resume_checkpoint:
+        config = BenchmarkConfig.from_dict(dict(resume_checkpoint['session']['benchmark_config']))
+        safety = SafetyLimits(**resume_checkpoint['session']['safety_limits'])
     # Persist safety limits into benchmark_status for UI restore
     benchmark_status['safety_limits'] = {
         'max_chip_temp': safety.max_chip_temp,
@@ -1923,8 +2188,12 @@ def start_benchmark():
                 fine_tune_mode = data.get('fine_tune_mode', False)
                 expected_hashrate = data.get('expected_hashrate')
                 
-                # Initialize
-                loop.run_until_complete(device_manager.initialize_all())
+                # Initialize only the device being benchmarked
+                init = loop.run_until_complete(
+                    device_manager.initialize_all(names=[device_name], reuse_defaults=True)
+                )
+                if device_name in init and not init[device_name]:
+                    logger.warning(f"{device_name}: not confirmed online before benchmark ({init[device_name].error or 'offline'})")
                 
                 # Status callback with failure detection
                 def update_status(status_dict):
@@ -1938,16 +2207,10 @@ def start_benchmark():
                     # Track unique combos as a predictive hint
                     combo = parse_current_combo(status_dict)
                     if combo:
-                        seen = benchmark_status.get('seen_combos') or []
-                        if combo not in seen:
-                            seen.append(combo)
-                            # cap growth to avoid memory bloat
-                            if len(seen) > 5000:
-                                seen = seen[-5000:]
-                            benchmark_status['seen_combos'] = seen
+                        seen_count = benchmark_status.add_combo(combo)
                         # Use seen combos as a floor for tests_completed when engine doesn't increment
                         if not status_dict.get('tests_completed') and not status_dict.get('tests_complete'):
-                            tests_completed = max(tests_completed, len(benchmark_status['seen_combos']))
+                            tests_completed = max(tests_completed, seen_count)
 
                 if tests_total:
                     status_dict['tests_total'] = tests_total
@@ -1957,7 +2220,7 @@ def start_benchmark():
                     status_dict['tests_completed'] = tests_completed
                 # If running and we have a current test but zero completed, count at least one
                 if status_dict.get('running') and (status_dict.get('current_test') or status_dict.get('live_data')) and tests_completed == 0:
-                    tests_completed = max(1, len(benchmark_status.get('seen_combos') or []))
+                    tests_completed = max(1, benchmark_status.combo_count)
                     status_dict['tests_completed'] = tests_completed
 
                 if tests_total and tests_completed:
@@ -1972,17 +2235,14 @@ def start_benchmark():
                     
                     # Queue messages for console display
                     if status_dict.get('message'):
-                        benchmark_status['message_queue'].append({
-                            'phase': status_dict.get('phase', 'info'),
-                            'message': status_dict['message']
-                        })
+                        benchmark_status.append_message(status_dict.get('phase', 'info'), status_dict['message'])
                         # Also keep an in-memory session log stream for UI consumption
                         log_entry = {
                             'time': datetime.now().isoformat(),
                             'message': status_dict['message'],
                             'type': status_dict.get('phase', 'info')
                         }
-                        benchmark_status.setdefault('session_logs', []).append(log_entry)
+                        benchmark_status.append_log(log_entry)
                         # Also log to server-side session
                         if current_engine and current_engine.session:
                             log_type = status_dict.get('phase', 'info')
@@ -2000,7 +2260,8 @@ def start_benchmark():
                                 'frequency': ld['frequency']
                             }
                 
-                engine = BenchmarkEngine(current_config, safety, device_manager, sessions_dir, status_callback=update_status)
+                engine = BenchmarkEngine(current_config, safety, device_manager, sessions_dir, status_callback=update_status,
+                                         power_budget=power_budget)
                 
                 # Set expected hashrate for fine tune mode
                 if fine_tune_mode and expected_hashrate:
@@ -2008,7 +2269,10 @@ def start_benchmark():
                     logger.info(f"Fine tune mode: expecting ~{expected_hashrate:.1f} GH/s")
                 
                 current_engine = engine
-                session = loop.run_until_complete(engine.run_benchmark(device_name))
+                if resume_session_id and retry_count == 0:
+                    session = loop.run_until_complete(engine.resume_benchmark(resume_session_id))
+                else:
+                    session = loop.run_until_complete(engine.run_benchmark(device_name))
                 
                 # Success! Accumulate results and finish
                 if hasattr(session, 'results'):
@@ -2183,6 +2447,7 @@ def start_benchmark():
         # Final cleanup
         benchmark_status['running'] = False
         benchmark_status['failed_combos'] = failed_combos
+        benchmark_status.flush()
         
         try:
             loop.run_until_complete(device_manager.cleanup_all())
@@ -2196,22 +2461,41 @@ def start_benchmark():
     return jsonify({'status': 'started'})
 
 
-@app.route('/api/benchmark/status')
+@app.route('/api/benchmark/resume', methods=['POST'])
 @require_patreon_auth
-def get_benchmark_status():
-    """Get current benchmark status"""
-    status = dict(benchmark_status)  # Copy to avoid modifying global
+def resume_benchmark():
+    """Continue an interrupted benchmark from its last checkpoint"""
+    data = request.json or {}
+    session_id = data.get('session_id')
+    if not session_id:
+        return jsonify({'error': 'session_id required'}), 400
+    checkpoint = load_checkpoint(sessions_dir, session_id)
+    if not checkpoint:
+        return jsonify({'error': f'No resumable checkpoint for session {session_id}'}), 404
+    device_name = checkpoint['session']['device_configs'][0]['name']
+    if not device_manager.get_device(device_name):
+        return jsonify({'error': f'Device {device_name} not found'}), 404
+    return start_benchmark(resume_checkpoint=checkpoint)
+
+
+@app.route('/api/benchmark/resumable')
+@require_patreon_auth
+def list_resumable_benchmarks():
+    """Sessions with a checkpoint that can be resumed"""
+    return jsonify(list_checkpoints(sessions_dir))
+
 
-    # Derive tests_total/progress if backend hasn't populated them
+def derive_progress(status: dict, seen_combos: int) -> dict:
+    """Derive tests_total/tests_completed/progress if backend hasn't populated them"""
     cfg = status.get('config') or {}
     est_total = estimate_tests_total(cfg)
     tests_total = status.get('tests_total') or est_total
-    tests_completed = status.get('tests_completed') or status.get('tests_complete') or len(status.get('seen_combos') or []) or 0
+    tests_completed = status.get('tests_completed') or status.get('tests_complete') or seen_combos or 0
     if status.get('running') and tests_total:
         if tests_completed == 0:
-            tests_completed = max(1, len(status.get('seen_combos') or []), 1)
+            tests_completed = max(1, seen_combos, 1)
         if status.get('current_test') or status.get('live_data'):
-            tests_completed = max(tests_completed, len(status.get('seen_combos') or []), 1)
+            tests_completed = max(tests_completed, seen_combos, 1)
     if tests_total and tests_completed > tests_total:
         tests_completed = tests_total
     if status.get('running') and tests_total:
@@ -2223,16 +2507,24 @@ def get_benchmark_status():
         tests_completed = 0
     status['tests_total'] = tests_total or 0
     status['tests_completed'] = tests_completed
+    return status
+
+
+@app.route('/api/benchmark/status')
+@require_patreon_auth
+def get_benchmark_status():
+    """Get current benchmark status"""
+    status = benchmark_status.snapshot()  # Copy to avoid modifying global
+    derive_progress(status, benchmark_status.combo_count)
     # Persist clamped values back into global so subsequent polls keep the floor
-    benchmark_status['tests_total'] = status['tests_total']
-    benchmark_status['tests_completed'] = status['tests_completed']
+    for key in ('tests_total', 'tests_completed'):
+        if benchmark_status.get(key) != status[key]:
+            benchmark_status[key] = status[key]
 
     # Add session logs if we have an active session
     if current_engine and hasattr(current_engine, 'session') and current_engine.session:
         status['session_logs'] = current_engine.session.logs
         status['session_id'] = current_engine.session.session_id
-    elif 'session_logs' in benchmark_status:
-        status['session_logs'] = benchmark_status.get('session_logs', [])
     
     # If running and we have live_data, try to add fan speed if missing
     if status.get('running') and status.get('live_data') and status.get('device'):
@@ -2243,27 +2535,67 @@ def get_benchmark_status():
             device = device_manager.get_device(status['device'])
             if device:
                 try:
-                    import aiohttp
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    async def get_fan():
-                        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
-                            async with session.get(f"http://{device.ip_address}/api/system/info") as resp:
-                                if resp.status == 200:
-                                    data = await resp.json()
-                                    return data.get('fanspeed', 0)
-                        return None
-                    
-                    fan = loop.run_until_complete(get_fan())
-                    loop.close()
-                    if fan is not None:
-                        status['live_data']['fan_speed'] = float(fan)
+                    info = telemetry.get_info(status['device'], timeout=2)
+                    if info is not None:
+                        status['live_data']['fan_speed'] = float(info.fan_speed)
                 except Exception as e:
                     logger.debug(f"Could not fetch fan speed: {e}")
     
     return jsonify(status)
 
+
+STREAM_MIN_INTERVAL = 0.25  # coalesce bursts of status updates per stream event
+STREAM_KEEPALIVE = 15  # seconds of quiet before a keepalive comment
+STREAM_LOG_BATCH = 500  # log lines per event when catching up
+
+
+@app.route('/api/benchmark/stream')
+@require_patreon_auth
+def stream_benchmark_status():
+    """
+    Server-sent events with live benchmark progress.
+
+    The first `status` event carries the full status, later ones only the
+    fields that changed. `logs` events carry new session log lines; their id
+    is the sequence number of the last line, so a reconnecting EventSource
+    (Last-Event-ID) or ?after=<seq> continues without gaps or repeats.
+    """
+    cursor = request.headers.get('Last-Event-ID') or request.args.get('after') or 0
+    try:
+        cursor = int(cursor)
+    except (TypeError, ValueError):
+        cursor = 0
+
+    def generate():
+        nonlocal cursor
+        sent = {}
+        revision = None
+        yield "retry: 3000\n\n"
+        while True:
+            current = benchmark_status.wait_for_change(revision, timeout=STREAM_KEEPALIVE)
+            if current == revision:
+                yield ": keepalive\n\n"
+                continue
+            revision = current
+
+            fields = derive_progress(benchmark_status.fields(), benchmark_status.combo_count)
+            # Compare encoded values - nested dicts may have been changed in place
+            encoded = {k: json.dumps(v, default=str, sort_keys=True) for k, v in fields.items()}
+            delta = {k: fields[k] for k, e in encoded.items() if sent.get(k) != e}
+            if delta:
+                sent.update((k, encoded[k]) for k in delta)
+                yield f"id: {cursor}\nevent: status\ndata: {json.dumps(delta, default=str)}\n\n"
+
+            while True:
+                logs, cursor = benchmark_status.logs_since(cursor, limit=STREAM_LOG_BATCH)
+                if not logs:
+                    break
+                yield f"id: {cursor}\nevent: logs\ndata: {json.dumps(logs, default=str)}\n\n"
+            time.sleep(STREAM_MIN_INTERVAL)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # ---------------------------------------------------------------------------
 # AUTO TUNE ORCHESTRATOR
 # ---------------------------------------------------------------------------
@@ -2299,14 +2631,9 @@ def run_single_benchmark(device_name: str, cfg: BenchmarkConfig, safety: SafetyL
         # Track combos for predictive progress
         combo = parse_current_combo(status_dict)
         if combo:
-            seen = benchmark_status.get('seen_combos') or []
-            if combo not in seen:
-                seen.append(combo)
-                if len(seen) > 5000:
-                    seen = seen[-5000:]
-                benchmark_status['seen_combos'] = seen
+            seen_count = benchmark_status.add_combo(combo)
             if not status_dict.get('tests_completed') and not status_dict.get('tests_complete'):
-                tests_completed = max(tests_completed, len(benchmark_status['seen_combos']))
+                tests_completed = max(tests_completed, seen_count)
 
         if tests_total:
             status_dict['tests_total'] = tests_total
@@ -2317,10 +2644,10 @@ def run_single_benchmark(device_name: str, cfg: BenchmarkConfig, safety: SafetyL
         # If running and we have a current test but zero completed, count at least one
         if status_dict.get('running') and tests_total:
             if tests_completed == 0:
-                tests_completed = max(1, len(benchmark_status.get('seen_combos') or []), 1)
+                tests_completed = max(1, benchmark_status.combo_count)
                 status_dict['tests_completed'] = tests_completed
             elif (status_dict.get('current_test') or status_dict.get('live_data')):
-                tests_completed = max(tests_completed, len(benchmark_status.get('seen_combos') or []), 1)
+                tests_completed = max(tests_completed, benchmark_status.combo_count, 1)
                 status_dict['tests_completed'] = tests_completed
 
         if tests_total and tests_completed:
@@ -2332,11 +2659,8 @@ def run_single_benchmark(device_name: str, cfg: BenchmarkConfig, safety: SafetyL
 
         benchmark_status.update(status_dict)
         if status_dict.get('message'):
-            benchmark_status.setdefault('message_queue', []).append({
-                'phase': status_dict.get('phase', 'info'),
-                'message': status_dict['message']
-            })
-            benchmark_status.setdefault('session_logs', []).append({
+            benchmark_status.append_message(status_dict.get('phase', 'info'), status_dict['message'])
+            benchmark_status.append_log({
                 'time': datetime.now().isoformat(),
                 'message': status_dict['message'],
                 'type': status_dict.get('phase', 'info')
@@ -2369,8 +2693,12 @@ def run_single_benchmark(device_name: str, cfg: BenchmarkConfig, safety: SafetyL
             benchmark_status['tests_completed'] = 1  # start from 1 to avoid 0/X display
         save_benchmark_state()
 
-        loop.run_until_complete(device_manager.initialize_all())
-        engine = BenchmarkEngine(cfg, safety, device_manager, sessions_dir, status_callback=update_status)
+        # Only the tuned device needs to be online; defaults from earlier phases are kept
+        init = loop.run_until_complete(device_manager.initialize_all(names=[device_name], reuse_defaults=True))
+        if device_name in init and not init[device_name]:
+            logger.warning(f"{device_name}: not confirmed online before {phase} phase ({init[device_name].error or 'offline'})")
+        engine = BenchmarkEngine(cfg, safety, device_manager, sessions_dir, status_callback=update_status,
+                                 power_budget=power_budget)
         current_engine = engine
         session = loop.run_until_complete(engine.run_benchmark(device_name))
         current_session_id = session.session_id
@@ -2380,6 +2708,10 @@ def run_single_benchmark(device_name: str, cfg: BenchmarkConfig, safety: SafetyL
         persist_session_mode(session.session_id, run_mode or 'benchmark')
         return session
     finally:
+        try:
+            loop.run_until_complete(device_manager.cleanup_all())
+        except Exception as cleanup_err:
+            logger.error(f"Error during cleanup: {cleanup_err}")
         loop.close()
 
 def load_session_results(session_id: str):
@@ -2389,7 +2721,8 @@ def load_session_results(session_id: str):
     alt = sessions_dir / f"{session_id}.json"
     session_file = primary if primary.exists() else alt
     if not session_file.exists():
-        return None
+        # Still running (or crashed mid-run) - rebuild from the journal
+        return load_session_data(sessions_dir, session_id)
     with open(session_file, 'r', encoding='utf-8') as f:
         try:
             return json.load(f)
@@ -2424,6 +2757,7 @@ def persist_session_mode(session_id: str, mode: str):
         if changed:
             with open(target, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2)
+            get_session_index(sessions_dir).update(target, data)
     except Exception as e:
         logger.warning(f"Could not persist session mode for {session_id}: {e}")
 
@@ -2459,6 +2793,8 @@ def run_auto_tune_sequence(device_name: str, data: dict):
             return
 
         cfg, safety = build_benchmark_config_from_request(data)
+        if 'reuse_measurements' not in data:
+            cfg.reuse_measurements = True  # the Nano phases copy this
         precision_session = run_single_benchmark(device_name, cfg, safety, phase='precision', goal='balanced', run_mode='auto_tune')
         if stop_requested():
             return
@@ -2538,6 +2874,11 @@ def run_auto_tune_sequence(device_name: str, data: dict):
             n_cfg.auto_mode = True
             n_cfg.enable_plotting = cfg.enable_plotting
             n_cfg.export_csv = cfg.export_csv
+            # Points the precision sweep or an earlier Nano step measured are reused, not re-tested
+            n_cfg.reuse_measurements = cfg.reuse_measurements
+            n_cfg.measurement_max_age = cfg.measurement_max_age
+            n_cfg.ambient_temp = cfg.ambient_temp
+            n_cfg.ambient_tolerance = cfg.ambient_tolerance
             if data.get('topless'):
                 if data.get('unlock_voltage'):
                     n_cfg.voltage_stop = max(n_cfg.voltage_stop or 0, 9999)
@@ -2674,6 +3015,93 @@ def stop_benchmark():
     return jsonify({'status': 'no_benchmark_running'}), 400
 
 
+@app.route('/api/fleet/benchmark', methods=['POST'])
+@require_patreon_auth
+def start_fleet_benchmark():
+    """Benchmark several devices at once, each in its own session"""
+    global fleet_runner, fleet_thread
+    
+    if fleet_thread and fleet_thread.is_alive():
+        return jsonify({'error': 'Fleet benchmark already running'}), 400
+    if benchmark_status['running'] or auto_tune_running:
+        return jsonify({'error': 'Benchmark already running'}), 400
+    
+    data = request.json or {}
+    devices = data.get('devices') or []
+    if not devices:
+        return jsonify({'error': 'devices required'}), 400
+    missing = [name for name in devices if not device_manager.get_device(name)]
+    if missing:
+        return jsonify({'error': f"Devices not found: {', '.join(missing)}"}), 404
+    
+    config, safety = build_benchmark_config_from_request(data)
+    config.parallel_devices = bool(data.get('parallel', True))
+    if data.get('max_parallel') is not None:
+        config.max_parallel_devices = int(data['max_parallel'])
+    
+    runner = FleetRunner(config, safety, device_manager, sessions_dir, power_budget=power_budget)
+    
+    def run_fleet():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(runner.run(devices))
+        except Exception as e:
+            logger.error(f"Fleet benchmark failed: {e}", exc_info=True)
+        finally:
+            try:
+                loop.run_until_complete(device_manager.cleanup_all())
+            except Exception as cleanup_err:
+                logger.error(f"Error during cleanup: {cleanup_err}")
+            loop.close()
+    
+    fleet_runner = runner
+    fleet_thread = Thread(target=run_fleet, daemon=True)
+    fleet_thread.start()
+    
+    return jsonify({'status': 'started', 'devices': devices, 'concurrency': runner.concurrency})
+
+
+@app.route('/api/fleet/benchmark/status')
+@require_patreon_auth
+def get_fleet_benchmark_status():
+    """Per-device status of the current (or last) fleet benchmark"""
+    if not fleet_runner:
+        return jsonify({'running': False, 'devices': {}, 'results': {}})
+    return jsonify({
+        'running': bool(fleet_thread and fleet_thread.is_alive()),
+        'concurrency': fleet_runner.concurrency,
+        'devices': fleet_runner.status(),
+        'results': {name: result.to_dict() for name, result in fleet_runner.results.items()},
+    })
+
+
+@app.route('/api/fleet/benchmark/logs/<device_name>')
+@require_patreon_auth
+def get_fleet_benchmark_logs(device_name):
+    """Log entries of one device in the fleet benchmark after ?since=<seq>"""
+    channel = fleet_runner.channels.get(device_name) if fleet_runner else None
+    if channel is None:
+        return jsonify({'error': f'{device_name} is not part of the fleet benchmark'}), 404
+    since = request.args.get('since', 0, type=int)
+    logs, seq = channel.logs_since(since, limit=500)
+    return jsonify({'logs': logs, 'seq': seq})
+
+
+@app.route('/api/fleet/benchmark/stop', methods=['POST'])
+@require_patreon_auth
+def stop_fleet_benchmark():
+    """Stop the fleet benchmark, or just one device with {"device": name}"""
+    if not (fleet_runner and fleet_thread and fleet_thread.is_alive()):
+        return jsonify({'status': 'no_benchmark_running'}), 400
+    device_name = (request.json or {}).get('device') if request.is_json else None
+    if device_name and device_name not in fleet_runner.channels:
+        return jsonify({'error': f'{device_name} is not part of the fleet benchmark'}), 404
+    fleet_runner.stop(device_name)
+    logger.info(f"Fleet benchmark stop requested ({device_name or 'all devices'})")
+    return jsonify({'status': 'stop_requested', 'device': device_name})
+
+
 @app.route('/api/benchmark/preset/<device>/<preset>')
 @require_patreon_auth
 def get_benchmark_preset(device, preset):
@@ -2772,44 +3200,41 @@ def get_optimization_targets():
 @app.route('/api/sessions')
 @require_patreon_auth
 def get_sessions():
-    """Get list of benchmark sessions"""
-    sessions = []
-    
-    for session_file in sessions_dir.glob('session_*.json'):
-        try:
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
-            
-            # Get device name from device_configs
-            device_name = 'Unknown'
-            if session_data.get('device_configs'):
-                device_name = session_data['device_configs'][0].get('name', 'Unknown')
-
-            mode = session_data.get('mode') or session_data.get('tune_type') or 'benchmark'
-            auto_flag = session_data.get('auto_mode')
-            if auto_flag is None and isinstance(mode, str) and mode.startswith('auto'):
-                auto_flag = True
-            
-            sessions.append({
-                'id': session_data['session_id'],
-                'device': device_name,
-                'start_time': session_data['start_time'],
-                'end_time': session_data.get('end_time'),
-                'status': session_data['status'],
-                'tests': len(session_data.get('results', [])),
-                'stop_reason': session_data.get('stop_reason'),
-                'has_logs': bool(session_data.get('logs')),
-                'mode': mode,
-                'tune_type': session_data.get('tune_type', mode),
-                'auto_mode': auto_flag
-            })
-        except Exception as e:
-            logger.error(f"Error loading session {session_file}: {e}")
-    
-    # Sort by start time, newest first
-    sessions.sort(key=lambda x: x['start_time'], reverse=True)
+    """
+    Get list of benchmark sessions (newest first) from the session index.
     
-    return jsonify(sessions)
+    Filters: ?device=, ?mode=, ?status=, ?since=/?until= (start time, ISO).
+    Sorting: ?sort=<column>&order=asc|desc. With ?limit=/?offset= the response
+    is a page: {'sessions': [...], 'total': n, 'limit': ..., 'offset': ...}.
+    ?refresh=1 re-syncs the index with the session files first.
+    """
+    index = get_session_index(sessions_dir)
+    if request.args.get('refresh'):
+        index.sync()
+    else:
+        index.wait_synced(timeout=30)
+    
+    sort = request.args.get('sort', 'start_time')
+    if sort not in SESSION_SORT_COLUMNS:
+        return jsonify({'error': f'sort must be one of {", ".join(SESSION_SORT_COLUMNS)}'}), 400
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    
+    sessions, total = index.list(
+        device=request.args.get('device'),
+        mode=request.args.get('mode'),
+        status=request.args.get('status'),
+        since=request.args.get('since'),
+        until=request.args.get('until'),
+        sort=sort,
+        descending=request.args.get('order', 'desc').lower() != 'asc',
+        limit=limit,
+        offset=offset,
+    )
+    
+    if limit is None and 'offset' not in request.args:
+        return jsonify(sessions)
+    return jsonify({'sessions': sessions, 'total': total, 'limit': limit, 'offset': offset})
 
 
 @app.route('/api/sessions/<session_id>', methods=['DELETE'])
@@ -2825,12 +3250,20 @@ def delete_session(session_id):
     try:
         # Delete session file
         session_file.unlink()
+        get_session_index(sessions_dir).remove(session_id)
         
         # Delete plots directory if exists
         if plots_dir.exists():
             import shutil
             shutil.rmtree(plots_dir)
         
+        # Delete raw sample log and any leftover journal
+        for extra in (samples_path(sessions_dir, session_id), journal_path(sessions_dir, session_id),
+                      resume_state_path(sessions_dir, session_id), log_path(sessions_dir, session_id),
+                      log_index_path(sessions_dir, session_id)):
+            if extra.exists():
+                extra.unlink()
+        
         return jsonify({'status': 'deleted', 'session_id': session_id})
     except Exception as e:
         logger.error(f"Error deleting session {session_id}: {e}")
@@ -2840,29 +3273,33 @@ def delete_session(session_id):
 @app.route('/api/sessions/<session_id>')
 @require_patreon_auth
 def get_session_data(session_id):
-    """Get session details"""
-    session_file = sessions_dir / f"session_{session_id}.json"
+    """Get session details (replayed from the journal while still running; ?logs=0 leaves out the logs)"""
+    session_data = load_session_data(sessions_dir, session_id)
     
-    if not session_file.exists():
+    if session_data is None:
         return jsonify({'error': 'Session not found'}), 404
     
-    with open(session_file, 'r') as f:
-        session_data = json.load(f)
-    
+    if request.args.get('logs', '').lower() in ('0', 'false', 'no'):
+        session_data.pop('logs', None)
     return jsonify(session_data)
 
 
 @app.route('/api/sessions/<session_id>/logs')
 @require_patreon_auth
 def get_session_logs(session_id):
-    """Get logs for a specific session"""
-    session_file = sessions_dir / f"session_{session_id}.json"
+    """
+    Get logs for a specific session.
     
-    if not session_file.exists():
-        return jsonify({'error': 'Session not found'}), 404
+    With ?after=<seq>, ?limit=<n> or ?type=<t>[,<t>...] returns one page from
+    the session's indexed log file instead of the whole log.
+    """
+    if any(arg in request.args for arg in ('after', 'limit', 'type')):
+        return get_session_logs_page(session_id)
+    
+    session_data = load_session_data(sessions_dir, session_id)
     
-    with open(session_file, 'r') as f:
-        session_data = json.load(f)
+    if session_data is None:
+        return jsonify({'error': 'Session not found'}), 404
     
     return jsonify({
         'session_id': session_id,
@@ -2872,6 +3309,52 @@ def get_session_logs(session_id):
     })
 
 
+def get_session_logs_page(session_id):
+    """One page of session logs (seq-numbered entries plus the cursor for the next page)"""
+    after = request.args.get('after', 0, type=int)
+    limit = request.args.get('limit', 200, type=int)
+    types = [t for t in request.args.get('type', '').split(',') if t] or None
+    
+    page = read_logs(sessions_dir, session_id, after=after, limit=limit, types=types)
+    if page is None:
+        # Older session without a log file - build it once from the document
+        session_data = load_session_data(sessions_dir, session_id)
+        if session_data is None:
+            return jsonify({'error': 'Session not found'}), 404
+        try:
+            build_log_file(sessions_dir, session_id, session_data.get('logs') or [])
+        except OSError as e:
+            logger.error(f"Could not build log file for session {session_id}: {e}")
+            return jsonify({'error': str(e)}), 500
+        page = read_logs(sessions_dir, session_id, after=after, limit=limit, types=types)
+    
+    page['session_id'] = session_id
+    return jsonify(page)
+
+
+@app.route('/api/sessions/<session_id>/samples')
+@require_patreon_auth
+def get_session_samples(session_id):
+    """Get raw per-sample telemetry (all tests, or ?test=<index>) as columns"""
+    sample_file = samples_path(sessions_dir, session_id)
+    
+    if not sample_file.exists():
+        return jsonify({'error': 'No samples recorded for this session'}), 404
+    
+    test_index = request.args.get('test', type=int)
+    try:
+        with SampleReader(sample_file) as reader:
+            return jsonify({
+                'session_id': session_id,
+                'tests': reader.test_indices(),
+                'test': test_index,
+                'samples': reader.to_dict(test_index)
+            })
+    except ValueError as e:
+        logger.error(f"Error reading samples for {session_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/sessions/<session_id>/plot/<plot_type>')
 @require_patreon_auth
 def get_session_plot(session_id, plot_type):
@@ -11566,6 +12049,7 @@ def run_web_server(host='0.0.0.0', port=5000):
     sessions_dir.mkdir(parents=True, exist_ok=True)
     
     load_devices()
+    telemetry.start()
     
     # FORCE regenerate template every time
     template_dir = Path(__file__).parent / "templates"